@@ -0,0 +1,359 @@
+"""
+Speed Hunter - A simple car chase game
+Streaming analytics over recorded telemetry logs in constant memory
+"""
+import argparse
+import glob
+import gzip
+import json
+import math
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# main.py initializes pygame on import; analytics only needs its constants
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+from main import LANE_COUNT, SPEED_STEP  # noqa: E402
+from telemetry import CAUSE_NAMES  # noqa: E402
+
+
+CHUNK_BYTES = 4 * 1024 * 1024  # Decompressed bytes parsed per batch
+SPEED_BANDS = 40  # SPEED_STEP-wide bands; faster games land in the last one
+CAUSES = [CAUSE_NAMES[cause] for cause in sorted(CAUSE_NAMES)]
+
+# TelemetryBus writes its keys in a fixed order, so a few regex scans per
+# chunk (one per event type that matters) replace a json.loads per line
+PICKUP_LANES = re.compile(rb'"event": "coin_pickup", "game": -?\d+, "lane": (-?\d+),')
+MISSED_LANES = re.compile(rb'"event": "coin_missed", "game": -?\d+, "lane": (-?\d+),')
+GAME_STARTS = re.compile(rb'"event": "game_start", "game": (-?\d+), [^\n]*"spawn_delay": (-?\d+)\}')
+GAME_OVERS = re.compile(rb'"event": "game_over", "game": (-?\d+), [^\n]*"score": (-?\d+), '
+                        rb'"speed": (-?\d+), "cause": "(\w+)"\}')
+# Lines the scans above don't need to look inside
+OTHER_LINES = (b'"event": "crash", "game": ', b'"event": "speed_up", "game": ',
+               b'"event": "telemetry_summary"')
+CAUSE_CODES = {name.encode(): cause for cause, name in CAUSE_NAMES.items()}
+
+
+class QuantileSketch:
+    """Mergeable log-bucketed histogram answering quantiles within a relative error"""
+
+    def __init__(self, relative_error=0.01, max_value=1e9):
+        """Create empty buckets covering (0, max_value]"""
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self.log_gamma = math.log(self.gamma)
+        self.counts = np.zeros(int(math.ceil(math.log(max_value) / self.log_gamma)) + 1, np.int64)
+        self.zeros = 0  # Values <= 0 (scores of 0 are common)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, values):
+        """Add an array of values"""
+        values = np.asarray(values, np.float64)
+        if not len(values):
+            return
+        positive = values[values > 0]
+        self.zeros += len(values) - len(positive)
+        if len(positive):
+            buckets = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64)
+            np.clip(buckets, 0, len(self.counts) - 1, out=buckets)
+            self.counts += np.bincount(buckets, minlength=len(self.counts))
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other):
+        """Fold another sketch with the same parameters into this one"""
+        self.counts += other.counts
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def mean(self):
+        """Exact mean of the added values"""
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Approximate q-quantile (0..1)"""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank - self.zeros, side="right"))
+        return min(self.max, 2 * self.gamma ** bucket / (self.gamma + 1))
+
+
+class Summary:
+    """Incremental aggregates of one or more log files; summaries merge"""
+
+    def __init__(self):
+        """Start with empty aggregates"""
+        self.files = 0
+        self.bytes = 0
+        self.events = 0
+        self.fallback_chunks = 0  # Chunks parsed with json instead of the regex scans
+        self.deaths = np.zeros((len(CAUSES), SPEED_BANDS), np.int64)
+        self.pickups = np.zeros(LANE_COUNT, np.int64)
+        self.misses = np.zeros(LANE_COUNT, np.int64)
+        self.scores = {}  # spawn_delay -> QuantileSketch of final scores
+        # Games whose start and end are in different files (the log rotated)
+        self.open_starts = {}  # (session, game) -> spawn_delay
+        self.open_overs = {}  # (session, game) -> final score
+
+    def add_batch(self, session, batch):
+        """Fold one parsed chunk in"""
+        events, pickup_lanes, missed_lanes, starts, overs = batch
+        self.events += events
+        self.pickups += np.bincount(np.clip(pickup_lanes, 0, LANE_COUNT - 1), minlength=LANE_COUNT)
+        self.misses += np.bincount(np.clip(missed_lanes, 0, LANE_COUNT - 1), minlength=LANE_COUNT)
+
+        # overs columns: game, score, speed, cause
+        bands = np.clip(overs[:, 2] // SPEED_STEP, 0, SPEED_BANDS - 1)
+        causes = np.clip(overs[:, 3], 0, len(CAUSES) - 1)
+        self.deaths += np.bincount(causes * SPEED_BANDS + bands,
+                                   minlength=self.deaths.size).reshape(self.deaths.shape)
+
+        # Pair starts with ends (one each per game); scores go to the sketches in bulk
+        for game, delay in starts.tolist():
+            self.open_starts[(session, game)] = delay
+        finished = {}
+        for game, score in overs[:, :2].tolist():
+            key = (session, game)
+            delay = self.open_starts.pop(key, None)
+            if delay is None:
+                self.open_overs[key] = score
+            else:
+                finished.setdefault(delay, []).append(score)
+        for delay, scores in finished.items():
+            self.score_sketch(delay).add(scores)
+
+    def end_game(self, key, score):
+        """Record a final score, or keep it until its game's start turns up"""
+        delay = self.open_starts.pop(key, None)
+        if delay is None:
+            self.open_overs[key] = score
+        else:
+            self.score_sketch(delay).add([score])
+
+    def score_sketch(self, delay):
+        """Score sketch for a spawn delay"""
+        sketch = self.scores.get(delay)
+        if sketch is None:
+            sketch = self.scores[delay] = QuantileSketch()
+        return sketch
+
+    def merge(self, other):
+        """Fold another summary into this one"""
+        self.files += other.files
+        self.bytes += other.bytes
+        self.events += other.events
+        self.fallback_chunks += other.fallback_chunks
+        self.deaths += other.deaths
+        self.pickups += other.pickups
+        self.misses += other.misses
+        for delay, sketch in other.scores.items():
+            self.score_sketch(delay).merge(sketch)
+        self.open_starts.update(other.open_starts)
+        for key, score in other.open_overs.items():
+            self.end_game(key, score)
+        # Starts merged after their ends
+        for key in [key for key in self.open_overs if key in self.open_starts]:
+            self.score_sketch(self.open_starts.pop(key)).add([self.open_overs.pop(key)])
+        return self
+
+
+def read_chunks(path, chunk_bytes=CHUNK_BYTES):
+    """Yield blocks of whole lines from a (gzip-compressed) JSONL file"""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as file:
+        rest = b""
+        while True:
+            data = file.read(chunk_bytes)
+            if not data:
+                break
+            data = rest + data
+            end = data.rfind(b"\n") + 1
+            if end == 0:
+                rest = data
+                continue
+            rest = data[end:]
+            yield data[:end]
+        if rest:
+            yield rest
+
+
+def int_column(values):
+    """Integer array from regex-captured digit strings"""
+    return np.array(values, dtype=np.bytes_).astype(np.int64) if values else np.zeros(0, np.int64)
+
+
+def int_table(rows, width):
+    """Integer table from regex-captured tuples of digit strings"""
+    if not rows:
+        return np.zeros((0, width), np.int64)
+    return np.array(rows, dtype=np.bytes_).astype(np.int64)
+
+
+def parse_chunk(chunk):
+    """Parse a block of lines into (events, pickup lanes, missed lanes, starts, overs)"""
+    pickups = PICKUP_LANES.findall(chunk)
+    misses = MISSED_LANES.findall(chunk)
+    starts = GAME_STARTS.findall(chunk)
+    overs = [(game, score, speed, b"%d" % CAUSE_CODES.get(cause, 0))
+             for game, score, speed, cause in GAME_OVERS.findall(chunk)]
+    summaries = chunk.count(OTHER_LINES[-1])
+    matched = len(pickups) + len(misses) + len(starts) + len(overs) + summaries
+    matched += sum(chunk.count(prefix) for prefix in OTHER_LINES[:-1])
+    lines = chunk.count(b"\n") + (not chunk.endswith(b"\n"))
+    if matched != lines:
+        return None  # Not all in TelemetryBus layout
+    return (lines - summaries, int_column(pickups), int_column(misses),
+            int_table(starts, 2), int_table(overs, 4))
+
+
+def parse_lines(chunk):
+    """Slow path: parse a block line by line with json"""
+    events = 0
+    pickups, misses, starts, overs = [], [], [], []
+    for line in chunk.splitlines():
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        name = event.get("event")
+        if name == "telemetry_summary":
+            continue
+        events += 1
+        if name == "coin_pickup":
+            pickups.append(event.get("lane", 0))
+        elif name == "coin_missed":
+            misses.append(event.get("lane", 0))
+        elif name == "game_start":
+            starts.append((event.get("game", 0), event.get("spawn_delay", 0)))
+        elif name == "game_over":
+            cause = CAUSE_CODES.get(str(event.get("cause", "")).encode(), 0)
+            overs.append((event.get("game", 0), event.get("score", 0), event.get("speed", 0), cause))
+    return (events, np.array(pickups, np.int64), np.array(misses, np.int64),
+            np.array(starts, np.int64).reshape(-1, 2), np.array(overs, np.int64).reshape(-1, 4))
+
+
+def iter_batches(path, chunk_bytes=CHUNK_BYTES, stats=None):
+    """Yield parsed batches for each chunk of a log file"""
+    for chunk in read_chunks(path, chunk_bytes):
+        batch = parse_chunk(chunk)
+        if batch is None:
+            batch = parse_lines(chunk)
+            if stats is not None:
+                stats.fallback_chunks += 1
+        if stats is not None:
+            stats.bytes += len(chunk)
+        yield batch
+
+
+def session_of(path):
+    """Session a log file belongs to (rotated files of one run share it)"""
+    name = os.path.basename(path)
+    match = re.match(r"events-(.+)-\d+\.jsonl", name)
+    return match.group(1) if match else name
+
+
+def summarize_file(path, chunk_bytes=CHUNK_BYTES):
+    """Aggregate a single log file"""
+    summary = Summary()
+    summary.files = 1
+    session = session_of(path)
+    for batch in iter_batches(path, chunk_bytes, summary):
+        summary.add_batch(session, batch)
+    return summary
+
+
+def find_logs(paths):
+    """Expand directories into their telemetry files, sorted"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += glob.glob(os.path.join(path, "*.jsonl.gz")) + glob.glob(os.path.join(path, "*.jsonl"))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def analyze(paths, workers=None):
+    """Summarize all log files, fanning out across processes"""
+    files = find_logs(paths)
+    total = Summary()
+    if workers == 1 or len(files) < 2:
+        for path in files:
+            total.merge(summarize_file(path))
+        return total
+    # Biggest files first so one large file doesn't finish last
+    files.sort(key=os.path.getsize, reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for summary in pool.map(summarize_file, files):
+            total.merge(summary)
+    return total
+
+
+def report(summary, elapsed, out=sys.stdout):
+    """Print the aggregate tables"""
+    games = sum(sketch.count for sketch in summary.scores.values())
+    print(f"{summary.files} files, {summary.bytes / 1e6:.1f} MB, {summary.events} events, "
+          f"{games} games in {elapsed:.2f} s ({summary.bytes / 1e6 / max(elapsed, 1e-9):.0f} MB/s)",
+          file=out)
+    if summary.fallback_chunks:
+        print(f"  {summary.fallback_chunks} chunks needed the slow JSON path", file=out)
+    if summary.open_starts or summary.open_overs:
+        print(f"  {len(summary.open_starts)} games without an end, "
+              f"{len(summary.open_overs)} without a start", file=out)
+
+    print("\nDeath cause by speed band:", file=out)
+    print(f"  {'km/h':>9}  " + "  ".join(f"{cause:>14}" for cause in CAUSES), file=out)
+    for band in np.flatnonzero(summary.deaths.sum(axis=0)):
+        counts = summary.deaths[:, band]
+        low = band * SPEED_STEP
+        label = f"{low}-{low + SPEED_STEP - 1}" if band < SPEED_BANDS - 1 else f"{low}+"
+        print(f"  {label:>9}  " + "  ".join(
+            f"{count:>7} ({count / counts.sum():4.0%})" for count in counts), file=out)
+
+    print("\nMiss rate by lane:", file=out)
+    for lane in range(LANE_COUNT):
+        pickups, misses = summary.pickups[lane], summary.misses[lane]
+        coins = pickups + misses
+        rate = misses / coins if coins else 0.0
+        print(f"  lane {lane + 1}: {coins:>9} coins, {misses:>8} missed ({rate:5.1%})", file=out)
+
+    print("\nFinal score by spawn delay:", file=out)
+    for delay in sorted(summary.scores):
+        sketch = summary.scores[delay]
+        print(f"  {delay:>4} ticks: {sketch.count:>7} games  mean {sketch.mean():7.1f}  "
+              f"p50 {sketch.quantile(0.5):6.0f}  p90 {sketch.quantile(0.9):6.0f}  "
+              f"p99 {sketch.quantile(0.99):6.0f}  max {sketch.max:6.0f}", file=out)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Speed Hunter telemetry analytics")
+    parser.add_argument("paths", nargs="*", default=["telemetry"],
+                        help="telemetry directories or files (default: telemetry)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes to spread files over (default: one per CPU)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = analyze(args.paths, args.workers)
+    if not summary.files:
+        print("No telemetry files found", file=sys.stderr)
+        return 1
+    report(summary, time.perf_counter() - start)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""
+Speed Hunter - A simple car chase game
+Lookahead autopilot that steers the car for unattended runs
+"""
+import math
+import time
+
+from object import COLLECTED, OBSTACLE as OBSTACLE_FLAG, SIZES
+
+
+# Cell codes for the threat pattern of one lane in one time bucket
+EMPTY = 0
+COIN = 1
+OBSTACLE = 2
+
+# Score weights used by the lane search
+COIN_REWARD = 1
+CRASH_PENALTY = -1000
+
+
+class Autopilot:
+    """Chooses lane changes by searching a few seconds ahead"""
+
+    def __init__(self, game, horizon_seconds=3.0, fps=60, bucket_ticks=9,
+                 node_budget=2000, memo_limit=50000, restart=True):
+        """Initialize the autopilot for a game"""
+        self.game = game
+        self.horizon_ticks = int(horizon_seconds * fps)
+        self.bucket_ticks = bucket_ticks  # Ticks per time bucket
+        self.node_budget = node_budget  # Max search nodes per frame
+        self.memo_limit = memo_limit
+        self.restart = restart  # Leave menu / restart after game over
+
+        # Memoized values of (lane, bucket, threat pattern) states
+        self.memo = {}
+        self.nodes = 0
+
+        # Stats
+        self.decisions = 0
+        self.memo_hits = 0
+        self.games_played = 0
+
+    def change_ticks(self):
+        """Number of ticks one lane change takes"""
+        car = self.game.car
+        return max(1, math.ceil(car.lane_width / car.speed))
+
+    def change_buckets(self):
+        """Number of buckets one lane change spans"""
+        return max(1, math.ceil(self.change_ticks() / self.bucket_ticks))
+
+    def change_overlap(self):
+        """Buckets into a lane change until the car has left its lane, and until it
+        first overlaps the target lane (as wide as the widest obstacle's collision box)"""
+        car = self.game.car
+        reach = (car.rect.width + SIZES[True] - 10) / 2
+        leave_ticks = math.ceil(reach / car.speed)
+        enter_ticks = max(0, int((car.lane_width - reach) // car.speed))
+        return (leave_ticks - 1) // self.bucket_ticks, enter_ticks // self.bucket_ticks
+
+    def build_pattern(self):
+        """Build the per-bucket, per-lane threat pattern of upcoming objects"""
+        car = self.game.car
+        speed = max(1, self.game.game_speed)
+        bucket = self.bucket_ticks
+        bucket_count = max(1, self.horizon_ticks // bucket)
+        lane_count = car.lane_count
+
+        cells = [EMPTY] * (bucket_count * lane_count)
+        half_car = car.rect.height // 2
+
+        # Read the object columns straight from the store
+        store = self.game.store
+        n = store.count
+        for x, y, flags, height in zip(store.x[:n].tolist(), store.y[:n].tolist(),
+                                       store.flags[:n].tolist(), store.height[:n].tolist()):
+            if flags & COLLECTED:
+                continue
+            lane = int(x // car.lane_width)
+            if lane < 0 or lane >= lane_count:
+                continue
+
+            # Ticks during which the object overlaps the car vertically
+            # (collision rects are 10 px smaller than the sprite)
+            half = half_car + (height - 10) // 2
+            start = (car.y - half - y) / speed
+            end = (car.y + half - y) / speed
+            if end < 0:
+                continue
+
+            first = max(0, int(start // bucket))
+            last = min(bucket_count - 1, int(end // bucket))
+            code = OBSTACLE if flags & OBSTACLE_FLAG else COIN
+            for b in range(first, last + 1):
+                index = b * lane_count + lane
+                if cells[index] < code:
+                    cells[index] = code
+
+        return tuple(cells), bucket_count
+
+    def evaluate(self, lane, bucket, pattern, bucket_count):
+        """Best score reachable from a lane at a bucket (memoized)"""
+        if bucket >= bucket_count:
+            return 0
+
+        lane_count = self.game.car.lane_count
+        # Only the part of the pattern from this bucket on matters
+        key = (lane, bucket_count - bucket, pattern[bucket * lane_count:])
+        cached = self.memo.get(key)
+        if cached is not None:
+            self.memo_hits += 1
+            return cached
+
+        self.nodes += 1
+        if self.nodes > self.node_budget:
+            # Out of budget: treat the rest of the horizon as neutral
+            return 0
+
+        best = None
+        for target in (lane, lane - 1, lane + 1):
+            if target < 0 or target >= lane_count:
+                continue
+            value = self.move_value(pattern, bucket, bucket_count, lane, target)
+            if best is None or value > best:
+                best = value
+
+        if self.nodes <= self.node_budget:
+            if len(self.memo) >= self.memo_limit:
+                self.memo.clear()
+            self.memo[key] = best
+        return best
+
+    def move_value(self, pattern, bucket, bucket_count, lane, target):
+        """Score for staying in or moving from lane to target at a bucket"""
+        lane_count = self.game.car.lane_count
+        cell = pattern[bucket * lane_count + lane]
+        if cell == OBSTACLE:
+            return CRASH_PENALTY
+        value = COIN_REWARD if cell == COIN else 0
+        if target == lane:
+            return value + self.evaluate(lane, bucket + 1, pattern, bucket_count)
+
+        # The car leaves its lane early in the move, crosses the lane line and
+        # only reaches the target lane in the last bucket; an obstacle in either
+        # lane while the car still or already overlaps it is a crash
+        arrival = bucket + self.change_buckets() - 1
+        leave, enter = self.change_overlap()
+        for sliding in range(bucket, min(arrival, bucket_count - 1) + 1):
+            row = sliding * lane_count
+            if sliding - bucket <= leave and pattern[row + lane] == OBSTACLE:
+                return CRASH_PENALTY
+            if sliding - bucket >= enter and pattern[row + target] == OBSTACLE:
+                return CRASH_PENALTY
+        if arrival < bucket_count:
+            if arrival > bucket and pattern[arrival * lane_count + target] == COIN:
+                value += COIN_REWARD
+        return value + self.evaluate(target, arrival + 1, pattern, bucket_count)
+
+    def choose_lane(self):
+        """Return the lane the car should head for"""
+        car = self.game.car
+        pattern, bucket_count = self.build_pattern()
+        self.nodes = 0
+        self.decisions += 1
+
+        lane = car.current_lane
+        best_lane = lane
+        best_value = None
+        for target in (lane, lane - 1, lane + 1):
+            if target < 0 or target >= car.lane_count:
+                continue
+            value = self.move_value(pattern, 0, bucket_count, lane, target)
+            if best_value is None or value > best_value:
+                best_lane = target
+                best_value = value
+        return best_lane
+
+    def update(self):
+        """Steer the car for this frame"""
+        game = self.game
+        if game.menu_active:
+            if self.restart:
+                game.menu_active = False
+            return
+        if game.game_over:
+            if self.restart:
+                self.games_played += 1
+                game.reset_game()
+            return
+
+        # Wait for the current lane change to finish before deciding again
+        if game.car.x != game.car.target_x:
+            return
+
+        target = self.choose_lane()
+        if target < game.car.current_lane:
+            game.car.move_left()
+        elif target > game.car.current_lane:
+            game.car.move_right()
+
+
+def benchmark(decisions=20000, object_count=12, seed=1):
+    """Measure autopilot decisions per second on a headless game"""
+    import os
+    import random
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from main import Game, LANE_COUNT, LANE_WIDTH, SCREEN_HEIGHT
+    from object import RoadObject, ObjectStore
+
+    random.seed(seed)
+    game = Game()
+    game.menu_active = False
+    autopilot = Autopilot(game)
+
+    # Pre-build a pool of object layouts (one store each) to cycle through
+    layouts = []
+    for _ in range(64):
+        store = ObjectStore()
+        for _ in range(object_count):
+            lane = random.randint(0, LANE_COUNT - 1)
+            y = random.randint(-50, SCREEN_HEIGHT)
+            RoadObject(lane * LANE_WIDTH + LANE_WIDTH // 2, y,
+                       random.random() < 0.2, LANE_WIDTH, store=store)
+        layouts.append(store)
+
+    start = time.perf_counter()
+    for i in range(decisions):
+        game.store = layouts[i % len(layouts)]
+        game.car.current_lane = i % LANE_COUNT
+        autopilot.choose_lane()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "decisions": decisions,
+        "seconds": elapsed,
+        "decisions_per_second": decisions / elapsed if elapsed else 0.0,
+        "memo_entries": len(autopilot.memo),
+        "memo_hits": autopilot.memo_hits,
+    }
+
+
+if __name__ == "__main__":
+    result = benchmark()
+    print("Speed Hunter - Autopilot Benchmark")
+    print(f"Decisions:     {result['decisions']}")
+    print(f"Time:          {result['seconds']:.3f} s")
+    print(f"Decisions/sec: {result['decisions_per_second']:.0f}")
+    print(f"Memo entries:  {result['memo_entries']}")
+    print(f"Memo hits:     {result['memo_hits']}")
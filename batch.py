@@ -0,0 +1,83 @@
+"""
+Speed Hunter - A simple car chase game
+Layered draw batches sent to the screen with one blits() call per layer
+"""
+import pygame
+
+from perf import allocated
+
+# Layers from back to front (the road is drawn by the compositor)
+LAYERS = ("shadows", "glows", "sparkles", "objects", "particles", "exhaust", "car")
+
+
+class RenderBatch:
+    """Collects (surface, position) pairs per layer and culls off-screen ones"""
+
+    def __init__(self, target=None):
+        """Initialize empty layers"""
+        self.layers = {name: [] for name in LAYERS}
+        self.target = None
+        self.viewport = None
+        self.items = 0
+        self.culled = 0
+        self.calls = 0
+        self.last_stats = {"items": 0, "culled": 0, "calls": 0}
+        if target is not None:
+            self.begin(target)
+
+    def begin(self, target):
+        """Start a new frame drawing into target"""
+        self.target = target
+        self.viewport = target.get_rect()
+        self.items = 0
+        self.culled = 0
+        self.calls = 0
+
+    def visible(self, x, y, width, height):
+        """Check whether a box overlaps the viewport"""
+        viewport = self.viewport
+        return (x < viewport.right and y < viewport.bottom and
+                x + width > viewport.left and y + height > viewport.top)
+
+    def add(self, layer, surface, pos):
+        """Queue a surface for a layer unless it is fully off-screen"""
+        width, height = surface.get_size()
+        if not self.visible(pos[0], pos[1], width, height):
+            self.culled += 1
+            return
+        self.layers[layer].append((surface, pos))
+        self.items += 1
+
+    def add_sprite(self, layer, image, center, angle=0, size=None):
+        """Queue an image scaled to size and rotated by angle (degrees, counterclockwise)
+        around center; returns the size of the drawn (rotated) sprite"""
+        if size is not None and size != image.get_size():
+            image = pygame.transform.scale(image, size)
+            allocated("sprites")
+        if angle:
+            image = pygame.transform.rotate(image, angle)
+            allocated("sprites")
+        self.add(layer, image, image.get_rect(center=center).topleft)
+        return image.get_size()
+
+    def cull(self):
+        """Count an item skipped by its owner's own visibility check"""
+        self.culled += 1
+
+    def flush(self):
+        """Draw all layers in order, one call per non-empty layer"""
+        target = self.target
+        fblits = getattr(target, 'fblits', None)  # pygame-ce only
+        for name in LAYERS:
+            items = self.layers[name]
+            if not items:
+                continue
+            if fblits:
+                fblits(items)
+            else:
+                target.blits(items, False)
+            self.calls += 1
+            items.clear()
+
+        self.last_stats = {"items": self.items, "culled": self.culled, "calls": self.calls}
+        return self.last_stats
@@ -4,7 +4,9 @@ Enhanced player car class with improved graphics
 """
 import pygame
 import math
-import random
+from batch import RenderBatch
+from quality import effects, fx_random
+from perf import allocated
 
 class Car:
     """Player car class with enhanced visuals"""
@@ -28,18 +30,37 @@ class Car:
         self.exhaust_timer = 0
         self.exhaust_particles = []
         
+        # Cached effect sprites (see get_exhaust/get_beams)
+        self.exhaust_cache = {}
+        self.beams = None
+        self.beams_scale = None
+        
         # Load car image
         try:
-            self.image = pygame.image.load("assets/car.png")
-            self.image = pygame.transform.scale(self.image, (self.width, self.height))
+            self.base_image = pygame.image.load("assets/car.png")
+            self.base_image = pygame.transform.scale(self.base_image, (self.width, self.height))
         except pygame.error:
             # Create a more detailed placeholder if image not found
-            self.image = self.create_car_image()
+            self.base_image = self.create_car_image()
             
+        # Sprite baked at the internal render resolution
+        self.render_scale = 1.0
+        self.image = self.base_image
+        self.masks = {}  # Collision masks by tilt
+        
         # Create collision rect (slightly smaller than visual car for better gameplay)
         self.rect = pygame.Rect(x - self.width // 2 + 15, y - self.height // 2 + 15, 
                                self.width - 30, self.height - 30)
         
+    def set_render_scale(self, scale):
+        """Bake the car sprite for the given render scale"""
+        self.render_scale = scale
+        if scale == 1.0:
+            self.image = self.base_image
+        else:
+            self.image = pygame.transform.smoothscale(
+                self.base_image, (max(1, int(self.width * scale)), max(1, int(self.height * scale))))
+        
     def create_car_image(self):
         """Create a more detailed car image"""
         image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
@@ -123,8 +144,8 @@ class Car:
         particle = {
             'x': self.x,
             'y': self.y + self.height // 2 - 10,
-            'size': random.randint(4, 8),  # Larger particles for bigger screen
-            'life': random.randint(10, 20),
+            'size': fx_random.randint(4, 8),  # Larger particles for bigger screen
+            'life': fx_random.randint(10, 20),
             'color': (100, 100, 100, 200)  # Gray smoke with alpha
         }
         self.exhaust_particles.append(particle)
@@ -133,8 +154,8 @@ class Car:
         """Update exhaust particles"""
         for particle in self.exhaust_particles[:]:
             # Move particle up and slightly random
-            particle['y'] += random.uniform(1, 3)
-            particle['x'] += random.uniform(-0.5, 0.5)
+            particle['y'] += fx_random.uniform(1, 3)
+            particle['x'] += fx_random.uniform(-0.5, 0.5)
             
             # Fade out
             particle['size'] += 0.2
@@ -148,45 +169,101 @@ class Car:
             if particle['life'] <= 0:
                 self.exhaust_particles.remove(particle)
         
-    def draw(self, surface):
-        """Draw the car and effects on the surface"""
+    def snapshot(self):
+        """Return an immutable copy of the state needed to draw the car"""
+        exhaust = tuple((p['x'], p['y'], p['size'], p['color']) for p in self.exhaust_particles)
+        return (self.x, self.y, self.tilt, exhaust)
+        
+    def draw(self, surface, state=None, batch=None):
+        """Draw the car and effects on the surface (optionally from a snapshot)"""
+        car_x, car_y, tilt, exhaust = state if state is not None else self.snapshot()
+        own_batch = batch is None
+        if own_batch:
+            batch = RenderBatch(surface)
+            
+        s = self.render_scale
+        x = car_x * s
+        y = car_y * s
+        
         # Draw exhaust particles
-        for particle in self.exhaust_particles:
-            # Create a surface for the particle with alpha
-            particle_surf = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surf, particle['color'], 
-                              (particle['size'], particle['size']), particle['size'])
-            surface.blit(particle_surf, 
-                        (particle['x'] - particle['size'], particle['y'] - particle['size']))
+        if not effects['exhaust']:
+            exhaust = ()
+        for particle_x, particle_y, particle_size, particle_color in exhaust:
+            particle_surf = self.get_exhaust(particle_size * s, particle_color)
+            half = particle_surf.get_width() / 2
+            batch.add("exhaust", particle_surf, (particle_x * s - half, particle_y * s - half))
         
         # Draw car with tilt
-        if self.tilt != 0:
-            rotated_image = pygame.transform.rotate(self.image, self.tilt)
-            new_rect = rotated_image.get_rect(center=(self.x, self.y))
-            surface.blit(rotated_image, new_rect.topleft)
+        if tilt != 0:
+            batch.add_sprite("car", self.image, (x, y), tilt)
         else:
-            surface.blit(self.image, (self.x - self.width // 2, self.y - self.height // 2))
+            batch.add("car", self.image, (x - self.image.get_width() // 2, y - self.image.get_height() // 2))
             
         # Draw headlight beams
-        if random.random() < 0.7:  # Flicker effect
-            light_surf = pygame.Surface((40, 100), pygame.SRCALPHA)  # Larger light beams
-            light_color = (255, 255, 200, 50)  # Yellow with alpha
+        if effects['headlights'] and (not effects['flicker'] or fx_random.random() < 0.7):  # Flicker effect
+            beams = self.get_beams()
+            batch.add("car", beams, ((car_x - 40) * s, (car_y + self.height // 2 - 20) * s))
+            
+        if own_batch:
+            batch.flush()
+            
+    def get_mask(self):
+        """Return the cached collision mask for the current tilt"""
+        tilt = round(self.tilt)
+        mask = self.masks.get(tilt)
+        if mask is None:
+            mask = pygame.mask.from_surface(pygame.transform.rotate(self.base_image, tilt))
+            self.masks[tilt] = mask
+        return mask
+        
+    def prebuild_masks(self, image):
+        """Fill the tilt mask cache from a copy of the base image (on a worker thread)"""
+        for tilt in range(-self.max_tilt, self.max_tilt + 1):
+            if tilt not in self.masks:
+                self.masks.setdefault(tilt, pygame.mask.from_surface(pygame.transform.rotate(image, tilt)))
+                
+    def prebuild_exhaust(self, scale):
+        """Fill the exhaust cache for a render scale with every puff the particles can show"""
+        for size in range(4, 9):
+            # Puffs grow 0.2 and fade 10 alpha per update, for up to 20 updates
+            for age in range(1, 21):
+                self.get_exhaust((size + 0.2 * age) * scale, (100, 100, 100, max(0, 200 - 10 * age)))
+                
+    def get_exhaust(self, size, color):
+        """Return a cached exhaust puff surface for a size (quantized to 1/2 px) and color"""
+        size = round(size * 2) / 2
+        key = (size, color)
+        particle_surf = self.exhaust_cache.get(key)
+        if particle_surf is None:
+            if len(self.exhaust_cache) >= 1024:
+                self.exhaust_cache.clear()
+            # Create a surface for the particle with alpha
+            particle_surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(particle_surf, color, (size, size), size)
+            self.exhaust_cache[key] = particle_surf
+            allocated("exhaust")
+        return particle_surf
+        
+    def get_beams(self):
+        """Return the headlight beams sprite, baked for the render scale"""
+        if self.beams is None or self.beams_scale != self.render_scale:
+            s = self.render_scale
+            # Drawn opaque, as on the (alpha-less) screen surface
+            light_color = (255, 255, 200)
+            top = self.height // 2 - 20
+            beams = pygame.Surface((int(80 * s) + 1, int((self.height - top) * s) + 1), pygame.SRCALPHA)
             
             # Left headlight beam
-            points = [
-                (self.x - 20, self.y + self.height // 2 - 20),
-                (self.x - 40, self.y + self.height),
-                (self.x, self.y + self.height)
-            ]
-            pygame.draw.polygon(surface, light_color, points)
+            points = [(20, 0), (0, self.height - top), (40, self.height - top)]
+            pygame.draw.polygon(beams, light_color, [(px * s, py * s) for px, py in points])
             
             # Right headlight beam
-            points = [
-                (self.x + 20, self.y + self.height // 2 - 20),
-                (self.x + 40, self.y + self.height),
-                (self.x, self.y + self.height)
-            ]
-            pygame.draw.polygon(surface, light_color, points)
+            points = [(60, 0), (80, self.height - top), (40, self.height - top)]
+            pygame.draw.polygon(beams, light_color, [(px * s, py * s) for px, py in points])
+            
+            self.beams = beams
+            self.beams_scale = s
+        return self.beams
         
     def reset(self):
         """Reset car to starting position"""
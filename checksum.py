@@ -0,0 +1,183 @@
+"""
+Speed Hunter - A simple car chase game
+Render checksum mode comparing frame hashes of scripted scenarios against golden sequences
+"""
+import argparse
+import json
+import os
+import sys
+import zlib
+
+
+# Scripted scenarios: Game options, setup, frames to render
+SCENARIOS = {
+    "menu": {"frames": 10, "menu": True},
+    "drive": {"frames": 300},
+    "fast": {"frames": 300, "start_speed": 60},
+    "performance": {"frames": 120, "render_mode": "performance"},
+    "game-over": {"frames": 90, "game_over_at": 60},
+}
+
+
+def frame_hash(surface):
+    """Cheap checksum of a surface's pixel buffer"""
+    return f"{zlib.crc32(surface.get_view('1')):08x}"
+
+
+def render_scenario(name, seed=1):
+    """Render a scenario deterministically, yielding (frame, window surface)"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import random
+    import numpy as np
+    import quality
+    from main import Game
+    from autopilot import Autopilot
+    from object import ObjectStore
+
+    scenario = SCENARIOS[name]
+    random.seed(seed)
+    quality.fx_random.seed(seed)
+    ObjectStore.fx_rng = np.random.default_rng(seed)
+
+    game = Game(start_speed=scenario.get("start_speed", 10),
+                render_mode=scenario.get("render_mode", "quality"), quality_tier="high",
+                road_worker=False, background_loading=False)
+    quality.effects["flicker"] = False  # Headlights always on
+    game.high_score = 0  # Don't depend on the local high score file
+    if not scenario.get("menu"):
+        game.menu_active = False
+        game.autopilot = Autopilot(game, restart=False)
+
+    for frame in range(scenario["frames"]):
+        if frame == scenario.get("game_over_at"):
+            game.end_game(0)
+        if game.autopilot:
+            game.autopilot.update()
+        game.update()
+        game.draw()
+        game.present()
+        yield frame, game.window
+
+
+def pixel_diff(surface, golden_path, tolerance):
+    """Compare a surface with a golden PNG, ignoring channel deltas up to tolerance"""
+    import numpy as np
+    import pygame
+    current = pygame.surfarray.array3d(surface).astype(np.int16)
+    golden = pygame.surfarray.array3d(pygame.image.load(golden_path)).astype(np.int16)
+    delta = np.abs(current - golden).max(axis=2)
+    over = delta > tolerance
+    result = {
+        "pixels": int(over.sum()),
+        "percent": float(over.mean() * 100),
+        "max_delta": int(delta.max()),
+        "mask": over,
+    }
+    if result["pixels"]:
+        xs, ys = np.nonzero(over)
+        result["bbox"] = (int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max()))
+    return result
+
+
+def record(names, golden_dir="golden", png_every=30, seed=1, out=sys.stdout):
+    """Store golden hash sequences (and every Nth frame as PNG) for scenarios"""
+    import pygame
+    for name in names:
+        frame_dir = os.path.join(golden_dir, name)
+        os.makedirs(frame_dir, exist_ok=True)
+        hashes = []
+        for frame, surface in render_scenario(name, seed):
+            hashes.append(frame_hash(surface))
+            if frame % png_every == 0:
+                pygame.image.save(surface, os.path.join(frame_dir, f"frame_{frame:04d}.png"))
+        with open(os.path.join(golden_dir, f"{name}.json"), "w") as file:
+            json.dump({"seed": seed, "hashes": hashes}, file, indent=0)
+        print(f"{name}: recorded {len(hashes)} frames", file=out)
+
+
+def check(names, golden_dir="golden", tolerance=2, diff_dir="checksum-diff", out=sys.stdout):
+    """Compare scenarios against their golden sequences, return the failing names"""
+    import pygame
+    failures = []
+    for name in names:
+        try:
+            with open(os.path.join(golden_dir, f"{name}.json")) as file:
+                golden = json.load(file)
+        except FileNotFoundError:
+            print(f"{name}: no golden sequence in {golden_dir}/; record one with "
+                  f"`python checksum.py --record --scenario {name}`", file=out)
+            failures.append(name)
+            continue
+        hashes = golden["hashes"]
+
+        # Every differing frame needs a golden image to be diffed against, and
+        # must stay within the tolerance of it
+        mismatched = []
+        unchecked = []  # Differing frames without a golden image
+        drifted = []  # Pixel diffs beyond the tolerance
+        worst = 0
+        for frame, surface in render_scenario(name, golden["seed"]):
+            if frame < len(hashes) and frame_hash(surface) == hashes[frame]:
+                continue
+            mismatched.append(frame)
+            golden_path = os.path.join(golden_dir, name, f"frame_{frame:04d}.png")
+            if not os.path.exists(golden_path):
+                unchecked.append(frame)
+                continue
+            diff = pixel_diff(surface, golden_path, tolerance)
+            worst = max(worst, diff["max_delta"])
+            if diff["pixels"]:
+                diff["frame"] = frame
+                drifted.append(diff)
+                if len(drifted) == 1:
+                    # Images of the first frame beyond the tolerance
+                    os.makedirs(diff_dir, exist_ok=True)
+                    pygame.image.save(surface, os.path.join(diff_dir, f"{name}-{frame:04d}-current.png"))
+                    mask = pygame.surfarray.make_surface(diff["mask"].astype("uint8") * 255)
+                    pygame.image.save(mask, os.path.join(diff_dir, f"{name}-{frame:04d}-diff.png"))
+
+        if not mismatched:
+            print(f"{name}: {len(hashes)} frames match", file=out)
+            continue
+        print(f"{name}: {len(mismatched)}/{len(hashes)} frame hashes differ, first at frame {mismatched[0]}",
+              file=out)
+        if unchecked:
+            print(f"  {len(unchecked)} of them have no golden image to diff against, first at frame "
+                  f"{unchecked[0]} (record with --png-every 1 to allow drift within the tolerance)", file=out)
+        if drifted:
+            first = drifted[0]
+            print(f"  {len(drifted)} differ by more than {tolerance}; frame {first['frame']}: {first['pixels']} "
+                  f"pixels ({first['percent']:.3f}%), max delta {first['max_delta']}, bounding box "
+                  f"{first['bbox']}; images in {diff_dir}/", file=out)
+        if unchecked or drifted:
+            failures.append(name)
+        else:
+            print(f"  all within tolerance (max channel delta {worst})", file=out)
+    return failures
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Speed Hunter render checksums")
+    parser.add_argument("--record", action="store_true",
+                        help="store the current rendering as the golden sequences")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenario to run (default: all; may be repeated)")
+    parser.add_argument("--golden", default="golden", help="golden sequence directory")
+    parser.add_argument("--tolerance", type=int, default=2,
+                        help="per-channel difference ignored by the pixel diff")
+    parser.add_argument("--png-every", type=int, default=30,
+                        help="golden frames stored as images for diffing (when recording)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    names = args.scenario or list(SCENARIOS)
+    if args.record:
+        record(names, args.golden, args.png_every, args.seed)
+        return 0
+    return 1 if check(names, args.golden, args.tolerance) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+Speed Hunter - A simple car chase game
+Layered compositor reusing cached layer surfaces until they are invalidated
+"""
+import pygame
+
+# Layers from back to front; objects, particles and the car change every frame
+# and are drawn straight into the frame (see batch.py)
+LAYERS = ("road", "objects", "particles", "car", "hud", "overlay")
+IMMEDIATE_LAYERS = ("objects", "particles", "car")
+
+
+class ScrollingLayer:
+    """Opaque layer of a vertically scrolling road stream (see road.py), scrolled in place"""
+
+    def __init__(self):
+        """Initialize an empty layer"""
+        self.surface = None
+        self.road = None
+        self.generation = None
+        self.offset = None
+        self.redraws = 0  # Full repaints
+        self.scrolls = 0  # Frames that only repainted the rows scrolled into view
+        self.reused = 0  # Frames where the layer didn't move
+
+    def invalidate(self):
+        """Force a full repaint on the next frame"""
+        self.offset = None
+
+    def render(self, road, offset, target):
+        """Return the layer showing the road scrolled down by offset rows"""
+        size = road.base.get_size()
+        if (road is not self.road or road.generation != self.generation
+                or self.surface is None or self.surface.get_size() != size):
+            self.road = road
+            self.generation = road.generation
+            self.surface = pygame.Surface(size, 0, target)
+            self.offset = None
+
+        height = self.surface.get_height()
+        period = road.period
+        offset %= period
+        if self.offset is None:
+            ready = road.paint(self.surface, 0, height, offset)
+            self.redraws += 1
+        else:
+            down = (offset - self.offset) % period
+            up = period - down
+            ready = True
+            if down == 0:
+                self.reused += 1
+            elif down <= period // 2 and down < height:
+                # Shift the old rows down and paint the strip that appeared on top
+                self.surface.scroll(0, down)
+                ready = road.paint(self.surface, 0, down, offset)
+                self.scrolls += 1
+            elif down > period // 2 and up < height:
+                # Scrolled backwards (rewind): the strip appears at the bottom
+                self.surface.scroll(0, -up)
+                ready = road.paint(self.surface, height - up, up, offset)
+                self.scrolls += 1
+            else:
+                ready = road.paint(self.surface, 0, height, offset)
+                self.redraws += 1
+        # Plain road stood in for a tile that wasn't ready: repaint once it is
+        self.offset = offset if ready else None
+        return self.surface
+
+
+class CachedLayer:
+    """Transparent layer repainted only when its key changes or it is invalidated"""
+
+    def __init__(self):
+        """Initialize an empty layer"""
+        self.surface = None
+        self.key = None
+        self.dirty = True
+        self.result = None  # Whatever the last paint returned (e.g. button rects)
+        self.redraws = 0
+        self.reused = 0
+
+    def invalidate(self):
+        """Force a repaint on the next frame"""
+        self.dirty = True
+
+    def render(self, size, key, paint):
+        """Return the layer surface, calling paint(surface) first if it is stale"""
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.dirty = True
+        if self.dirty or key != self.key:
+            self.surface.fill((0, 0, 0, 0))
+            self.result = paint(self.surface)
+            self.key = key
+            self.dirty = False
+            self.redraws += 1
+        else:
+            self.reused += 1
+        return self.surface
+
+
+class Compositor:
+    """Builds frames from the road, immediate sprite layers, the HUD and overlays"""
+
+    def __init__(self):
+        """Create the cached layers"""
+        self.road = ScrollingLayer()
+        self.hud = CachedLayer()
+        self.overlay = CachedLayer()
+        self.perf = CachedLayer()  # Performance overlay (see perf.py)
+        self.immediate = dict.fromkeys(IMMEDIATE_LAYERS, 0)  # Redrawn every frame they appear
+
+    def invalidate(self):
+        """Repaint every cached layer on the next frame (e.g. after a resolution change)"""
+        self.road.invalidate()
+        self.hud.invalidate()
+        self.overlay.invalidate()
+        self.perf.invalidate()
+
+    def draw_road(self, target, road, offset):
+        """Copy the scrolled road layer into the frame"""
+        target.blit(self.road.render(road, offset, target), (0, 0))
+
+    def drew(self, name):
+        """Count a redraw of an immediate layer"""
+        self.immediate[name] += 1
+
+    def draw_cached(self, layer, target, area, key, paint):
+        """Blend a cached layer's area into the frame, repainting it if stale"""
+        surface = layer.render(target.get_size(), key, paint)
+        target.blit(surface, area.topleft, area)
+        return layer.result
+
+    def stats(self):
+        """Per-layer redraw counts"""
+        stats = {"road": {"redraws": self.road.redraws, "scrolls": self.road.scrolls,
+                          "reused": self.road.reused}}
+        for name, count in self.immediate.items():
+            stats[name] = {"redraws": count}
+        for name, layer in (("hud", self.hud), ("overlay", self.overlay)):
+            stats[name] = {"redraws": layer.redraws, "reused": layer.reused}
+        return stats
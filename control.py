@@ -0,0 +1,306 @@
+"""
+Speed Hunter - A simple car chase game
+Control server letting an external process drive the game over a Unix socket
+"""
+import argparse
+import asyncio
+import collections
+import os
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from features import FeatureEncoder
+
+# Request: op, step count, then one action byte per step (STEP only)
+REQUEST = struct.Struct("<BH")
+# Response: op, done, steps taken, game tick, observation floats; then a float32
+# reward per step taken and the float32 observation after the last one
+RESPONSE = struct.Struct("<BBHIH")
+
+# Ops
+STEP = 1
+RESET = 2
+OBSERVE = 3
+
+# Actions
+NOOP = 0
+LEFT = 1
+RIGHT = 2
+
+MAX_STEPS = 65535
+
+
+class ControlServer:
+    """Serves step/reset/observe requests; in lockstep mode the game only advances
+    when asked, otherwise it keeps running in real time and requests act on its ticks"""
+
+    def __init__(self, game, path, lockstep=False, fps=60):
+        """Prepare a server for a game (start it with run() or start())"""
+        self.game = game
+        self.path = path
+        self.lockstep = lockstep
+        self.fps = fps
+        self.encoder = FeatureEncoder(game)
+        self.loop = None
+        self.server = None
+
+        # Real-time mode: requests waiting for the game thread, and the one in progress
+        self.requests = collections.deque()
+        self.current = None  # [op, actions, rewards, future]
+
+        # Stats
+        self.requests_served = 0
+        self.steps = 0
+
+    def step(self, action):
+        """Apply an action and advance one tick; returns (reward, done)"""
+        game = self.game
+        game.menu_active = False  # The controller is playing
+        if action == LEFT:
+            game.car.move_left()
+        elif action == RIGHT:
+            game.car.move_right()
+        score = game.score
+        game.update()
+        self.steps += 1
+        return game.score - score, game.game_over
+
+    def reset(self):
+        """Start a new game"""
+        self.game.reset_game()
+        self.game.menu_active = False
+
+    def execute(self, op, actions, rewards):
+        """Run the steps of a request still to take (all of them in lockstep); returns
+        whether the request is complete"""
+        if op == RESET:
+            self.reset()
+        elif op == STEP:
+            while len(rewards) < len(actions):
+                reward, done = self.step(actions[len(rewards)])
+                rewards.append(reward)
+                if done or not self.lockstep:
+                    # Real time: one step per game tick; a game over ends the batch
+                    return done or len(rewards) == len(actions)
+        return True
+
+    def response(self, op, rewards):
+        """Encode the response to a finished request"""
+        game = self.game
+        observation = self.encoder.encode()
+        self.requests_served += 1
+        header = RESPONSE.pack(op, game.game_over, len(rewards), game.tick, observation.size)
+        return header + np.array(rewards, np.float32).tobytes() + observation.tobytes()
+
+    async def handle(self, reader, writer):
+        """Serve one controller connection"""
+        try:
+            while True:
+                op, count = REQUEST.unpack(await reader.readexactly(REQUEST.size))
+                actions = await reader.readexactly(count) if op == STEP else b""
+                rewards = []
+                if self.lockstep:
+                    self.execute(op, actions, rewards)
+                    writer.write(self.response(op, rewards))
+                else:
+                    # Hand the request to the game thread and wait for its ticks
+                    future = self.loop.create_future()
+                    self.requests.append([op, actions, rewards, future])
+                    self.wake()
+                    writer.write(await future)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def pending(self):
+        """Real-time mode: whether requests are waiting for the game thread"""
+        return self.current is not None or bool(self.requests)
+
+    def wake(self):
+        """Wake a game loop sleeping on an idle screen (see idle.py)"""
+        import pygame
+        if self.game.menu_active or self.game.game_over:
+            pygame.event.post(pygame.event.Event(pygame.USEREVENT))
+
+    def tick(self):
+        """Real-time mode: advance the game one tick, taking the next requested step"""
+        if self.current is None and self.requests:
+            self.current = self.requests.popleft()
+        if self.current is None:
+            self.game.update()
+            return
+        op, actions, rewards, future = self.current
+        if self.execute(op, actions, rewards):
+            self.current = None
+            self.loop.call_soon_threadsafe(future.set_result, self.response(op, rewards))
+
+    async def serve(self):
+        """Listen on the socket"""
+        self.loop = asyncio.get_running_loop()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = await asyncio.start_unix_server(self.handle, self.path)
+
+    async def pump(self, render):
+        """Lockstep mode: keep handling window events (SDL turns SIGTERM into QUIT) and
+        show the latest state"""
+        game = self.game
+        while True:
+            game.handle_events()
+            game.loader.poll()  # Takes over the assets once they finished loading
+            if render:
+                game.draw()
+                game.present()
+            await asyncio.sleep(1 / self.fps)
+
+    def run(self, render=True):
+        """Lockstep mode: serve on this thread until the game quits"""
+        async def main():
+            await self.serve()
+            await self.pump(render)
+        asyncio.run(main())
+
+    def start(self):
+        """Real-time mode: serve on a background thread; the game loop calls tick()"""
+        ready = threading.Event()
+
+        async def main():
+            await self.serve()
+            ready.set()
+            await asyncio.Event().wait()
+        threading.Thread(target=asyncio.run, args=(main(),), name="control", daemon=True).start()
+        ready.wait()
+
+    def close(self):
+        """Stop listening and remove the socket"""
+        if self.server is not None:
+            self.loop.call_soon_threadsafe(self.server.close)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def stats(self):
+        """Server counters"""
+        return {"requests": self.requests_served, "steps": self.steps}
+
+
+class ControlClient:
+    """Blocking controller-side connection"""
+
+    def __init__(self, path, timeout=None):
+        """Connect to a control server"""
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.settimeout(timeout)
+        self.socket.connect(path)
+
+    def receive(self, size):
+        """Read exactly size bytes"""
+        data = bytearray(size)
+        view = memoryview(data)
+        while view:
+            received = self.socket.recv_into(view)
+            if not received:
+                raise ConnectionError("control server closed the connection")
+            view = view[received:]
+        return data
+
+    def request(self, op, actions=b""):
+        """Send a request; returns (observation, rewards, done, tick)"""
+        self.socket.sendall(REQUEST.pack(op, len(actions)) + bytes(actions))
+        _, done, steps, tick, size = RESPONSE.unpack(self.receive(RESPONSE.size))
+        payload = np.frombuffer(self.receive((steps + size) * 4), np.float32)
+        return payload[steps:], payload[:steps], bool(done), tick
+
+    def step(self, actions):
+        """Take a batch of steps (NOOP/LEFT/RIGHT each); stops early at a game over"""
+        if isinstance(actions, int):
+            actions = (actions,)
+        if len(actions) > MAX_STEPS:
+            raise ValueError(f"at most {MAX_STEPS} steps per request")
+        return self.request(STEP, actions)
+
+    def reset(self):
+        """Start a new game"""
+        return self.request(RESET)
+
+    def observe(self):
+        """The current observation, without advancing"""
+        return self.request(OBSERVE)
+
+    def close(self):
+        """Disconnect"""
+        self.socket.close()
+
+
+def benchmark(path, steps=20000, batches=(1, 8, 64), out=sys.stdout):
+    """Compare stepping a lockstep server over the socket with stepping in process"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import random
+    from main import Game
+
+    # In-process cost of a step, and of an observation
+    random.seed(1)
+    game = Game()
+    server = ControlServer(game, path, lockstep=True)
+    start = time.perf_counter()
+    for i in range(steps):
+        server.step(i % 3)
+        if game.game_over:
+            server.reset()
+    local = (time.perf_counter() - start) / steps
+    start = time.perf_counter()
+    for _ in range(steps):
+        server.encoder.encode()
+    encode = (time.perf_counter() - start) / steps
+    print(f"In process: {local * 1e6:.1f} us/step, {encode * 1e6:.1f} us/observation", file=out)
+
+    if os.path.exists(path):
+        os.unlink(path)  # Left over from a killed server; wait for the new one below
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    process = subprocess.Popen([sys.executable, "main.py", "--control", path, "--lockstep", "--no-render"],
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while not os.path.exists(path):
+            if process.poll() is not None:
+                raise RuntimeError("control server exited")
+            time.sleep(0.05)
+        client = ControlClient(path)
+        client.reset()
+        for batch in batches:
+            actions = bytes(i % 3 for i in range(batch))
+            taken = 0
+            start = time.perf_counter()
+            while taken < steps:
+                _, rewards, done, _ = client.step(actions)
+                taken += len(rewards)
+                if done:
+                    client.reset()
+            elapsed = (time.perf_counter() - start) / taken
+            print(f"Socket, {batch:3d} steps/request: {elapsed * 1e6:.1f} us/step "
+                  f"({(elapsed - local) * 1e6:.1f} us/step over stepping in process)", file=out)
+        client.close()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the Speed Hunter control server")
+    parser.add_argument("--socket", default="/tmp/speed-hunter-bench.sock", help="socket path to use")
+    parser.add_argument("--steps", type=int, default=20000, help="steps per measurement (default: 20000)")
+    args = parser.parse_args(argv)
+    benchmark(args.socket, args.steps)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
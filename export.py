@@ -0,0 +1,150 @@
+"""
+Speed Hunter - A simple car chase game
+Offline frame export rendering a scripted session to PNGs with parallel encoding
+"""
+import argparse
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+
+# Shared frame ring attached once per encoder process
+worker_frames = None
+
+
+def init_worker(name):
+    """Attach an encoder process to the shared frame ring"""
+    global worker_frames
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    worker_frames = shared_memory.SharedMemory(name=name)
+
+
+def encode(slot, size, path):
+    """Save one frame slot of the ring as a PNG"""
+    import pygame
+    frame_bytes = size[0] * size[1] * 3
+    view = worker_frames.buf[slot * frame_bytes:(slot + 1) * frame_bytes]
+    # frombuffer wraps the shared memory without copying it
+    image = pygame.image.frombuffer(view, size, "RGB")
+    pygame.image.save(image, path)
+    del image
+    view.release()
+
+
+def export(out_dir, frames=600, seed=1, start_speed=10, render_mode="quality",
+           quality_tier="high", workers=None, slots=8, out=sys.stdout):
+    """Render frames of an autopilot session to out_dir, return timing stats"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import random
+    import numpy as np
+    import pygame
+    import quality
+    from main import Game
+    from autopilot import Autopilot
+    from object import ObjectStore
+
+    # Seed gameplay and effects so the same arguments give the same frames
+    random.seed(seed)
+    quality.fx_random.seed(seed)
+    ObjectStore.fx_rng = np.random.default_rng(seed)
+
+    game = Game(start_speed=start_speed, render_mode=render_mode, quality_tier=quality_tier,
+                road_worker=False, background_loading=False)
+    game.autopilot = Autopilot(game)
+    os.makedirs(out_dir, exist_ok=True)
+
+    width, height = game.window.get_size()
+    frame_bytes = width * height * 3
+    ring = shared_memory.SharedMemory(create=True, size=frame_bytes * slots)
+    ring_frames = np.ndarray((slots, height, width, 3), np.uint8, ring.buf)
+
+    # Slots that are free to be drawn into; waiting on this is the backpressure
+    free = queue.Queue()
+    for slot in range(slots):
+        free.put(slot)
+
+    stalled = 0.0
+    draw_time = 0.0
+    pending = []
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(ring.name,)) as pool:
+            for frame in range(frames):
+                # One simulation tick per frame: a fixed 60 Hz timeline
+                draw_start = time.perf_counter()
+                game.autopilot.update()
+                game.update()
+                game.draw()
+                game.present()
+                draw_time += time.perf_counter() - draw_start
+
+                wait_start = time.perf_counter()
+                slot = free.get()
+                stalled += time.perf_counter() - wait_start
+
+                # pixels3d is a view of the window; one copy moves it into the ring
+                pixels = pygame.surfarray.pixels3d(game.window)
+                ring_frames[slot] = pixels.transpose(1, 0, 2)
+                del pixels  # Unlock the window surface
+
+                path = os.path.join(out_dir, f"frame_{frame:06d}.png")
+                future = pool.submit(encode, slot, (width, height), path)
+                # The slot is free again once encoded (or failed)
+                future.add_done_callback(lambda done, slot=slot: free.put(slot))
+                pending.append(future)
+                if len(pending) > slots * 4:
+                    for future in pending:
+                        if future.done():
+                            future.result()  # Raise encoder errors
+                    pending = [future for future in pending if not future.done()]
+            for future in pending:
+                future.result()
+    finally:
+        del ring_frames
+        ring.close()
+        ring.unlink()
+
+    elapsed = time.perf_counter() - start
+    result = {
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed else 0.0,
+        "draw_seconds": draw_time,
+        "stalled_seconds": stalled,  # Waiting for a free slot (encoders behind)
+    }
+    print(f"Exported {frames} frames ({width}x{height}) to {out_dir} in {elapsed:.1f} s: "
+          f"{result['fps']:.1f} FPS ({frames / 60:.1f} s of gameplay, "
+          f"{frames / 60 / elapsed:.1f}x real time); draw {draw_time:.1f} s, "
+          f"waiting for encoders {stalled:.1f} s", file=out)
+    return result
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Speed Hunter offline frame export")
+    parser.add_argument("out_dir", help="directory for the frame_NNNNNN.png files")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--start-speed", type=int, default=10)
+    parser.add_argument("--render-mode", choices=["quality", "performance"], default="quality",
+                        help="internal render resolution (frames are exported at window size)")
+    parser.add_argument("--quality", choices=["low", "medium", "high"], default="high")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="PNG encoder processes (default: one per CPU)")
+    parser.add_argument("--slots", type=int, default=8,
+                        help="frames buffered for the encoders; bounds memory use")
+    args = parser.parse_args(argv)
+
+    export(args.out_dir, frames=args.frames, seed=args.seed, start_speed=args.start_speed,
+           render_mode=args.render_mode, quality_tier=args.quality, workers=args.workers,
+           slots=args.slots)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
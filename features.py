@@ -0,0 +1,181 @@
+"""
+Speed Hunter - A simple car chase game
+Compact feature-vector observations of the live game state for bots
+"""
+import sys
+import time
+
+import numpy as np
+
+from object import COLLECTED, OBSTACLE
+
+# Occupancy grid channels
+COIN_CHANNEL = 0
+OBSTACLE_CHANNEL = 1
+CHANNELS = 2
+
+# Scalars after the grid, in vector order
+SCALARS = ("car_lane", "target_lane", "game_speed", "missed_objects", "coins_for_speed")
+
+
+class FeatureEncoder:
+    """Encodes the game into a fixed-size float32 vector: a (channel, lane, row) occupancy
+    grid of the coins and obstacles up to lookahead pixels ahead of the car, then SCALARS"""
+
+    def __init__(self, game, lookahead=600, row_height=20):
+        """Preallocate the vector and the bookkeeping for a game"""
+        self.game = game
+        self.lane_count = game.car.lane_count
+        self.lane_width = game.car.lane_width
+        self.row_height = row_height
+        self.rows = lookahead // row_height
+        self.grid_size = CHANNELS * self.lane_count * self.rows
+
+        # The grid part is a view of the vector, so encode() only touches changed cells
+        self.vector = np.zeros(self.grid_size + len(SCALARS), np.float32)
+        self.grid = self.vector[:self.grid_size].reshape(CHANNELS, self.lane_count, self.rows)
+        self.counts = np.zeros(self.grid_size, np.int32)  # Objects per cell
+
+        # Flat cell of each store row at the last encode (-1 when outside the grid)
+        self.store = None
+        self.objects = []  # The store's objects at the last encode, in row order
+        self.cells = []
+
+        # Stats
+        self.encodes = 0
+        self.rebuilds = 0  # Encodes that recounted every object
+        self.moved = 0  # Objects that changed cell
+
+    def locate(self, store):
+        """Return the flat grid cell of every store row"""
+        n = store.count
+        bottom = self.game.car.rect.bottom  # Rows count up from the car's front bumper
+        row_height, lane_width = self.row_height, self.lane_width
+        rows, lanes = self.rows, self.lane_count
+        cells = []
+        # With a handful of live objects, Python over the columns beats NumPy's per-call cost
+        for x, y, flags in zip(store.x[:n].tolist(), store.y[:n].tolist(), store.flags[:n].tolist()):
+            row = int((bottom - y) // row_height)
+            lane = int(x // lane_width)
+            if flags & COLLECTED or not (0 <= row < rows and 0 <= lane < lanes):
+                cells.append(-1)
+            else:
+                # The OBSTACLE flag is the channel
+                cells.append(((flags & OBSTACLE) * lanes + lane) * rows + row)
+        return cells
+
+    def move(self, old, new):
+        """Move an object between cells, updating counts and the occupancy grid"""
+        counts = self.counts
+        grid = self.vector
+        if old >= 0:
+            counts[old] -= 1
+            if counts[old] == 0:
+                grid[old] = 0.0
+        if new >= 0:
+            counts[new] += 1
+            grid[new] = 1.0
+
+    def encode(self, out=None):
+        """Return the observation vector of the game's current state (the encoder's own
+        buffer unless out is given; it is overwritten by the next encode)"""
+        game = self.game
+        store = game.store
+        cells = self.locate(store)
+
+        if store is self.store and store.objects == self.objects:
+            # Same objects in the same rows: only those that crossed a cell boundary move
+            for old, new in zip(self.cells, cells):
+                if old != new:
+                    self.move(old, new)
+                    self.moved += 1
+        else:
+            # Objects spawned, left or were replaced: recount from the old cells
+            for old in self.cells:
+                self.move(old, -1)
+            for new in cells:
+                self.move(-1, new)
+            self.store = store
+            self.objects = list(store.objects)
+            self.rebuilds += 1
+        self.cells = cells
+
+        car = game.car
+        vector = self.vector
+        base = self.grid_size
+        vector[base] = car.current_lane
+        vector[base + 1] = car.target_x // self.lane_width
+        vector[base + 2] = game.game_speed
+        vector[base + 3] = game.missed_objects
+        vector[base + 4] = game.coins_for_speed
+        self.encodes += 1
+        if out is not None:
+            out[:] = vector
+            return out
+        return vector
+
+    def reference(self):
+        """Encode from scratch with plain Python (for checking encode())"""
+        game = self.game
+        car = game.car
+        vector = np.zeros_like(self.vector)
+        grid = vector[:self.grid_size].reshape(self.grid.shape)
+        for obj in game.objects:
+            if obj.collected:
+                continue
+            row = (car.rect.bottom - obj.y) // self.row_height
+            lane = obj.x // self.lane_width
+            if 0 <= row < self.rows and 0 <= lane < self.lane_count:
+                channel = OBSTACLE_CHANNEL if obj.is_obstacle else COIN_CHANNEL
+                grid[channel, int(lane), int(row)] = 1.0
+        vector[self.grid_size:] = (car.current_lane, car.target_x // self.lane_width,
+                                   game.game_speed, game.missed_objects, game.coins_for_speed)
+        return vector
+
+    def stats(self):
+        """Encoder counters"""
+        return {"encodes": self.encodes, "rebuilds": self.rebuilds, "moved": self.moved}
+
+
+def benchmark(ticks=20000, start_speed=10, seed=1, out=sys.stdout):
+    """Encode every tick of an autopilot run, checking against the reference encoder"""
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import random
+    from main import Game
+    from autopilot import Autopilot
+
+    random.seed(seed)
+    game = Game(start_speed=start_speed)
+    game.menu_active = False
+    game.autopilot = Autopilot(game)
+    encoder = FeatureEncoder(game)
+    encode_time = 0.0
+    mismatches = 0
+    for tick in range(ticks):
+        game.autopilot.update()
+        game.update()
+        start = time.perf_counter()
+        vector = encoder.encode()
+        encode_time += time.perf_counter() - start
+        if tick % 10 == 0 and not np.array_equal(vector, encoder.reference()):
+            mismatches += 1
+
+    # The cost of a repeated encode of an unchanged state
+    repeats = 100000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        encoder.encode()
+    idle_time = time.perf_counter() - start
+
+    print(f"Vector size {encoder.vector.size} ({CHANNELS}x{encoder.lane_count}x{encoder.rows} grid "
+          f"+ {len(SCALARS)} scalars)", file=out)
+    print(f"Live game: {ticks / encode_time:.0f} observations/s ({encode_time / ticks * 1e6:.1f} us), "
+          f"{encoder.stats()}, {mismatches} mismatches with the reference", file=out)
+    print(f"Unchanged state: {repeats / idle_time:.0f} observations/s", file=out)
+    return mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(1 if benchmark() else 0)
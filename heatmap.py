@@ -0,0 +1,288 @@
+"""
+Speed Hunter - A simple car chase game
+Lane and position heatmaps accumulated per session as fixed-size NumPy histograms
+"""
+import argparse
+import copy
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import telemetry
+
+SPEED_BANDS = 40  # speed_step-wide bands; faster play lands in the last one
+X_BINS = 24  # Columns across the road for event positions
+
+# Event kinds with a position histogram, by telemetry event type
+EVENT_KINDS = (telemetry.COIN_PICKUP, telemetry.COIN_MISSED, telemetry.CRASH)
+KIND_NAMES = [telemetry.EVENT_NAMES[kind] for kind in EVENT_KINDS]
+KIND_INDEX = {kind: i for i, kind in enumerate(EVENT_KINDS)}
+
+
+class Heatmaps:
+    """The histograms; they merge by adding, so sessions combine in any order"""
+
+    def __init__(self, lane_count=3, speed_step=10):
+        """Initialize empty histograms"""
+        self.lane_count = lane_count
+        self.speed_step = speed_step
+        self.occupancy = np.zeros((SPEED_BANDS, lane_count), np.int64)  # Ticks per lane
+        self.events = np.zeros((len(EVENT_KINDS), SPEED_BANDS, X_BINS), np.int64)
+        self.lane_changes = np.zeros((SPEED_BANDS, lane_count, lane_count), np.int64)  # From, to
+        self.games = 0
+
+    def merge(self, other):
+        """Add another set of histograms into this one"""
+        if (other.lane_count, other.speed_step) != (self.lane_count, self.speed_step):
+            raise ValueError(f"can't merge heatmaps of {other.lane_count} lanes and {other.speed_step} km/h "
+                             f"bands into {self.lane_count} lanes and {self.speed_step} km/h bands")
+        self.occupancy += other.occupancy
+        self.events += other.events
+        self.lane_changes += other.lane_changes
+        self.games += other.games
+
+    def save(self, path):
+        """Write the histograms to a compressed .npz file"""
+        # Write then rename, so readers never see a partial file
+        temporary = path + ".tmp.npz"
+        np.savez_compressed(temporary, occupancy=self.occupancy, events=self.events,
+                            lane_changes=self.lane_changes, games=self.games,
+                            lane_count=self.lane_count, speed_step=self.speed_step)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """Read histograms written by save()"""
+        with np.load(path) as data:
+            heatmaps = cls(int(data["lane_count"]), int(data["speed_step"]))
+            heatmaps.occupancy[:] = data["occupancy"]
+            heatmaps.events[:] = data["events"]
+            heatmaps.lane_changes[:] = data["lane_changes"]
+            heatmaps.games = int(data["games"])
+        return heatmaps
+
+
+class HeatmapRecorder:
+    """Accumulates a session's heatmaps with O(1) work per tick and event, and saves
+    them at every game over on a background thread"""
+
+    def __init__(self, directory, lane_count=3, lane_width=400, speed_step=10):
+        """Start a session writing to a file in directory"""
+        self.directory = directory
+        self.lane_width = lane_width
+        self.road_width = lane_width * lane_count
+        self.heatmaps = Heatmaps(lane_count, speed_step)
+        self.band_width = speed_step
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"heatmap-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.npz")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="heatmap")
+
+        # Ticks in the same lane at the same speed are counted in a plain int and
+        # added to the occupancy histogram when either changes
+        self.lane = None
+        self.speed = None
+        self.run = 0
+
+        # Stats
+        self.ticks = 0
+        self.saves = 0
+
+    def band(self, speed):
+        """Speed band of a game speed"""
+        return min(int(speed) // self.band_width, SPEED_BANDS - 1)
+
+    def tick(self, speed, lane):
+        """Count a simulated tick spent in a lane, and a lane change since the last one"""
+        if lane != self.lane or speed != self.speed:
+            self.flush()
+            if self.lane is not None and lane != self.lane:
+                self.heatmaps.lane_changes[self.band(speed), self.lane, lane] += 1
+            self.lane = lane
+            self.speed = speed
+        self.run += 1
+
+    def flush(self):
+        """Add the current run of ticks to the occupancy histogram"""
+        if self.run:
+            self.heatmaps.occupancy[self.band(self.speed), self.lane] += self.run
+            self.ticks += self.run
+            self.run = 0
+
+    def event(self, event_type, x, speed):
+        """Count a pickup, miss or crash at a road position; save at game over"""
+        kind = KIND_INDEX.get(event_type)
+        if kind is not None:
+            column = min(max(int(x * X_BINS // self.road_width), 0), X_BINS - 1)
+            self.heatmaps.events[kind, self.band(speed), column] += 1
+        elif event_type == telemetry.GAME_OVER:
+            self.heatmaps.games += 1
+            self.flush()
+            self.lane = None  # The next game starts from the middle lane
+            self.save()
+
+    def save(self):
+        """Write a copy of the session's heatmaps so far in the background"""
+        self.flush()
+        self.writer.submit(copy.deepcopy(self.heatmaps).save, self.path)
+        self.saves += 1
+
+    def close(self):
+        """Save on exit and wait for the writes"""
+        if self.ticks or self.run:
+            self.save()
+        self.writer.shutdown()
+
+
+def merge_files(paths):
+    """Merge saved heatmaps"""
+    merged = None
+    for path in paths:
+        heatmaps = Heatmaps.load(path)
+        if merged is None:
+            merged = heatmaps
+        else:
+            merged.merge(heatmaps)
+    return merged
+
+
+def colorize(counts):
+    """Map counts (rows, columns) to heat colors (black, red, yellow, white), normalized per image"""
+    top = counts.max()
+    heat = counts / top if top else counts.astype(float)
+    rgb = np.empty(counts.shape + (3,), np.uint8)
+    rgb[..., 0] = np.clip(heat * 3, 0, 1) * 255
+    rgb[..., 1] = np.clip(heat * 3 - 1, 0, 1) * 255
+    rgb[..., 2] = np.clip(heat * 3 - 2, 0, 1) * 255
+    return rgb
+
+
+def render_image(counts, path, title, columns_label, speed_step, cell=(24, 12)):
+    """Render a (speed band, column) histogram as a PNG, fastest band at the top"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    pygame.font.init()
+    bands = np.flatnonzero(counts.sum(axis=1))
+    if not bands.size:
+        return False
+    counts = counts[bands.min():bands.max() + 1][::-1]
+    rows, columns = counts.shape
+    margin_left, margin_top = 80, 30
+    width, height = cell[0] * columns, cell[1] * rows
+    # surfarray indexes (x, y): transpose the (row, column) counts
+    heat = pygame.surfarray.make_surface(colorize(counts).transpose(1, 0, 2))
+    image = pygame.Surface((margin_left + width + 10, margin_top + height + 30))
+    image.fill((20, 20, 20))
+    image.blit(pygame.transform.scale(heat, (width, height)), (margin_left, margin_top))
+
+    font = pygame.font.SysFont("arial", 14)
+    image.blit(font.render(title, True, (255, 255, 255)), (10, 8))
+    image.blit(font.render(columns_label, True, (200, 200, 200)), (margin_left, margin_top + height + 8))
+    top_band = bands.max()
+    for row in range(rows):
+        low = (top_band - row) * speed_step
+        label = f"{low}+" if top_band - row == SPEED_BANDS - 1 else f"{low} km/h"
+        image.blit(font.render(label, True, (200, 200, 200)), (10, margin_top + row * cell[1] - 2))
+    pygame.image.save(image, path)
+    return True
+
+
+def render(heatmaps, out_dir):
+    """Render every histogram of a set of heatmaps into out_dir; returns the files written"""
+    os.makedirs(out_dir, exist_ok=True)
+    step = heatmaps.speed_step
+    lanes = heatmaps.lane_count
+    images = [("occupancy.png", heatmaps.occupancy, "Ticks per lane by speed", "lane", (48, 12))]
+    for name, counts in zip(KIND_NAMES, heatmaps.events):
+        images.append((f"{name}.png", counts, f"{name.replace('_', ' ').capitalize()} positions by speed",
+                       "position across the road", (24, 12)))
+    # Lane changes: one column per (from, to) pair that is a change
+    pairs = [(a, b) for a in range(lanes) for b in range(lanes) if a != b]
+    changes = np.stack([heatmaps.lane_changes[:, a, b] for a, b in pairs], axis=1)
+    images.append(("lane_changes.png", changes, "Lane changes by speed",
+                   "  ".join(f"{a}>{b}" for a, b in pairs), (36, 12)))
+    written = []
+    for filename, counts, title, columns_label, cell in images:
+        path = os.path.join(out_dir, filename)
+        if render_image(counts, path, title, columns_label, step, cell):
+            written.append(path)
+    return written
+
+
+def summarize(heatmaps, out=sys.stdout):
+    """Print the totals of a set of heatmaps"""
+    ticks = heatmaps.occupancy.sum()
+    print(f"{heatmaps.games} games, {ticks} ticks", file=out)
+    if ticks:
+        share = heatmaps.occupancy.sum(axis=0) / ticks
+        print("Lane occupancy: " + ", ".join(f"lane {lane} {value:.1%}" for lane, value in enumerate(share)),
+              file=out)
+    for name, counts in zip(KIND_NAMES, heatmaps.events):
+        print(f"{name}: {counts.sum()}", file=out)
+    changes = heatmaps.lane_changes.sum()
+    print(f"lane changes: {changes}" + (f" ({changes / ticks * 3600:.1f} per minute at 60 Hz)" if ticks else ""),
+          file=out)
+
+
+def benchmark(ticks=20000, seed=1, out=sys.stdout):
+    """Time autopilot games with and without a recorder"""
+    import random
+    import tempfile
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from main import Game, LANE_COUNT, LANE_WIDTH, SPEED_STEP
+    from autopilot import Autopilot
+
+    with tempfile.TemporaryDirectory() as directory:
+        for recording in (False, True):
+            random.seed(seed)
+            game = Game()
+            game.menu_active = False
+            game.autopilot = Autopilot(game)
+            if recording:
+                game.heatmap = HeatmapRecorder(directory, LANE_COUNT, LANE_WIDTH, SPEED_STEP)
+            start = time.perf_counter()
+            for _ in range(ticks):
+                game.autopilot.update()
+                game.update()
+            elapsed = (time.perf_counter() - start) / ticks
+            label = "with heatmaps" if recording else "without"
+            print(f"{label:14s} {elapsed * 1e6:.1f} us/tick", file=out)
+        recorder = game.heatmap
+        size = os.path.getsize(recorder.path) if recorder.saves else 0
+        print(f"{recorder.saves} saves of {size} bytes", file=out)
+        summarize(recorder.heatmaps, out)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Merge and render Speed Hunter heatmaps")
+    parser.add_argument("paths", nargs="*", help="heatmap .npz files or directories of them")
+    parser.add_argument("--merge", metavar="FILE", help="write the merged heatmaps to FILE")
+    parser.add_argument("--render", metavar="DIR", help="render the merged heatmaps as PNGs into DIR")
+    parser.add_argument("--benchmark", action="store_true", help="measure the recording cost per tick")
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        benchmark()
+        return 0
+
+    files = []
+    for path in args.paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.npz"))) if os.path.isdir(path) else [path])
+    if not files:
+        parser.error("no heatmap files given")
+    heatmaps = merge_files(files)
+    summarize(heatmaps)
+    if args.merge:
+        heatmaps.save(args.merge)
+    if args.render:
+        for path in render(heatmaps, args.render):
+            print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
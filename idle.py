@@ -0,0 +1,93 @@
+"""
+Speed Hunter - A simple car chase game
+Idle scheduler throttling the game loop on static screens and hidden windows
+"""
+import time
+
+import pygame
+
+
+class IdleScheduler:
+    """Blocks on input while only pulses move and stops drawing while the window is hidden"""
+
+    def __init__(self, fps=60, idle_fps=10, hidden_timeout_ms=1000):
+        """Initialize the scheduler; idle_fps of 0 disables throttling"""
+        self.fps = fps
+        self.idle_fps = idle_fps  # Redraw rate for the menu / game over pulses
+        self.hidden_timeout_ms = hidden_timeout_ms
+        self.visible = True
+        self.focused = True
+        self.last_draw = 0.0
+        self.steps = 1  # Display frames the next draw stands for (animations catch up)
+
+        # Stats
+        self.idle_draws = 0
+        self.hidden_frames = 0
+        self.wakeups = 0  # Waits ended early by an event
+
+    def observe(self, event):
+        """Track window visibility and focus"""
+        if event.type in (pygame.WINDOWHIDDEN, pygame.WINDOWMINIMIZED):
+            self.visible = False
+        elif event.type in (pygame.WINDOWSHOWN, pygame.WINDOWRESTORED, pygame.WINDOWEXPOSED):
+            self.visible = True
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            self.focused = False
+        elif event.type == pygame.WINDOWFOCUSGAINED:
+            self.focused = True
+
+    def driven(self, game):
+        """Check whether the bot or a controller with requests waiting plays"""
+        return game.autopilot is not None or (game.control is not None and game.control.pending())
+
+    def static(self, game):
+        """Check whether a menu or game over screen shows with nobody playing"""
+        return (game.menu_active or game.game_over) and not self.driven(game)
+
+    def idle(self, game):
+        """Check whether nothing but pulse animations moves"""
+        return self.idle_fps > 0 and self.static(game)
+
+    def poll(self, game):
+        """Return this frame's events, first blocking for input on a static screen
+        that is idle or hidden (gameplay keeps running while hidden)"""
+        if not self.static(game) or (self.visible and not self.idle(game)):
+            return pygame.event.get()
+
+        if self.visible:
+            # Sleep until the next pulse frame is due
+            due = self.last_draw + 1 / self.idle_fps
+            timeout = int((due - time.perf_counter()) * 1000)
+            if timeout <= 0:
+                return pygame.event.get()
+        else:
+            timeout = self.hidden_timeout_ms
+
+        # wait(0) would block forever
+        event = pygame.event.wait(max(1, timeout))
+        if event.type == pygame.NOEVENT:
+            return pygame.event.get()
+        self.wakeups += 1
+        return [event] + pygame.event.get()
+
+    def should_draw(self, game):
+        """Decide whether to draw this frame and how many animation steps it covers"""
+        if not self.visible:
+            self.hidden_frames += 1
+            return False
+        now = time.perf_counter()
+        if self.idle(game):
+            self.steps = min(self.fps, max(1, round((now - self.last_draw) * self.fps)))
+            self.idle_draws += 1
+        else:
+            self.steps = 1
+        self.last_draw = now
+        return True
+
+    def stats(self):
+        """Return scheduler counters"""
+        return {
+            "idle_draws": self.idle_draws,
+            "hidden_frames": self.hidden_frames,
+            "wakeups": self.wakeups,
+        }
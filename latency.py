@@ -0,0 +1,143 @@
+"""
+Speed Hunter - A simple car chase game
+Input-to-photon latency harness injecting key presses and watching the presented frames
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+
+def probe_points(game, count=48):
+    """Pick window pixels covered by the opaque upper half of the resting car"""
+    car = game.car
+    image = car.base_image
+    width, height = image.get_size()
+    points = []
+    # The lower half is skipped: the headlight beams flicker over it
+    for y in range(4, height // 2, 3):
+        for x in range(4, width - 4, 3):
+            # Interior pixels only, so upscaled (blurred) edges don't count
+            if all(image.get_at((x + dx, y + dy)).a == 255 for dx in (-2, 0, 2) for dy in (-2, 0, 2)):
+                points.append((int(car.x - width // 2 + x), int(car.y - height // 2 + y)))
+    return random.Random(0).sample(points, min(count, len(points)))
+
+
+def moved(window, points, reference, threshold=0.25):
+    """Check whether enough probe pixels changed from the resting car"""
+    changed = sum(1 for point, color in zip(points, reference) if window.get_at(point) != color)
+    return changed > len(points) * threshold
+
+
+def post_key(key, posted):
+    """Inject a key press, remembering when it was posted"""
+    import pygame
+    posted.append(time.perf_counter())
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+
+def percentile(values, fraction):
+    """Value at a fraction of a sorted list"""
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def measure(game, samples=100, settle_frames=10, timeout_frames=30):
+    """Measure key-press-to-presented-frame latencies in seconds"""
+    import pygame
+    from main import FPS
+
+    # Keep the road empty so nothing ends the game mid-run
+    game.menu_active = False
+    game.spawn_delay = 10 ** 9
+    game.objects = []
+    game.car.reset()
+    for _ in range(settle_frames):
+        game.frame()
+    points = probe_points(game)
+
+    latencies = []
+    frames = []
+    missed = 0
+    for sample in range(samples):
+        # Park the car in the middle lane and let it settle
+        game.car.reset()
+        for _ in range(settle_frames):
+            game.frame()
+        reference = [game.window.get_at(point) for point in points]
+
+        # Post the key from another thread at a random point within a frame,
+        # as a player's key press would arrive
+        posted = []
+        key = pygame.K_LEFT if sample % 2 == 0 else pygame.K_RIGHT
+        timer = threading.Timer(random.uniform(0, 1 / FPS), post_key, (key, posted))
+        timer.start()
+        for frame in range(timeout_frames):
+            game.frame()
+            if posted and moved(game.window, points, reference):
+                latencies.append(game.last_present - posted[0])
+                frames.append(frame + 1)
+                break
+        else:
+            missed += 1
+        timer.join()
+
+    return {"latencies": latencies, "frames": frames, "missed": missed}
+
+
+def report(name, result, out=sys.stdout):
+    """Print the latency distribution"""
+    latencies = sorted(result["latencies"])
+    if not latencies:
+        print(f"{name}: no movement detected ({result['missed']} samples)", file=out)
+        return
+    ms = [latency * 1000 for latency in latencies]
+    print(f"{name}: {len(ms)} samples  mean {sum(ms) / len(ms):6.1f} ms  "
+          f"p50 {percentile(ms, 0.5):6.1f}  p95 {percentile(ms, 0.95):6.1f}  "
+          f"p99 {percentile(ms, 0.99):6.1f}  max {ms[-1]:6.1f} ms  "
+          f"frames {sum(result['frames']) / len(result['frames']):.2f}  missed {result['missed']}",
+          file=out)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Speed Hunter input-to-photon latency harness")
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--busy-loop", action="store_true",
+                        help="pace frames with Clock.tick_busy_loop instead of Clock.tick")
+    parser.add_argument("--vsync", action="store_true")
+    parser.add_argument("--matrix", action="store_true",
+                        help="measure every tick/busy-loop and vsync off/on combination")
+    parser.add_argument("--render-mode", choices=["quality", "performance"], default="quality")
+    parser.add_argument("--threaded-render", action="store_true")
+    parser.add_argument("--headless", action="store_true",
+                        help="use SDL's dummy video and audio drivers")
+    args = parser.parse_args(argv)
+
+    if args.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    from main import Game
+    from render_pipeline import RenderPipeline
+
+    if args.matrix:
+        configs = [(busy, vsync) for vsync in (False, True) for busy in (False, True)]
+    else:
+        configs = [(args.busy_loop, args.vsync)]
+
+    for busy_loop, vsync in configs:
+        game = Game(render_mode=args.render_mode, vsync=vsync, busy_loop=busy_loop)
+        if args.threaded_render:
+            game.pipeline = RenderPipeline(game)
+        result = measure(game, samples=args.samples)
+        if game.pipeline:
+            game.pipeline.stop()
+        name = (f"{'tick_busy_loop' if busy_loop else 'tick':>14}, "
+                f"vsync {'on ' if game.vsync else 'off'}")
+        report(name, result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
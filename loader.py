@@ -0,0 +1,188 @@
+"""
+Speed Hunter - A simple car chase game
+Background loading of the gameplay assets while the main menu shows
+"""
+import argparse
+import atexit
+import logging
+import subprocess
+import sys
+import threading
+import time
+import weakref
+
+import pygame
+
+from object import RoadObject
+
+# Posted when loading finishes, so an idle menu wakes up to enable Start Game
+LOADED = pygame.event.custom_type()
+
+# Sound effects, by Game attribute
+SOUNDS = (("coin_sound", "assets/coin.wav"), ("crash_sound", "assets/crash.wav"),
+          ("engine_sound", "assets/engine.wav"))
+
+# Loaders with a running worker, waited for at exit before pygame's surfaces are freed
+running = weakref.WeakSet()
+
+logger = logging.getLogger(__name__)
+
+
+class AssetLoader:
+    """Loads the sounds and prebuilds the sprite, effect and mask caches on a worker
+    thread; the main thread takes the results over in poll()"""
+
+    def __init__(self, game, scales, threaded=True):
+        """Queue the loading jobs for a game and its render scales; threaded=False runs
+        them right away instead"""
+        self.game = game
+        self.sounds = {}
+        self.jobs = [("sounds", self.load_sounds)]
+        for scale in scales:
+            self.jobs.append((f"objects at {scale:g}x", lambda scale=scale: RoadObject.prebuild(scale)))
+            self.jobs.append((f"exhaust at {scale:g}x", lambda scale=scale: game.car.prebuild_exhaust(scale)))
+        if game.pixel_collision:
+            image = game.car.base_image.copy()  # The worker's own copy: blits lock their source
+            self.jobs.append(("car masks", lambda: game.car.prebuild_masks(image)))
+            self.jobs.append(("object masks", RoadObject.prebuild_masks))
+        self.done = 0  # Jobs finished
+        self.finished = False  # Set by the worker when every job has run
+        self.ready = False  # Set by poll() once the results are in use
+        self.stopped = False
+        self.failed = []
+        self.thread = None
+
+        # Stats
+        self.started = time.perf_counter()
+        self.seconds = None
+
+        if threaded:
+            self.thread = threading.Thread(target=self.work, name="loader", daemon=True)
+            self.thread.start()
+            running.add(self)
+        else:
+            self.work()
+            self.poll()
+
+    def load_sounds(self):
+        """Load the sound effects (the game stays silent without a mixer)"""
+        try:
+            pygame.mixer.init()
+            for name, path in SOUNDS:
+                self.sounds[name] = pygame.mixer.Sound(path)
+        except (pygame.error, OSError):
+            self.sounds = {}
+
+    def work(self):
+        """Run the jobs; one that fails leaves its assets to be built on first use"""
+        for name, job in self.jobs:
+            if self.stopped:
+                return
+            try:
+                job()
+            except Exception:
+                logger.warning("Loading %s failed, building it on first use", name, exc_info=True)
+                self.failed.append(name)
+            self.done += 1
+        self.seconds = time.perf_counter() - self.started
+        self.finished = True
+        if self.thread is not None:
+            try:
+                pygame.event.post(pygame.event.Event(LOADED))
+            except pygame.error:
+                pass  # The display is gone
+
+    def poll(self):
+        """Take over the results once loading finished (main thread); returns whether ready"""
+        if self.finished and not self.ready:
+            self.ready = True
+            game = self.game
+            for name, sound in self.sounds.items():
+                setattr(game, name, sound)
+            if game.engine_sound:
+                game.engine_sound.play(-1)  # Loop engine sound
+                game.engine_sound.set_volume(0.3)
+        return self.ready
+
+    def progress(self):
+        """Fraction of the jobs done"""
+        return self.done / len(self.jobs)
+
+    def stop(self):
+        """Skip the remaining jobs and wait for the current one"""
+        self.stopped = True
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def stats(self):
+        """Loader counters"""
+        return {"jobs": len(self.jobs), "done": self.done, "failed": self.failed, "seconds": self.seconds}
+
+
+@atexit.register
+def stop_all():
+    """Stop every worker (also when the game didn't quit through quit_game)"""
+    for loader in list(running):
+        loader.stop()
+
+
+def measure(background, frames=300, seed=1, out=sys.stdout):
+    """Time a fresh game's first menu frame, its loading and its first gameplay frames"""
+    import os
+    import random
+    start = time.perf_counter()
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from main import Game
+    from autopilot import Autopilot
+
+    random.seed(seed)
+    game = Game(road_worker=False, background_loading=background)
+    game.draw()
+    game.present()
+    menu = time.perf_counter() - start
+    while not game.loader.poll():
+        time.sleep(0.001)
+    ready = time.perf_counter() - start
+
+    game.menu_active = False
+    game.autopilot = Autopilot(game)
+    times = []
+    for _ in range(frames):
+        frame_start = time.perf_counter()
+        game.autopilot.update()
+        game.update()
+        game.draw()
+        times.append((time.perf_counter() - frame_start) * 1000)
+    times.sort()
+    label = "background" if background else "synchronous"
+    print(f"{label:12s} menu after {menu * 1000:6.1f} ms, ready after {ready * 1000:6.1f} ms, "
+          f"first {frames} frames: median {times[frames // 2]:.2f} ms, worst {times[-1]:.2f} ms", file=out)
+    if game.engine_sound:
+        game.engine_sound.stop()
+
+
+def benchmark(out=sys.stdout):
+    """Measure synchronous and background loading, each in a fresh process (the caches
+    are per process)"""
+    for mode in ("synchronous", "background"):
+        result = subprocess.run([sys.executable, __file__, "--measure", mode],
+                                capture_output=True, text=True, check=True)
+        out.write(result.stdout.splitlines()[-1] + "\n")
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Measure Speed Hunter's asset loading")
+    parser.add_argument("--measure", choices=("synchronous", "background"),
+                        help="measure one mode in this process instead of both in fresh ones")
+    args = parser.parse_args(argv)
+    if args.measure:
+        measure(args.measure == "background")
+    else:
+        benchmark()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
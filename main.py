@@ -6,9 +6,23 @@ Main game loop and logic with enhanced visuals
 import pygame
 import sys
 import random
+import time
+import argparse
+import logging
 from car import Car
-from object import RoadObject
+from object import RoadObject, ObjectStore
 from ui import UI
+import telemetry
+from render_pipeline import RenderPipeline, Snapshot
+from compositor import Compositor
+from renderer import SurfaceRenderer, TextureRenderer, BACKENDS
+import quality
+from rewind import RewindBuffer
+from idle import IdleScheduler
+from perf import PerfOverlay, allocated
+from timescale import TimeScale, SCALES
+from loader import AssetLoader
+import road
 
 # Initialize pygame
 pygame.init()
@@ -19,6 +33,14 @@ SCREEN_HEIGHT = 800  # Increased from 600 to 800
 FPS = 60
 LANE_COUNT = 3
 LANE_WIDTH = SCREEN_WIDTH // LANE_COUNT
+SPEED_STEP = 10  # km/h added per speed-up
+COINS_PER_SPEED_STEP = 10
+
+# Render scale of the back buffer relative to the window (world) size
+RENDER_MODES = {
+    "quality": 1.0,  # Draw straight into the 1200x800 window
+    "performance": 0.5,  # Draw into a 600x400 back buffer and upscale it
+}
 
 # Colors
 WHITE = (255, 255, 255)
@@ -28,14 +50,43 @@ GRAY = (100, 100, 100)
 class Game:
     """Main game class for Speed Hunter"""
     
-    def __init__(self):
+    def __init__(self, start_speed=10, render_mode="quality", quality_tier=None,
+                 pixel_collision=False, vsync=False, busy_loop=False, idle_fps=10, renderer="surface",
+                 road_worker=True, time_scale=1, background_loading=True, rewind=False):
         """Initialize the game"""
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Speed Hunter")
+        self.vsync = False
+        self.window = None
+        if renderer == "texture":
+            # SDL2 renderer drawing textures into its own window (see renderer.py)
+            self.renderer = TextureRenderer((SCREEN_WIDTH, SCREEN_HEIGHT), "Speed Hunter", vsync)
+            self.vsync = vsync
+        else:
+            if vsync:
+                # VSync needs a renderer-backed (SCALED) window
+                try:
+                    self.window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+                    self.vsync = True
+                except pygame.error as error:
+                    logging.getLogger(__name__).warning("VSync unavailable (%s), running without it", error)
+            if not self.vsync:
+                self.window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Speed Hunter")
+            self.renderer = SurfaceRenderer(self)
         self.clock = pygame.time.Clock()
+        # tick() sleeps; tick_busy_loop() spins for a more accurate frame pace
+        self.busy_loop = busy_loop
+        self.wait_frame = self.clock.tick_busy_loop if busy_loop else self.clock.tick
+        self.last_present = 0.0  # perf_counter() after the last frame was shown
+        
+        # Sleep on input in menus and stop drawing while hidden (see idle.py)
+        self.idle = IdleScheduler(FPS, idle_fps)
+        
+        # Simulation ticks per display frame (see timescale.py)
+        self.time_scale = TimeScale(time_scale, FPS)
+        self.animation_steps = 1  # Steps of the HUD animations in the next draw
         
         # Load assets
-        self.road_img = self.load_image("assets/road.png", SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.road_base = self.load_image("assets/road.png", SCREEN_WIDTH, SCREEN_HEIGHT)
         
         # Create game objects
         self.car = Car(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 100, LANE_COUNT, LANE_WIDTH)
@@ -47,35 +98,87 @@ class Game:
         self.missed_objects = 0
         self.max_missed = 5  # Changed from 3 to 5
         self.game_over = False
-        self.game_speed = 10  # Initial speed set to 10 km/h
+        self.start_speed = start_speed
+        self.game_speed = start_speed  # Initial speed (10 km/h unless --start-speed)
         self.coins_for_speed = 0  # Counter for coins collected for speed increase
         self.menu_active = True
         self.speed_notification = None
         self.speed_notification_timer = 0
+        self.pixel_collision = pixel_collision  # Mask test after the rect test
         
-        # Object spawning
-        self.objects = []
+        # Object spawning; road object state lives in the store's arrays
+        self.store = ObjectStore()
         self.spawn_timer = 0
         self.spawn_delay = 60  # frames between spawns
         
-        # Road animation
+        # Road animation: distance scrolled, and the road segments streamed in ahead of
+        # it (road_worker=False renders them on demand, for deterministic frames)
         self.road_y = 0
+        self.road = road.RoadStream(road.RoadGenerator(lane_count=LANE_COUNT), threaded=road_worker)
         
         # Particle effects
         self.particles = []
         
-        # Sound effects
-        try:
-            pygame.mixer.init()
-            self.coin_sound = pygame.mixer.Sound("assets/coin.wav")
-            self.crash_sound = pygame.mixer.Sound("assets/crash.wav")
-            self.engine_sound = pygame.mixer.Sound("assets/engine.wav")
-            self.engine_sound.play(-1)  # Loop engine sound
-            self.engine_sound.set_volume(0.3)
-        except:
-            self.coin_sound = None
-            self.crash_sound = None
-            self.engine_sound = None
+        # Optional threaded render pipeline (see render_pipeline.py)
+        self.pipeline = None
+        self.button_rects = {}  # Buttons on the last drawn menu / game over screen
+        
+        # Adaptive effect quality (a fixed tier for benchmarking)
+        self.governor = quality.QualityGovernor(budget_ms=1000 / FPS, fixed_tier=quality_tier)
+        
+        # Layered draw batch of the renderer; batch.last_stats holds the per-frame call counts
+        self.batch = self.renderer.batch
+        
+        # Road, HUD and overlay layers reused between frames (see compositor.py)
+        self.compositor = Compositor()
+        
+        # Frame timing and subsystem counters, shown with F3 (see perf.py)
+        self.perf = PerfOverlay(self)
+        self.particle_cache = {}
+        
+        # Back buffer everything is drawn into (see set_render_mode)
+        self.set_render_mode(render_mode)
+        
+        # Optional autopilot driving the car (see autopilot.py)
+        self.autopilot = None
+        
+        # Optional telemetry bus (see telemetry.py)
+        self.telemetry = None
+        
+        # Optional lane/position heatmaps (see heatmap.py)
+        self.heatmap = None
+        
+        # Optional shared-memory pixel observations (see observation.py)
+        self.observer = None
+        
+        # Optional external controller over a Unix socket (see control.py)
+        self.control = None
+        self.tick = 0  # Simulation ticks since launch
+        self.game_index = 0
+        self.game_started = False
+        
+        # Rewind a few seconds with BACKSPACE (see rewind.py); recording every tick
+        # is only worth it in interactive play, so tools leave it off
+        self.next_object_id = 0
+        self.rewind = RewindBuffer(self, fps=FPS, speed_step=SPEED_STEP) if rewind else None
+        
+        # Sound effects (set by the loader)
+        self.coin_sound = None
+        self.crash_sound = None
+        self.engine_sound = None
+        
+        # Sounds, sprite variants and effect caches load on a worker thread while the
+        # menu shows (see loader.py); background_loading=False loads them right here
+        self.loader = AssetLoader(self, RENDER_MODES.values(), threaded=background_loading)
+        
+    @property
+    def objects(self):
+        """Live road objects (views of the store's rows)"""
+        return self.store.objects
+        
+    @objects.setter
+    def objects(self, objects):
+        self.store.replace(objects)
         
     def load_image(self, path, width=None, height=None):
         """Load an image and optionally resize it"""
@@ -104,6 +207,50 @@ class Game:
             
         return image
         
+    def set_render_mode(self, mode):
+        """Switch the internal render resolution"""
+        self.render_mode = mode
+        self.render_scale = RENDER_MODES[mode]
+        s = self.render_scale
+        
+        size = (int(SCREEN_WIDTH * s), int(SCREEN_HEIGHT * s))
+        if self.window is None:
+            # Texture renderer: the screen surface only lays out the frame and cached layers
+            self.screen = pygame.Surface(size)
+        elif s == 1.0:
+            self.screen = self.window
+        else:
+            self.screen = pygame.Surface(size).convert()
+        if s == 1.0:
+            self.road_img = self.road_base
+        else:
+            self.road_img = pygame.transform.smoothscale(self.road_base, size)
+        self.renderer.set_render_size(size)
+        self.road.resize(self.road_img, s)
+            
+        # Re-bake sprites and fonts at the new resolution
+        self.car.set_render_scale(s)
+        self.ui.set_render_scale(s)
+        for obj in self.objects:
+            obj.set_render_scale(s)
+        self.compositor.invalidate()
+            
+    def toggle_render_mode(self):
+        """Cycle through the render modes"""
+        modes = list(RENDER_MODES)
+        mode = modes[(modes.index(self.render_mode) + 1) % len(modes)]
+        if self.pipeline:
+            # The render thread may be drawing with the surfaces being replaced
+            with self.pipeline.paused():
+                self.set_render_mode(mode)
+        else:
+            self.set_render_mode(mode)
+        
+    def present(self):
+        """Show the drawn frame"""
+        self.renderer.present()
+        self.last_present = time.perf_counter()
+        
     def spawn_object(self):
         """Spawn a new road object"""
         # Choose a random lane
@@ -113,20 +260,22 @@ class Game:
         is_obstacle = random.random() < 0.2
         
         # Create the object
-        obj = RoadObject(lane * LANE_WIDTH + LANE_WIDTH // 2, -50, is_obstacle, LANE_WIDTH)
-        self.objects.append(obj)
+        obj = RoadObject(lane * LANE_WIDTH + LANE_WIDTH // 2, -50, is_obstacle, LANE_WIDTH,
+                         self.render_scale, self.store)
+        obj.id = self.next_object_id  # Stable identity for rewind snapshots
+        self.next_object_id += 1
         
     def create_particles(self, x, y, color, count=10):
         """Create particle effects"""
-        for _ in range(count):
+        for _ in range(int(count * quality.effects['particle_ratio'])):
             particle = {
                 'x': x,
                 'y': y,
-                'dx': random.uniform(-2, 2),
-                'dy': random.uniform(-2, 2),
-                'size': random.randint(2, 6),
+                'dx': quality.fx_random.uniform(-2, 2),
+                'dy': quality.fx_random.uniform(-2, 2),
+                'size': quality.fx_random.randint(2, 6),
                 'color': color,
-                'life': random.randint(20, 40)
+                'life': quality.fx_random.randint(20, 40)
             }
             self.particles.append(particle)
             
@@ -142,52 +291,79 @@ class Game:
             if particle['life'] <= 0:
                 self.particles.remove(particle)
         
+    def record_event(self, event_type, x=None, y=None, value=0):
+        """Record a gameplay event on the telemetry bus and the heatmaps"""
+        if self.telemetry or self.heatmap:
+            if x is None:
+                # Default to the car's position
+                x, y = self.car.x, self.car.y
+            if self.heatmap:
+                self.heatmap.event(event_type, x, self.game_speed)
+        if self.telemetry:
+            lane = min(max(int(x // LANE_WIDTH), 0), LANE_COUNT - 1)
+            self.telemetry.record(self.tick, event_type, self.game_index, lane, x, y,
+                                  self.score, int(self.game_speed), value)
+            
+    def end_game(self, cause):
+        """End the current game"""
+        self.game_over = True
+        self.record_event(telemetry.GAME_OVER, value=cause)
+        if self.crash_sound:
+            self.crash_sound.play()
+            
     def update(self):
         """Update game state"""
         if self.game_over or self.menu_active:
             return
             
+        if not self.game_started:
+            self.game_started = True
+            self.record_event(telemetry.GAME_START, value=self.spawn_delay)
+        self.tick += 1
+        
         # Update car
         self.car.update()
+        if self.heatmap:
+            self.heatmap.tick(self.game_speed, self.car.current_lane)
         
         # Update road animation
-        self.road_y = (self.road_y + self.game_speed) % SCREEN_HEIGHT
+        self.road_y = (self.road_y + self.game_speed) % road.PERIOD
         
-        # Update objects
-        for obj in self.objects[:]:
-            obj.update(self.game_speed)
-            
+        # Update all objects at once, then handle the few that left the
+        # screen or reached the car
+        self.store.update(self.game_speed)
+        for obj in self.store.candidates(self.car.rect, SCREEN_HEIGHT):
             # Check if object is off screen
             if obj.y > SCREEN_HEIGHT:
-                self.objects.remove(obj)
+                self.store.remove(obj)
                 if not obj.is_obstacle and not obj.collected:
                     self.missed_objects += 1
+                    self.record_event(telemetry.COIN_MISSED, obj.x, obj.y)
                     if self.missed_objects >= self.max_missed:
-                        self.game_over = True
-                        if self.crash_sound:
-                            self.crash_sound.play()
+                        self.end_game(telemetry.CAUSE_MISSED)
                         
             # Check collision with car
-            elif obj.check_collision(self.car):
+            elif obj.check_collision(self.car, self.pixel_collision):
                 if obj.is_obstacle:
-                    self.game_over = True
+                    self.record_event(telemetry.CRASH, obj.x, obj.y)
                     # Create explosion particles
                     self.create_particles(obj.x, obj.y, (255, 100, 0), 30)
-                    if self.crash_sound:
-                        self.crash_sound.play()
+                    self.end_game(telemetry.CAUSE_CRASH)
                 else:
                     self.score += 10
                     obj.collected = True
-                    self.objects.remove(obj)
+                    self.store.remove(obj)
+                    self.record_event(telemetry.COIN_PICKUP, obj.x, obj.y)
                     
                     # Count coins for speed increase
                     self.coins_for_speed += 1
-                    if self.coins_for_speed >= 10:
-                        # Increase speed by exactly 10 km/h and ensure it's an integer
-                        self.game_speed = int(self.game_speed) + 10
+                    if self.coins_for_speed >= COINS_PER_SPEED_STEP:
+                        # Increase speed by exactly one step and ensure it's an integer
+                        self.game_speed = int(self.game_speed) + SPEED_STEP
                         self.coins_for_speed = 0
-                        self.speed_notification = f"Speed +10: {int(self.game_speed)} km/h"
+                        self.speed_notification = f"Speed +{SPEED_STEP}: {int(self.game_speed)} km/h"
                         self.speed_notification_timer = 60  # Show for 60 frames (1 second)
+                        self.record_event(telemetry.SPEED_UP)
                     
                     # Create sparkle particles
                     self.create_particles(obj.x, obj.y, (255, 215, 0), 20)
@@ -212,127 +388,249 @@ class Game:
             self.speed_notification_timer -= 1
             if self.speed_notification_timer <= 0:
                 self.speed_notification = None
+                
+        # Snapshot the state for rewinding
+        if self.rewind:
+            self.rewind.record()
             
-    def draw(self):
-        """Draw the game state"""
-        # Draw road
-        self.screen.blit(self.road_img, (0, self.road_y - SCREEN_HEIGHT))
-        self.screen.blit(self.road_img, (0, self.road_y))
+    def snapshot(self):
+        """Copy everything draw() needs into an immutable snapshot"""
+        return Snapshot(
+            tick=self.tick,
+            time=time.perf_counter(),
+            road_y=self.road_y,
+            car=self.car.snapshot(),
+            objects=tuple((obj, obj.snapshot()) for obj in self.objects),
+            particles=tuple((p['x'], p['y'], p['size'], p['color']) for p in self.particles),
+            score=self.score,
+            high_score=self.high_score,
+            missed_objects=self.missed_objects,
+            max_missed=self.max_missed,
+            game_speed=self.game_speed,
+            speed_notification=self.speed_notification,
+            speed_notification_timer=self.speed_notification_timer,
+            game_over=self.game_over,
+            menu_active=self.menu_active,
+            animation_steps=self.animation_steps,
+            time_scale=self.time_scale.label(),
+        )
+        
+    def get_particle(self, radius, color):
+        """Return a cached circle sprite for an effect particle"""
+        key = (radius, color)
+        particle_surf = self.particle_cache.get(key)
+        if particle_surf is None:
+            particle_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(particle_surf, color, (radius, radius), radius)
+            self.particle_cache[key] = particle_surf
+            allocated("particles")
+        return particle_surf
+        
+    def draw(self, frame=None, surface=None):
+        """Draw a snapshot of the game state (the current state by default)"""
+        if frame is None:
+            frame = self.snapshot()
+        screen = surface if surface is not None else self.screen
+        s = self.render_scale
+        renderer = self.renderer
+        compositor = self.compositor
+        batch = renderer.begin(screen)
+        
+        # Draw road, scrolled in place on its own layer
+        renderer.draw_road(screen, self.road, int(frame.road_y * s))
         
         # Draw objects
-        for obj in self.objects:
-            obj.draw(self.screen)
+        for obj, state in frame.objects:
+            obj.draw(screen, state, batch)
+        if frame.objects:
+            compositor.drew("objects")
             
         # Draw particles
-        for particle in self.particles:
-            pygame.draw.circle(
-                self.screen, 
-                particle['color'], 
-                (int(particle['x']), int(particle['y'])), 
-                particle['size']
-            )
+        for x, y, size, color in frame.particles:
+            particle_surf = self.get_particle(max(1, int(size * s)), color)
+            radius = particle_surf.get_width() // 2
+            batch.add("particles", particle_surf, (int(x * s) - radius, int(y * s) - radius))
+        if frame.particles:
+            compositor.drew("particles")
             
         # Draw car
-        self.car.draw(self.screen)
+        self.car.draw(screen, frame.car, batch)
+        compositor.drew("car")
+        
+        batch.flush()
+        
+        # Draw UI: the panel is repainted only when a value on it changes
+        ui = self.ui
+        ui.animate(frame.score, frame.animation_steps)
+        panel = (frame.score, frame.high_score, frame.missed_objects, frame.max_missed, frame.game_speed)
+        renderer.draw_cached(compositor.hud, screen, ui.panel_rect(screen), ui.panel_key(*panel),
+                             lambda surface: ui.draw_panel(surface, *panel))
         
-        # Draw UI
-        self.ui.draw(self.screen, self.score, self.high_score, 
-                    self.missed_objects, self.max_missed, self.game_speed)
+        # Pulsing alerts and the speed notification change nearly every frame
+        renderer.draw_live(screen, self.live_key(frame), lambda surface: self.draw_live(surface, frame))
+        
+        # Draw game over screen
+        result = None
+        if frame.game_over:
+            ui.count_up(frame.score, frame.animation_steps)  # The final score counts up twice as fast
+            self.button_rects = renderer.draw_cached(
+                compositor.overlay, screen, screen.get_rect(), ui.game_over_key(frame.score, frame.high_score),
+                lambda surface: ui.draw_game_over(surface, frame.score, frame.high_score))
+            result = self.button_rects
+            
+        # Draw main menu
+        elif frame.menu_active:
+            self.button_rects = renderer.draw_cached(
+                compositor.overlay, screen, screen.get_rect(),
+                ("menu", self.max_missed, ui.mouse_pos(), self.loading_percent()), self.draw_main_menu)
+            
+        # Performance overlay (F3), repainted a few times per second
+        perf = self.perf
+        if perf.visible:
+            renderer.draw_cached(compositor.perf, screen, perf.rect(screen), perf.key(), perf.paint)
+            
+        return result
+        
+    def live_key(self, frame):
+        """Everything draw_live() depends on, or None when it draws nothing"""
+        alerts = self.ui.alerts_key(frame.missed_objects, frame.max_missed)
+        if alerts is None and not frame.speed_notification and frame.time_scale is None:
+            return None
+        return (alerts, frame.speed_notification, frame.speed_notification_timer, frame.time_scale)
+        
+    def draw_live(self, screen, frame):
+        """Draw the pulsing alerts, the speed notification and the time scale"""
+        self.ui.draw_alerts(screen, frame.missed_objects, frame.max_missed)
+        
+        # Time scale and the ticks per second it achieves
+        if frame.time_scale:
+            scale_text = self.ui.get_font(24).render(frame.time_scale, True, (0, 255, 255))
+            allocated("text")
+            screen.blit(scale_text, (screen.get_width() - scale_text.get_width() - self.ui.scaled(20),
+                                     self.ui.scaled(20)))
                     
         # Draw speed notification if active
-        if self.speed_notification:
-            notification_font = pygame.font.SysFont('arial', 36)
-            notification_text = notification_font.render(self.speed_notification, True, (255, 255, 0))
+        if frame.speed_notification:
+            notification_font = self.ui.get_font(36)
+            notification_text = notification_font.render(frame.speed_notification, True, (255, 255, 0))
+            allocated("text")
             
             # Make it pulse/fade based on remaining time
-            alpha = int(255 * (self.speed_notification_timer / 60))
+            alpha = int(255 * (frame.speed_notification_timer / 60))
             notification_text.set_alpha(alpha)
             
             # Position in the middle of the screen
-            self.screen.blit(notification_text, 
-                           (self.screen.get_width() // 2 - notification_text.get_width() // 2, 
-                            self.screen.get_height() // 2 - 100))
-        
-        # Draw game over screen
-        if self.game_over:
-            button_rects = self.ui.draw_game_over(self.screen, self.score, self.high_score)
-            return button_rects
-            
-        # Draw main menu
-        if self.menu_active:
-            self.draw_main_menu()
-            
-        return None
+            screen.blit(notification_text, 
+                        (screen.get_width() // 2 - notification_text.get_width() // 2, 
+                         screen.get_height() // 2 - self.ui.scaled(100)))
             
-    def draw_main_menu(self):
+    def loading_percent(self):
+        """Loading progress shown on the menu, or None once the assets are ready"""
+        if self.loader.ready:
+            return None
+        return int(self.loader.progress() * 100)
+        
+    def draw_main_menu(self, screen=None):
         """Draw the main menu"""
+        if screen is None:
+            screen = self.screen
+        sc = self.ui.scaled
+        center_x = screen.get_width() // 2
+        button_width = sc(self.ui.button_width)
+        button_height = sc(self.ui.button_height)
+        
         # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
-        self.screen.blit(overlay, (0, 0))
+        screen.blit(overlay, (0, 0))
         
         # Title
-        title_font = pygame.font.SysFont('arial', 92, bold=True)  # Increased font size
+        title_font = self.ui.get_font(92, bold=True)  # Increased font size
         title_text = title_font.render("SPEED HUNTER", True, (255, 255, 0))
-        self.screen.blit(title_text, 
-                        (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 150))
+        screen.blit(title_text, 
+                        (center_x - title_text.get_width() // 2, sc(150)))
         
         # Subtitle
-        subtitle_font = pygame.font.SysFont('arial', 32)  # Increased font size
+        subtitle_font = self.ui.get_font(32)  # Increased font size
         subtitle_text = subtitle_font.render("Collect coins, avoid obstacles!", True, (255, 255, 255))
-        self.screen.blit(subtitle_text, 
-                        (SCREEN_WIDTH // 2 - subtitle_text.get_width() // 2, 250))
+        screen.blit(subtitle_text, 
+                        (center_x - subtitle_text.get_width() // 2, sc(250)))
         
         # Get mouse position for button hover effect
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.ui.mouse_pos()
         
-        # Start button
+        # Start button, showing the loading progress until the assets are ready
+        loading = self.loading_percent()
         start_rect = self.ui.draw_button(
-            self.screen, 
-            "Start Game", 
-            (SCREEN_WIDTH // 2, 400),
-            self.ui.is_point_in_rect(mouse_pos, 
-                                   SCREEN_WIDTH // 2 - self.ui.button_width // 2,
-                                   400 - self.ui.button_height // 2,
-                                   self.ui.button_width, 
-                                   self.ui.button_height)
+            screen, 
+            "Start Game" if loading is None else f"Loading {loading}%", 
+            (center_x, sc(400)),
+            loading is None and self.ui.is_point_in_rect(mouse_pos, 
+                                   center_x - button_width // 2,
+                                   sc(400) - button_height // 2,
+                                   button_width, 
+                                   button_height)
         )
+        if loading is not None:
+            # Progress bar along the bottom edge of the button
+            bar = pygame.Rect(start_rect.x, start_rect.bottom - sc(6), start_rect.width * loading // 100, sc(6))
+            pygame.draw.rect(screen, (255, 255, 0), bar)
         
         # Quit button
         quit_rect = self.ui.draw_button(
-            self.screen, 
+            screen, 
             "Quit Game", 
-            (SCREEN_WIDTH // 2, 500),
+            (center_x, sc(500)),
             self.ui.is_point_in_rect(mouse_pos, 
-                                   SCREEN_WIDTH // 2 - self.ui.button_width // 2,
-                                   500 - self.ui.button_height // 2,
-                                   self.ui.button_width, 
-                                   self.ui.button_height)
+                                   center_x - button_width // 2,
+                                   sc(500) - button_height // 2,
+                                   button_width, 
+                                   button_height)
         )
         
         # Controls info
-        controls_font = pygame.font.SysFont('arial', 28)  # Increased font size
+        controls_font = self.ui.get_font(28)  # Increased font size
         controls_text = controls_font.render("Use LEFT and RIGHT arrow keys to move", True, (200, 200, 200))
-        self.screen.blit(controls_text, 
-                        (SCREEN_WIDTH // 2 - controls_text.get_width() // 2, 600))
+        screen.blit(controls_text, 
+                        (center_x - controls_text.get_width() // 2, sc(600)))
         
         # Missed coins info
-        missed_font = pygame.font.SysFont('arial', 24)
+        missed_font = self.ui.get_font(24)
         missed_text = missed_font.render(f"Game over after missing {self.max_missed} coins", True, (200, 200, 200))
-        self.screen.blit(missed_text, 
-                        (SCREEN_WIDTH // 2 - missed_text.get_width() // 2, 650))
+        screen.blit(missed_text, 
+                        (center_x - missed_text.get_width() // 2, sc(650)))
         
-        return {"start": start_rect, "quit": quit_rect}
+        self.button_rects = {"start": start_rect, "quit": quit_rect}
+        return self.button_rects
         
-    def handle_events(self):
-        """Handle game events"""
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        """Handle game events (the pending ones by default)"""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
+            self.idle.observe(event)
             if event.type == pygame.QUIT:
                 self.quit_game()
                 
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                self.toggle_render_mode()
+                
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.perf.toggle()
+                
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_LEFTBRACKET:
+                self.time_scale.slower()
+                
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_RIGHTBRACKET:
+                self.time_scale.faster()
+                
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE:
+                if self.rewind and not self.menu_active:
+                    self.rewind.rewind(seconds=3, fps=FPS)
+                
             elif event.type == pygame.KEYDOWN:
                 if self.menu_active:
-                    if event.key == pygame.K_RETURN:
+                    if event.key == pygame.K_RETURN and self.loader.ready:
                         self.menu_active = False
                     elif event.key == pygame.K_ESCAPE:
                         self.quit_game()
@@ -351,20 +649,25 @@ class Game:
                         
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:  # Left click
-                    mouse_pos = event.pos
+                    # Button rects are in back buffer pixels
+                    mouse_pos = (int(event.pos[0] * self.render_scale),
+                                 int(event.pos[1] * self.render_scale))
+                    
+                    # Use the buttons of the last drawn frame (the render
+                    # thread may be drawing the next one)
+                    buttons = self.button_rects
                     
-                    if self.menu_active:
-                        menu_buttons = self.draw_main_menu()
-                        if menu_buttons["start"].collidepoint(mouse_pos):
-                            self.menu_active = False
-                        elif menu_buttons["quit"].collidepoint(mouse_pos):
+                    if self.menu_active and "start" in buttons:
+                        if buttons["start"].collidepoint(mouse_pos):
+                            if self.loader.ready:
+                                self.menu_active = False
+                        elif buttons["quit"].collidepoint(mouse_pos):
                             self.quit_game()
                             
-                    elif self.game_over:
-                        button_rects = self.draw()
-                        if button_rects["restart"].collidepoint(mouse_pos):
+                    elif self.game_over and "restart" in buttons:
+                        if buttons["restart"].collidepoint(mouse_pos):
                             self.reset_game()
-                        elif button_rects["quit"].collidepoint(mouse_pos):
+                        elif buttons["quit"].collidepoint(mouse_pos):
                             self.quit_game()
                     
     def reset_game(self):
@@ -372,7 +675,7 @@ class Game:
         self.score = 0
         self.missed_objects = 0
         self.game_over = False
-        self.game_speed = 10  # Reset to initial speed of exactly 10 km/h (integer)
+        self.game_speed = int(self.start_speed)  # Reset to the initial speed (an integer)
         self.coins_for_speed = 0
         self.objects = []
         self.particles = []
@@ -380,25 +683,168 @@ class Game:
         self.ui.score_animation = 0
         self.speed_notification = None
         self.speed_notification_timer = 0
+        self.game_index += 1
+        self.game_started = False
+        if self.rewind:
+            self.rewind.clear()
         
     def quit_game(self):
         """Save high score and quit the game"""
         self.ui.save_high_score(self.high_score)
+        if self.pipeline:
+            self.pipeline.stop()
+            print("Render pipeline:", self.pipeline.stats())
+        if self.telemetry:
+            self.telemetry.close()
+        if self.heatmap:
+            self.heatmap.close()
+        if self.observer:
+            self.observer.close()
+        if self.control:
+            self.control.close()
+        self.road.stop()
+        self.loader.stop()
         if self.engine_sound:
             self.engine_sound.stop()
         pygame.quit()
         sys.exit()
         
+    def frame(self):
+        """Run one iteration of the game loop"""
+        events = self.idle.poll(self)  # Blocks for input on idle screens
+        frame_start = time.perf_counter()
+        self.handle_events(events)
+        self.loader.poll()  # Takes over the assets once they finished loading
+        # Fast forward runs several ticks per frame and draws only the last;
+        # slow motion runs a tick only every few frames
+        for _ in range(self.time_scale.due()):
+            if self.autopilot:
+                self.autopilot.update()
+            if self.control:
+                self.control.tick()  # Takes the controller's next step, if one is waiting
+            else:
+                self.update()
+        updated = time.perf_counter()
+        
+        if not self.idle.should_draw(self):
+            # Window hidden: keep simulating but show nothing
+            self.perf.record((updated - frame_start) * 1000)
+            self.wait_frame(FPS)
+            return
+        self.animation_steps = self.time_scale.animation_steps(self.idle.steps)
+        if self.pipeline:
+            # Drawing happens on the render thread
+            self.pipeline.publish(self.snapshot())
+            if self.pipeline.present():
+                self.last_present = time.perf_counter()
+            self.perf.record((updated - frame_start) * 1000)
+        else:
+            self.draw()
+            if self.observer:
+                self.observer.observe()
+            drawn = time.perf_counter()
+            self.present()
+            presented = time.perf_counter()
+            # With vsync, present() blocks until the display refresh: that wait is
+            # not load, so the governor only sees the update and draw
+            self.governor.record(((drawn if self.vsync else presented) - frame_start) * 1000)
+            self.perf.record((updated - frame_start) * 1000, (drawn - updated) * 1000,
+                             (presented - drawn) * 1000)
+        self.wait_frame(FPS)
+        
     def run(self):
         """Main game loop"""
         while True:
-            self.handle_events()
-            self.update()
-            self.draw()
-            
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            self.frame()
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Speed Hunter")
+    parser.add_argument("--autopilot", action="store_true",
+                        help="let the lookahead bot drive and restart after game over")
+    parser.add_argument("--start-speed", type=int, default=10,
+                        help="initial game speed in km/h (default: 10)")
+    parser.add_argument("--render-mode", choices=list(RENDER_MODES), default="quality",
+                        help="internal render resolution; toggle in game with F2 (default: quality)")
+    parser.add_argument("--quality", choices=["auto"] + quality.TIER_NAMES, default="auto",
+                        help="effect quality tier; auto adapts to the frame budget (default: auto)")
+    parser.add_argument("--pixel-collision", action="store_true",
+                        help="pixel-perfect collisions using cached sprite masks")
+    parser.add_argument("--vsync", action="store_true",
+                        help="sync presentation to the display refresh (falls back if unavailable)")
+    parser.add_argument("--busy-loop", action="store_true",
+                        help="pace frames with Clock.tick_busy_loop instead of Clock.tick")
+    parser.add_argument("--idle-fps", type=int, default=10,
+                        help="redraw rate of the menu and game over screens, which otherwise "
+                             "sleep until input; 0 redraws at the full frame rate (default: 10)")
+    parser.add_argument("--renderer", choices=BACKENDS, default="surface",
+                        help="surface blits on the CPU, or SDL2 textures rotated and scaled by "
+                             "the GPU (default: surface)")
+    parser.add_argument("--time-scale", type=float, choices=SCALES, default=1, metavar="SCALE",
+                        help="simulation speed: " + ", ".join(f"{scale:g}" for scale in SCALES) +
+                             "; change in game with [ and ] (default: 1)")
+    parser.add_argument("--no-rewind", action="store_true",
+                        help="don't record the state for BACKSPACE rewinds (off anyway with --lockstep)")
+    parser.add_argument("--threaded-render", action="store_true",
+                        help="draw simulation snapshots on a separate render thread")
+    parser.add_argument("--telemetry", metavar="DIR",
+                        help="record gameplay events as compressed JSONL files in DIR")
+    parser.add_argument("--heatmap", metavar="DIR",
+                        help="accumulate lane and event position heatmaps, saved to DIR at each game over")
+    parser.add_argument("--observe", metavar="NAME",
+                        help="publish drawn frames to the shared memory block NAME for external agents")
+    parser.add_argument("--observe-downsample", type=int, default=1, metavar="N",
+                        help="keep every Nth pixel in each direction of observed frames")
+    parser.add_argument("--observe-grayscale", action="store_true",
+                        help="publish observed frames as grayscale")
+    parser.add_argument("--observe-stack", type=int, default=4, metavar="N",
+                        help="observed frames kept in the shared ring (default: 4)")
+    parser.add_argument("--control", metavar="PATH",
+                        help="let an external controller drive the game over the Unix socket PATH")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="with --control, advance the game only when the controller steps it")
+    parser.add_argument("--no-render", action="store_true",
+                        help="with --lockstep, don't draw at all (fastest stepping)")
+    args = parser.parse_args(argv)
+    if args.observe and args.threaded_render:
+        parser.error("--observe reads the back buffer on the main thread; drop --threaded-render")
+    if (args.lockstep or args.no_render) and not args.control:
+        parser.error("--lockstep and --no-render need --control")
+    if args.no_render and not args.lockstep:
+        parser.error("--no-render needs --lockstep")
+    if args.lockstep and args.threaded_render:
+        parser.error("--lockstep draws between requests on the main thread; drop --threaded-render")
+    if args.renderer == "texture" and (args.threaded_render or args.observe):
+        parser.error("--renderer texture has no back buffer surface for --threaded-render or --observe")
+    return args
 
 if __name__ == "__main__":
-    game = Game()
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    game = Game(start_speed=args.start_speed, render_mode=args.render_mode,
+                quality_tier=None if args.quality == "auto" else args.quality,
+                pixel_collision=args.pixel_collision, vsync=args.vsync,
+                busy_loop=args.busy_loop, idle_fps=args.idle_fps, renderer=args.renderer,
+                time_scale=args.time_scale, rewind=not (args.no_rewind or args.lockstep))
+    if args.autopilot:
+        from autopilot import Autopilot
+        game.autopilot = Autopilot(game)
+    if args.telemetry:
+        game.telemetry = telemetry.TelemetryBus(args.telemetry)
+    if args.heatmap:
+        from heatmap import HeatmapRecorder
+        game.heatmap = HeatmapRecorder(args.heatmap, LANE_COUNT, LANE_WIDTH, SPEED_STEP)
+    if args.threaded_render:
+        game.pipeline = RenderPipeline(game)
+    if args.observe:
+        from observation import PixelObserver
+        game.observer = PixelObserver(game, args.observe, downsample=args.observe_downsample,
+                                      grayscale=args.observe_grayscale, stack=args.observe_stack)
+    if args.control:
+        from control import ControlServer
+        game.control = ControlServer(game, args.control, lockstep=args.lockstep, fps=FPS)
+        if args.lockstep:
+            game.control.run(render=not args.no_render)
+        else:
+            game.control.start()
     game.run()
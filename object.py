@@ -5,57 +5,445 @@ Enhanced road object logic with improved visuals
 import pygame
 import random
 import math
+import numpy as np
+from batch import RenderBatch
+from quality import effects
+from perf import allocated
+
+# Quantization of the collision masks (see get_mask)
+MASK_ROTATION_STEP = 5  # Degrees
+MASK_SCALE_STEP = 0.05  # Collectible pulse scale
+
+# Object flags
+OBSTACLE = 1
+COLLECTED = 2
+
+GLOW_MAX = 10
+SPARKLES = 3  # Sparkle slots per collectible
+
+# Sprite files and sizes, by is_obstacle
+IMAGES = {True: "assets/obstacle.png", False: "assets/coin.png"}
+SIZES = {True: 70, False: 40}
+
+# Bounce limits of the (scale, glow) pulse columns
+PULSE_MIN = np.array([0.8, 0])
+PULSE_MAX = np.array([1.2, GLOW_MAX])
+
+
+def column_blocks(columns):
+    """Lay columns out in one block per dtype: a list of (dtype, block height,
+    [(name, first block row, values per row)])"""
+    blocks = {}
+    for name, dtype, per_row in columns:
+        height, fields = blocks.get(dtype, (0, []))
+        blocks[dtype] = (height + (per_row or 1), fields + [(name, height, per_row)])
+    return [(dtype, height, fields) for dtype, (height, fields) in blocks.items()]
+    
+    
+def column_view(block, start, per_row):
+    """One column of a block, shaped (rows,) or (rows, values per row)"""
+    return block[start] if per_row is None else block[start:start + per_row].T
+
+
+class ObjectStore:
+    """Live road objects' state in parallel NumPy arrays, advanced with vectorized operations"""
+    
+    # Per-row arrays: name, dtype, values per row
+    COLUMNS = (
+        ("x", np.float64, None),
+        ("y", np.float64, None),
+        ("rotation", np.float64, None),
+        ("rotation_speed", np.float64, None),
+        # Pulse scale and glow size, and the direction each is moving in
+        ("pulse", np.float64, 2),
+        ("pulse_direction", np.float64, 2),
+        ("flags", np.uint8, None),
+        ("object_id", np.uint32, None),  # Stable identity (see Game.spawn_object)
+        ("width", np.int32, None),
+        ("height", np.int32, None),
+        # Sparkles, relative to the object's top-left corner
+        ("sparkle_x", np.float64, SPARKLES),
+        ("sparkle_y", np.float64, SPARKLES),
+        ("sparkle_size", np.float64, SPARKLES),
+        ("sparkle_life", np.int32, SPARKLES),
+        ("sparkle_max_life", np.int32, SPARKLES),
+    )
+    
+    # The columns live in one 2-D block per dtype, a block row per value, so a
+    # whole store row moves with one slice copy per block
+    BLOCKS = column_blocks(COLUMNS)
+    
+    # Random numbers for the purely visual sparkles
+    fx_rng = np.random.default_rng()
+    
+    def __init__(self, capacity=32):
+        """Initialize an empty store"""
+        self.count = 0
+        self.capacity = 0
+        self.objects = []  # RoadObject views, in row order
+        self.grow(capacity)
+        
+    def grow(self, capacity):
+        """Resize the arrays, keeping the live rows"""
+        blocks = []
+        for index, (dtype, height, fields) in enumerate(self.BLOCKS):
+            block = np.zeros((height, capacity), dtype)
+            if self.capacity:
+                block[:, :self.count] = self.blocks[index][:, :self.count]
+            blocks.append(block)
+            for name, start, per_row in fields:
+                setattr(self, name, column_view(block, start, per_row))
+        self.blocks = blocks
+        self.capacity = capacity
+        
+    def add(self, obj, x, y, rotation, rotation_speed):
+        """Append a new object's row and bind the object to it"""
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        row = self.count
+        self.count += 1
+        self.x[row] = x
+        self.y[row] = y
+        self.rotation[row] = rotation
+        self.rotation_speed[row] = rotation_speed
+        # Obstacles don't pulse or glow: their directions stay zero
+        self.pulse[row] = (1.0, 0)
+        self.pulse_direction[row] = (0, 0) if obj.is_obstacle else (0.01, 0.5)
+        self.flags[row] = OBSTACLE if obj.is_obstacle else 0
+        self.object_id[row] = 0
+        self.width[row] = obj.width
+        self.height[row] = obj.height
+        self.sparkle_life[row] = 0
+        obj.store = self
+        obj.row = row
+        self.objects.append(obj)
+        if not obj.is_obstacle:
+            spawn = np.zeros((self.count, SPARKLES), bool)
+            spawn[row] = True
+            self.spawn_sparkles(spawn)
+            
+    def adopt(self, obj):
+        """Move an object's row here from the store it lives in"""
+        if obj.store is self:
+            return
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        source, source_row = obj.store, obj.row
+        for block, source_block in zip(self.blocks, source.blocks):
+            block[:, self.count] = source_block[:, source_row]
+        source.release(obj)
+        obj.store = self
+        obj.row = self.count
+        self.count += 1
+        self.objects.append(obj)
+        
+    def release(self, obj):
+        """Drop an object's row, moving the last row into its place"""
+        row = obj.row
+        self.count -= 1
+        last = self.objects.pop()
+        if last is not obj:
+            for block in self.blocks:
+                block[:, row] = block[:, self.count]
+            self.objects[row] = last
+            last.row = row
+            
+    def remove(self, obj):
+        """Remove an object; it keeps a copy of its row (see DetachedRow)"""
+        row = obj.row
+        detached = DetachedRow([block[:, row:row + 1].copy() for block in self.blocks])
+        self.release(obj)
+        obj.store = detached
+        obj.row = 0
+        
+    def replace(self, objects):
+        """Make objects the live set, in that order"""
+        wanted = set(map(id, objects))
+        for obj in [obj for obj in self.objects if id(obj) not in wanted]:
+            self.remove(obj)
+        for obj in objects:
+            self.adopt(obj)
+        # Reorder the rows to follow the list
+        order = [obj.row for obj in objects]
+        if order != list(range(len(order))):
+            for block in self.blocks:
+                block[:, :len(order)] = block[:, order]
+            for row, obj in enumerate(objects):
+                obj.row = row
+            self.objects = list(objects)
+            
+    def spawn_sparkles(self, spawn):
+        """Start new sparkles in the (row, slot) positions marked in a boolean array"""
+        count = int(spawn.sum())
+        if not count:
+            return
+        rows = spawn.shape[0]
+        width = np.broadcast_to(self.width[:rows, None], spawn.shape)[spawn]
+        height = np.broadcast_to(self.height[:rows, None], spawn.shape)[spawn]
+        rng = self.fx_rng
+        angle = rng.uniform(0, math.pi * 2, count)
+        distance = rng.uniform(width // 3, width // 2)
+        self.sparkle_x[:rows][spawn] = width // 2 + np.cos(angle) * distance
+        self.sparkle_y[:rows][spawn] = height // 2 + np.sin(angle) * distance
+        self.sparkle_size[:rows][spawn] = rng.uniform(1, 3, count)
+        self.sparkle_life[:rows][spawn] = rng.integers(10, 31, count)
+        self.sparkle_max_life[:rows][spawn] = rng.integers(10, 31, count)
+        
+    def update(self, speed):
+        """Advance every object one tick"""
+        n = self.count
+        if not n:
+            return
+            
+        # Move down the screen and rotate
+        self.y[:n] += speed
+        self.rotation[:n] += self.rotation_speed[:n]
+        
+        # Collectibles pulse and glow, bouncing between their limits
+        pulse = self.pulse[:n]
+        pulse += self.pulse_direction[:n]
+        self.pulse_direction[:n][(pulse > PULSE_MAX) | (pulse < PULSE_MIN)] *= -1
+        
+        # Age the sparkles; when one expires, each empty slot of that
+        # object is topped back up with a 70% chance
+        life = self.sparkle_life[:n]
+        alive = life > 0
+        life -= alive
+        expired = alive & (life == 0)
+        if expired.any():
+            refill = expired.any(axis=1)
+            spawn = (life <= 0) & refill[:, None] & (self.fx_rng.random(life.shape) < 0.7)
+            self.spawn_sparkles(spawn)
+            
+    def candidates(self, rect, bottom):
+        """Objects below a y limit or whose collision boxes meet a rect"""
+        n = self.count
+        if not n:
+            return []
+        y = self.y[:n]
+        # Collision boxes are 10 px smaller than the sprite; one pixel of
+        # slack is left for check_collision's exact rect test
+        touching = ((np.abs(self.x[:n] - rect.centerx) * 2 < self.width[:n] + (rect.width - 8)) &
+                    (np.abs(y - rect.centery) * 2 < self.height[:n] + (rect.height - 8)))
+        return [self.objects[row] for row in np.flatnonzero(touching | (y > bottom))]
+        
+    def sparkle_count(self):
+        """Number of live sparkles"""
+        return int((self.sparkle_life[:self.count] > 0).sum())
+        
+    def sparkles(self, row):
+        """The live sparkles of a row as (x, y, size, life, max_life) tuples"""
+        life = self.sparkle_life[row]
+        return tuple(
+            (float(self.sparkle_x[row, slot]), float(self.sparkle_y[row, slot]),
+             float(self.sparkle_size[row, slot]), int(life[slot]), int(self.sparkle_max_life[row, slot]))
+            for slot in range(SPARKLES) if life[slot] > 0)
+
+
+class DetachedRow:
+    """The row of an object removed from its store, copied out so the object keeps
+    its state until a store adopts it again; reads like a one-row store"""
+    
+    # Column name -> (block index, first block row, values per row)
+    FIELDS = {name: (index, start, per_row)
+              for index, (_, _, fields) in enumerate(ObjectStore.BLOCKS)
+              for name, start, per_row in fields}
+    
+    def __init__(self, blocks):
+        """Wrap one-column copies of a store's blocks"""
+        self.blocks = blocks
+        
+    def __getattr__(self, name):
+        """Column view, as on a store"""
+        if name not in self.FIELDS:
+            raise AttributeError(name)
+        index, start, per_row = self.FIELDS[name]
+        return column_view(self.blocks[index], start, per_row)
+        
+    def release(self, obj):
+        """Nothing to drop: the copy goes with the object"""
+        
+        
+def store_field(name, column=None):
+    """Property reading and writing one field of an object's store row"""
+    def get(self):
+        values = getattr(self.store, name)
+        return float(values[self.row] if column is None else values[self.row, column])
+        
+    def set(self, value):
+        values = getattr(self.store, name)
+        if column is None:
+            values[self.row] = value
+        else:
+            values[self.row, column] = value
+            
+    return property(get, set)
+
 
 class RoadObject:
     """Road object class for collectibles and obstacles with enhanced visuals"""
     
-    def __init__(self, x, y, is_obstacle, lane_width):
-        """Initialize the road object"""
-        self.x = x
-        self.y = y
+    # Sprites shared by all objects of a variant: loaded by path (None if missing),
+    # and baked by (variant, render scale)
+    sprite_cache = {}
+    baked_cache = {}
+    
+    # Effect surfaces shared by all objects (see get_shadow/get_glow/get_sparkle)
+    shadow_cache = {}
+    glow_cache = {}
+    sparkle_cache = {}
+    
+    # Collision masks by sprite variant, then (angle, scale)
+    mask_cache = {}
+    
+    # State kept in the ObjectStore row this object is a view of
+    x = store_field("x")
+    y = store_field("y")
+    rotation = store_field("rotation")
+    rotation_speed = store_field("rotation_speed")
+    scale_factor = store_field("pulse", 0)
+    scale_direction = store_field("pulse_direction", 0)
+    glow_size = store_field("pulse", 1)
+    glow_direction = store_field("pulse_direction", 1)
+    
+    def __init__(self, x, y, is_obstacle, lane_width, render_scale=1.0, store=None):
+        """Initialize the road object (in its own store unless one is given)"""
         self.is_obstacle = is_obstacle
-        self.collected = False
         
         # Set size based on type
-        if is_obstacle:
-            self.width = 70
-            self.height = 70
-        else:
-            self.width = 40
-            self.height = 40
+        self.width = SIZES[is_obstacle]
+        self.height = SIZES[is_obstacle]
             
         # Animation properties
-        self.rotation = random.randint(0, 360)
-        self.rotation_speed = random.uniform(-3, 3)
-        self.scale_factor = 1.0
-        self.scale_direction = 0.01
-        self.glow_size = 0
-        self.glow_max = 10
-        self.glow_direction = 0.5
+        rotation = random.randint(0, 360)
+        rotation_speed = random.uniform(-3, 3)
+        self.glow_max = GLOW_MAX
         
         # Shadow properties
         self.shadow_offset = 5
         
-        # Load appropriate image
-        image_path = "assets/obstacle.png" if is_obstacle else "assets/coin.png"
-        try:
-            self.image = pygame.image.load(image_path)
-            self.image = pygame.transform.scale(self.image, (self.width, self.height))
-        except pygame.error:
+        # Load appropriate image (once per file, see load_sprite)
+        image_path = IMAGES[is_obstacle]
+        self.masks = {}  # Masks of a one-off variant
+        self.base_image = self.load_sprite(image_path, self.width, self.height)
+        self.variant = image_path
+        if self.base_image is None:
             # Create a more detailed placeholder if image not found
             if is_obstacle:
-                self.image = self.create_obstacle_image()
+                self.base_image = self.create_obstacle_image()
             else:
-                self.image = self.create_coin_image()
+                self.base_image = self.create_coin_image()
+                
+        # Sprite baked at the internal render resolution
+        self.set_render_scale(render_scale)
+        
+        # State (position, animation, sparkles) lives in the store's arrays
+        if store is None:
+            store = ObjectStore(capacity=1)
+        store.add(self, x, y, rotation, rotation_speed)
+        
+    @property
+    def id(self):
+        """Stable identity for rewind snapshots"""
+        return int(self.store.object_id[self.row])
+        
+    @id.setter
+    def id(self, value):
+        self.store.object_id[self.row] = value
+        
+    @property
+    def collected(self):
+        """Whether the collectible has been picked up"""
+        return bool(self.store.flags[self.row] & COLLECTED)
+        
+    @collected.setter
+    def collected(self, value):
+        if value:
+            self.store.flags[self.row] |= COLLECTED
+        else:
+            self.store.flags[self.row] &= ~COLLECTED & 0xFF
+            
+    @property
+    def rect(self):
+        """Collision rect (slightly smaller than visual object for better gameplay)"""
+        rect = pygame.Rect(0, 0, self.width - 10, self.height - 10)
+        rect.center = (self.x, self.y)
+        return rect
+        
+    def set_render_scale(self, scale):
+        """Bake the object sprite for the given render scale"""
+        self.render_scale = scale
+        if scale == 1.0:
+            self.image = self.base_image
+        elif self.variant is None:
+            self.image = self.bake(self.base_image, scale)
+        else:
+            key = (self.variant, scale)
+            self.image = self.baked_cache.get(key)
+            if self.image is None:
+                self.image = self.baked_cache.setdefault(key, self.bake(self.base_image, scale))
                 
-        # Create collision rect (slightly smaller than visual object for better gameplay)
-        self.rect = pygame.Rect(x - self.width // 2 + 5, y - self.height // 2 + 5, 
-                               self.width - 10, self.height - 10)
-                               
-        # Create particle effects
-        self.particles = []
-        if not is_obstacle:
-            self.create_sparkle_particles()
+    @staticmethod
+    def bake(image, scale):
+        """Scale a sprite to a render scale"""
+        width, height = image.get_size()
+        return pygame.transform.smoothscale(image, (max(1, int(width * scale)), max(1, int(height * scale))))
+        
+    @classmethod
+    def load_sprite(cls, path, width, height):
+        """Return the cached sprite of an image file at a size, or None if it can't be loaded"""
+        key = (path, width, height)
+        if key not in cls.sprite_cache:
+            try:
+                sprite = pygame.transform.scale(pygame.image.load(path), (width, height))
+            except pygame.error:
+                sprite = None
+            cls.sprite_cache.setdefault(key, sprite)
+        return cls.sprite_cache[key]
+        
+    @classmethod
+    def prebuild(cls, scale):
+        """Fill the sprite and effect caches for a render scale ahead of the first spawns
+        (safe on a worker thread: it draws from its own copies of the sprites)"""
+        for is_obstacle, path in IMAGES.items():
+            size = SIZES[is_obstacle]
+            try:
+                sprite = pygame.transform.scale(pygame.image.load(path), (size, size))
+            except pygame.error:
+                continue  # Placeholders are drawn per object
+            cls.sprite_cache.setdefault((path, size, size), sprite)
+            image = sprite if scale == 1.0 else cls.baked_cache.setdefault((path, scale), cls.bake(sprite, scale))
+            if not is_obstacle:
+                # Glow sizes step by the pulse direction's 0.5 up to just past GLOW_MAX
+                for step in range(1, GLOW_MAX * 2 + 2):
+                    cls.get_glow(image.get_width(), image.get_height(), step * 0.5 * scale)
+        # Sparkle sizes are drawn from [1, 3) world pixels
+        for quarter in range(int(4 * scale), int(12 * scale) + 1):
+            cls.get_sparkle(quarter / 4)
+            
+    @classmethod
+    def prebuild_masks(cls):
+        """Fill the collision mask cache of the sprite file variants"""
+        for is_obstacle, path in IMAGES.items():
+            size = SIZES[is_obstacle]
+            try:
+                sprite = pygame.transform.scale(pygame.image.load(path), (size, size))
+            except pygame.error:
+                continue
+            masks = cls.mask_cache.setdefault(path, {})
+            scales = [1.0] if is_obstacle else [round(step * MASK_SCALE_STEP, 2) for step in range(16, 25)]
+            for angle in range(0, 360, MASK_ROTATION_STEP):
+                for scale in scales:
+                    if (angle, scale) not in masks:
+                        masks.setdefault((angle, scale), cls.build_mask(sprite, angle, scale))
+                        
+    @staticmethod
+    def build_mask(image, angle, scale):
+        """Collision mask of a sprite scaled and then rotated"""
+        if scale != 1.0:
+            width, height = image.get_size()
+            image = pygame.transform.scale(image, (int(width * scale), int(height * scale)))
+        return pygame.mask.from_surface(pygame.transform.rotate(image, angle))
         
     def create_obstacle_image(self):
         """Create a detailed obstacle image"""
@@ -63,6 +451,7 @@ class RoadObject:
         
         # Choose a random obstacle type
         obstacle_type = random.choice(['rock', 'oil', 'cone'])
+        self.variant = None if obstacle_type == 'rock' else obstacle_type  # Every rock is unique
         
         if obstacle_type == 'rock':
             # Draw a rock
@@ -122,6 +511,7 @@ class RoadObject:
         
         # Choose a random collectible type
         collectible_type = random.choice(['coin', 'gem', 'star'])
+        self.variant = collectible_type
         
         if collectible_type == 'coin':
             # Draw a gold coin
@@ -165,133 +555,141 @@ class RoadObject:
         
         return image
         
-    def create_sparkle_particles(self):
-        """Create sparkle particles for collectibles"""
-        if self.is_obstacle:
-            return
+    def snapshot(self):
+        """Return an immutable copy of the state needed to draw the object"""
+        store, row = self.store, self.row
+        scale, glow = store.pulse[row].tolist()
+        return (float(store.x[row]), float(store.y[row]), float(store.rotation[row]),
+                scale, glow, store.sparkles(row))
+        
+    def draw(self, surface, state=None, batch=None):
+        """Draw the object with enhanced visuals (optionally from a snapshot)"""
+        obj_x, obj_y, rotation, scale_factor, glow_size, sparkles = (
+            state if state is not None else self.snapshot())
+        own_batch = batch is None
+        if own_batch:
+            batch = RenderBatch(surface)
             
-        for _ in range(3):
-            angle = random.uniform(0, math.pi * 2)
-            distance = random.uniform(self.width // 3, self.width // 2)
-            particle = {
-                'x': self.width // 2 + math.cos(angle) * distance,
-                'y': self.height // 2 + math.sin(angle) * distance,
-                'size': random.uniform(1, 3),
-                'life': random.randint(10, 30),
-                'max_life': random.randint(10, 30)
-            }
-            self.particles.append(particle)
+        s = self.render_scale
+        x = obj_x * s
+        y = obj_y * s
+        sprite_width = self.image.get_width()
+        sprite_height = self.image.get_height()
         
-    def update(self, speed):
-        """Update object position and animation"""
-        # Move down the screen
-        self.y += speed
+        # Skip objects (with their shadow, glow and sparkles) that are fully off-screen
+        reach = math.hypot(sprite_width, sprite_height) * 0.6 + (self.glow_max + self.shadow_offset) * s
+        if not batch.visible(x - reach, y - reach, reach * 2, reach * 2):
+            batch.cull()
+            if own_batch:
+                batch.flush()
+            return
         
-        # Update collision rect
-        self.rect.center = (self.x, self.y)
+        # Draw the object, rotated (and for collectibles pulsing) around its center
+        size = None
+        if not self.is_obstacle:
+            size = (int(sprite_width * scale_factor), int(sprite_height * scale_factor))
+        drawn_size = batch.add_sprite("objects", self.image, (x, y), rotation, size)
+            
+        # Draw shadow (same footprint as the rotated sprite) with offset
+        shadow_pos = (x - drawn_size[0] // 2 + self.shadow_offset * s, 
+                     y - drawn_size[1] // 2 + self.shadow_offset * s)
+        if effects['shadows']:
+            batch.add("shadows", self.get_shadow(drawn_size), shadow_pos)
         
-        # Update rotation
-        self.rotation += self.rotation_speed
+        # Draw glow for collectibles
+        if not self.is_obstacle and glow_size > 0 and effects['glows']:
+            glow_surf = self.get_glow(sprite_width, sprite_height, glow_size * s)
+            glow_pos = (x - glow_surf.get_width() // 2, y - glow_surf.get_height() // 2)
+            batch.add("glows", glow_surf, glow_pos)
         
-        # Update animation based on object type
-        if self.is_obstacle:
-            # Obstacles just rotate
-            pass
-        else:
-            # Collectibles pulse and glow
-            self.scale_factor += self.scale_direction
-            if self.scale_factor > 1.2 or self.scale_factor < 0.8:
-                self.scale_direction *= -1
-                
-            self.glow_size += self.glow_direction
-            if self.glow_size > self.glow_max or self.glow_size < 0:
-                self.glow_direction *= -1
+        # Draw sparkle particles for collectibles
+        if not self.is_obstacle and effects['sparkles']:
+            for particle_x, particle_y, particle_size, life, max_life in sparkles:
+                # Draw at object's position plus particle offset
+                pos = (int((obj_x - self.width // 2 + particle_x) * s), 
+                      int((obj_y - self.height // 2 + particle_y) * s))
                 
-        # Update particles
-        for particle in self.particles[:]:
-            particle['life'] -= 1
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-                # Create a new particle to replace it
-                if random.random() < 0.7:
-                    self.create_sparkle_particles()
-        
-    def draw(self, surface):
-        """Draw the object with enhanced visuals"""
-        # Draw shadow
-        shadow_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        if self.is_obstacle:
-            shadow_shape = pygame.transform.rotate(self.image, self.rotation)
-        else:
-            width = int(self.width * self.scale_factor)
-            height = int(self.height * self.scale_factor)
-            shadow_shape = pygame.transform.scale(self.image, (width, height))
-            shadow_shape = pygame.transform.rotate(shadow_shape, self.rotation)
-            
-        shadow_rect = shadow_shape.get_rect()
-        shadow_surf.fill((0, 0, 0, 100))  # Semi-transparent black
-        shadow_surf = pygame.transform.scale(shadow_surf, shadow_rect.size)
+                # Draw a small star shape
+                particle_surf = self.get_sparkle(particle_size * s)
+                half = particle_surf.get_width() // 2
+                batch.add("sparkles", particle_surf, (pos[0] - half, pos[1] - half))
         
-        # Draw shadow with offset
-        shadow_pos = (self.x - shadow_rect.width // 2 + self.shadow_offset, 
-                     self.y - shadow_rect.height // 2 + self.shadow_offset)
-        surface.blit(shadow_surf, shadow_pos)
+        if own_batch:
+            batch.flush()
         
-        # Draw glow for collectibles
-        if not self.is_obstacle and self.glow_size > 0:
-            glow_surf = pygame.Surface((self.width + self.glow_size * 2, 
-                                      self.height + self.glow_size * 2), pygame.SRCALPHA)
+    @classmethod
+    def get_shadow(cls, size):
+        """Return a cached semi-transparent shadow surface of a size"""
+        shadow_surf = cls.shadow_cache.get(size)
+        if shadow_surf is None:
+            if len(cls.shadow_cache) >= 1024:
+                cls.shadow_cache.clear()
+            shadow_surf = pygame.Surface(size, pygame.SRCALPHA)
+            shadow_surf.fill((0, 0, 0, 100))  # Semi-transparent black
+            cls.shadow_cache[size] = shadow_surf
+            allocated("effects")
+        return shadow_surf
+        
+    @classmethod
+    def get_glow(cls, sprite_width, sprite_height, glow_size):
+        """Return a cached glow surface for a sprite size and glow radius"""
+        key = (sprite_width, sprite_height, glow_size)
+        glow_surf = cls.glow_cache.get(key)
+        if glow_surf is None:
+            glow_surf = pygame.Surface((sprite_width + glow_size * 2, 
+                                      sprite_height + glow_size * 2), pygame.SRCALPHA)
             glow_color = (255, 255, 0, 100)  # Yellow with alpha
             pygame.draw.circle(glow_surf, glow_color, 
                               (glow_surf.get_width() // 2, glow_surf.get_height() // 2), 
-                              self.width // 2 + self.glow_size)
-            glow_pos = (self.x - glow_surf.get_width() // 2, self.y - glow_surf.get_height() // 2)
-            surface.blit(glow_surf, glow_pos)
+                              sprite_width // 2 + glow_size)
+            cls.glow_cache[key] = glow_surf
+            allocated("effects")
+        return glow_surf
         
-        # Draw sparkle particles for collectibles
-        if not self.is_obstacle:
-            for particle in self.particles:
-                # Calculate alpha based on life
-                alpha = int(255 * (particle['life'] / particle['max_life']))
-                color = (255, 255, 255, alpha)
-                
-                # Draw at object's position plus particle offset
-                pos = (int(self.x - self.width // 2 + particle['x']), 
-                      int(self.y - self.height // 2 + particle['y']))
-                
-                # Draw a small star shape
-                size = particle['size']
-                points = []
-                for i in range(10):
-                    angle = i * math.pi / 5
-                    radius = size * 2 if i % 2 == 0 else size
-                    px = pos[0] + radius * math.cos(angle)
-                    py = pos[1] + radius * math.sin(angle)
-                    points.append((px, py))
-                
-                # Create a surface for the particle with alpha
-                particle_surf = pygame.Surface((int(size * 4), int(size * 4)), pygame.SRCALPHA)
-                pygame.draw.polygon(particle_surf, (255, 255, 255), 
-                                   [(p[0] - pos[0] + size * 2, p[1] - pos[1] + size * 2) for p in points])
-                surface.blit(particle_surf, (pos[0] - size * 2, pos[1] - size * 2))
+    @classmethod
+    def get_sparkle(cls, size):
+        """Return a cached star surface for a sparkle size (quantized to 1/4 px)"""
+        size = round(size * 4) / 4
+        particle_surf = cls.sparkle_cache.get(size)
+        if particle_surf is None:
+            points = []
+            for i in range(10):
+                angle = i * math.pi / 5
+                radius = size * 2 if i % 2 == 0 else size
+                points.append((size * 2 + radius * math.cos(angle), size * 2 + radius * math.sin(angle)))
+            particle_surf = pygame.Surface((max(1, int(size * 4)), max(1, int(size * 4))), pygame.SRCALPHA)
+            pygame.draw.polygon(particle_surf, (255, 255, 255), points)
+            cls.sparkle_cache[size] = particle_surf
+            allocated("effects")
+        return particle_surf
         
-        # Apply rotation and scaling for the main object
+    def get_mask(self):
+        """Return the cached collision mask for the current (quantized) rotation and scale"""
+        angle = round(self.rotation / MASK_ROTATION_STEP) * MASK_ROTATION_STEP % 360
         if self.is_obstacle:
-            # For obstacles, just rotate
-            rotated_image = pygame.transform.rotate(self.image, self.rotation)
+            scale = 1.0
         else:
-            # For collectibles, apply pulsing effect and rotation
-            width = int(self.width * self.scale_factor)
-            height = int(self.height * self.scale_factor)
-            scaled_image = pygame.transform.scale(self.image, (width, height))
-            rotated_image = pygame.transform.rotate(scaled_image, self.rotation)
-            
-        # Get the rect for the rotated/scaled image
-        rect = rotated_image.get_rect(center=(self.x, self.y))
+            scale = round(round(self.scale_factor / MASK_SCALE_STEP) * MASK_SCALE_STEP, 2)
+        masks = self.masks if self.variant is None else self.mask_cache.setdefault(self.variant, {})
+        key = (angle, scale)
+        mask = masks.get(key)
+        if mask is None:
+            mask = self.build_mask(self.base_image, angle, scale)
+            masks[key] = mask
+        return mask
         
-        # Draw the object
-        surface.blit(rotated_image, rect)
-        
-    def check_collision(self, car):
+    def check_collision(self, car, pixel_perfect=False):
         """Check if this object collides with the car"""
-        return self.rect.colliderect(car.rect)
+        # Cheap rect test first; masks are only compared when the rects meet
+        if not self.rect.colliderect(car.rect):
+            return False
+        if not pixel_perfect:
+            return True
+            
+        mask = self.get_mask()
+        car_mask = car.get_mask()
+        width, height = mask.get_size()
+        car_width, car_height = car_mask.get_size()
+        offset = (int(self.x - width // 2 - (car.x - car_width // 2)),
+                  int(self.y - height // 2 - (car.y - car_height // 2)))
+        return car_mask.overlap(mask, offset) is not None
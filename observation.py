@@ -0,0 +1,237 @@
+"""
+Speed Hunter - A simple car chase game
+Pixel observations published to a shared-memory frame ring for external agents
+"""
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pygame
+
+
+# Header of the shared block (int64 fields)
+SEQUENCE = 0  # Odd while a frame is being written
+FRAMES = 1  # Frames written so far
+LATEST = 2  # Ring slot of the newest frame
+STACK = 3
+HEIGHT = 4
+WIDTH = 5
+CHANNELS = 6  # 4 for native 32-bit pixels, 1 for grayscale
+RED = 7  # Byte offsets of the colour channels within a native pixel
+GREEN = 8
+BLUE = 9
+HEADER_FIELDS = 12
+HEADER_BYTES = HEADER_FIELDS * 8
+
+# Integer luma weights (sum to 256)
+GRAY_WEIGHTS = (77, 150, 29)
+
+# Blocks created by observers in this process
+published = set()
+
+
+def frame_views(buf, stack, height, width, channels):
+    """NumPy views of the header and the frame ring in a shared block"""
+    header = np.ndarray((HEADER_FIELDS,), np.int64, buf)
+    shape = (stack, height, width, channels) if channels > 1 else (stack, height, width)
+    frames = np.ndarray(shape, np.uint8, buf, offset=HEADER_BYTES)
+    return header, frames
+
+
+def channel_offset(shift):
+    """Byte offset of a colour channel given its bit shift in a 32-bit pixel"""
+    return shift // 8 if sys.byteorder == "little" else 3 - shift // 8
+
+
+class PixelObserver:
+    """Writes each drawn back buffer into a shared ring of (optionally reduced) frames"""
+
+    def __init__(self, game, name=None, downsample=1, grayscale=False, stack=4):
+        """Create the shared block sized for the current back buffer"""
+        self.game = game
+        width, height = game.screen.get_size()
+        self.width = width // downsample
+        self.height = height // downsample
+        self.channels = 1 if grayscale else 4
+        self.stack = stack
+
+        size = HEADER_BYTES + stack * self.height * self.width * self.channels
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.name = self.shm.name
+        published.add(self.name)
+        self.header, self.frames = frame_views(self.shm.buf, stack, self.height, self.width,
+                                               self.channels)
+        self.header[:] = 0
+        self.header[STACK] = stack
+        self.header[HEIGHT] = self.height
+        self.header[WIDTH] = self.width
+        self.header[CHANNELS] = self.channels
+        self.header[LATEST] = stack - 1
+        red, green, blue = game.screen.get_shifts()[:3]
+        self.header[RED] = channel_offset(red)
+        self.header[GREEN] = channel_offset(green)
+        self.header[BLUE] = channel_offset(blue)
+        # Colour frames are whole native pixels: copying 32-bit words is far
+        # cheaper than gathering 3 of every 4 bytes
+        self.pixels = self.frames.view(np.uint32)[..., 0] if not grayscale else None
+
+        # Preallocated scratch for the grayscale weighting
+        self.gray_sum = np.zeros((self.height, self.width), np.uint16)
+        self.gray_term = np.zeros((self.height, self.width), np.uint16)
+        self.rescaled = None  # Used if the render resolution no longer divides evenly
+
+    def source(self, array):
+        """A (height, width, ...) surfarray view of the back buffer at the observation size"""
+        screen = self.game.screen
+        width, height = screen.get_size()
+        if width % self.width == 0 and height % self.height == 0:
+            # Downsampling is a strided view of the surface's own pixels
+            pixels = array(screen)[::width // self.width, ::height // self.height]
+        else:
+            # The render mode changed to a size the stride can't reach
+            if self.rescaled is None:
+                self.rescaled = pygame.Surface((self.width, self.height), 0, screen)
+            pygame.transform.scale(screen, (self.width, self.height), self.rescaled)
+            pixels = array(self.rescaled)
+        return pixels.swapaxes(0, 1)
+
+    def observe(self):
+        """Publish the current back buffer as the newest frame"""
+        header = self.header
+        slot = (int(header[LATEST]) + 1) % self.stack
+        header[SEQUENCE] += 1
+        if self.pixels is not None:
+            pixels = self.source(pygame.surfarray.pixels2d)
+            np.copyto(self.pixels[slot], pixels)
+        else:
+            pixels = self.source(pygame.surfarray.pixels3d)
+            target = self.frames[slot]
+            gray_sum, gray_term = self.gray_sum, self.gray_term
+            np.multiply(pixels[..., 0], GRAY_WEIGHTS[0], out=gray_sum, dtype=np.uint16)
+            np.multiply(pixels[..., 1], GRAY_WEIGHTS[1], out=gray_term, dtype=np.uint16)
+            gray_sum += gray_term
+            np.multiply(pixels[..., 2], GRAY_WEIGHTS[2], out=gray_term, dtype=np.uint16)
+            gray_sum += gray_term
+            np.right_shift(gray_sum, 8, out=target, casting="unsafe")
+        del pixels  # Unlock the surface
+        header[LATEST] = slot
+        header[FRAMES] += 1
+        header[SEQUENCE] += 1
+
+    def close(self):
+        """Release and remove the shared block"""
+        del self.header, self.frames, self.pixels
+        self.shm.close()
+        self.shm.unlink()
+        published.discard(self.name)
+
+
+class PixelObservation:
+    """Consumer side: attaches to an observer's shared block by name (views are valid until close)"""
+
+    def __init__(self, name):
+        """Attach to the shared block"""
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Older versions track attached blocks too and would unlink the game's block on exit
+            if self.shm.name not in published:
+                resource_tracker.unregister(self.shm._name, "shared_memory")
+        header = np.ndarray((HEADER_FIELDS,), np.int64, self.shm.buf)
+        self.stack = int(header[STACK])
+        self.height = int(header[HEIGHT])
+        self.width = int(header[WIDTH])
+        self.channels = int(header[CHANNELS])
+        self.header, self.frames = frame_views(self.shm.buf, self.stack, self.height, self.width,
+                                               self.channels)
+        self.grayscale = self.channels == 1
+
+    def rgb(self, frames):
+        """(..., height, width, 3) RGB view of native pixel frames"""
+        red, green, blue = (int(self.header[field]) for field in (RED, GREEN, BLUE))
+        if (red, green, blue) == (2, 1, 0):
+            return frames[..., 2::-1]
+        if (red, green, blue) == (0, 1, 2):
+            return frames[..., :3]
+        return frames[..., [red, green, blue]]  # Unusual layout: copies
+
+    def frame_count(self):
+        """Frames published so far"""
+        return int(self.header[FRAMES])
+
+    def latest(self):
+        """View of the newest frame (no copy; may be overwritten by later frames)"""
+        frame = self.frames[int(self.header[LATEST])]
+        return frame if self.grayscale else self.rgb(frame)
+
+    def read(self, out=None):
+        """Copy the frame stack, oldest first, into out; retried if a write overlaps"""
+        if out is None:
+            out = np.empty(self.frames.shape[:3] + ((3,) if not self.grayscale else ()), np.uint8)
+        frames = self.frames if self.grayscale else self.rgb(self.frames)
+        header = self.header
+        while True:
+            sequence = int(header[SEQUENCE])
+            if sequence % 2:
+                continue
+            newest = int(header[LATEST])
+            oldest = (newest + 1) % self.stack
+            count = self.stack - oldest
+            out[:count] = frames[oldest:]
+            out[count:] = frames[:oldest]
+            if int(header[SEQUENCE]) == sequence:
+                return out
+
+    def close(self):
+        """Detach from the shared block"""
+        del self.header, self.frames
+        self.shm.close()
+
+
+def benchmark(frames=300, out=sys.stdout):
+    """Time observe() for a few configurations against copying the frame out"""
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from main import Game
+    from autopilot import Autopilot
+
+    game = Game()
+    game.menu_active = False
+    game.autopilot = Autopilot(game)
+    configs = [(1, False), (2, False), (4, False), (2, True), (4, True)]
+    observers = [PixelObserver(game, downsample=d, grayscale=g) for d, g in configs]
+    consumers = [PixelObservation(observer.name) for observer in observers]
+    times = [0.0] * len(observers)
+    copy_time = 0.0
+    try:
+        for _ in range(frames):
+            game.autopilot.update()
+            game.update()
+            game.draw()
+            for i, observer in enumerate(observers):
+                start = time.perf_counter()
+                observer.observe()
+                times[i] += time.perf_counter() - start
+            start = time.perf_counter()
+            pygame.image.tobytes(game.screen, "RGB")
+            copy_time += time.perf_counter() - start
+
+        print(f"Copying the back buffer out with image.tobytes: {copy_time / frames * 1000:.2f} ms/frame",
+              file=out)
+        for (downsample, grayscale), consumer, total in zip(configs, consumers, times):
+            stacked = consumer.read()
+            print(f"observe() downsample {downsample} {'gray' if grayscale else 'RGB '}: "
+                  f"{total / frames * 1000:.2f} ms/frame, stack {stacked.shape}, "
+                  f"{consumer.frame_count()} frames published", file=out)
+    finally:
+        for consumer in consumers:
+            consumer.close()
+        for observer in observers:
+            observer.close()
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,137 @@
+"""
+Speed Hunter - A simple car chase game
+Performance overlay (F3) showing frame timing and subsystem counters
+"""
+import collections
+import time
+
+import numpy as np
+import pygame
+
+# Surfaces allocated by the draw code, by site; the subsystems bump these and the
+# overlay takes (and clears) them once per frame
+allocations = collections.Counter()
+
+GRAPH_FRAMES = 120  # Frames in the rolling frame time graph
+REFRESH_HZ = 4  # Overlay repaints per second
+BUDGET_MS = 1000 / 60
+
+
+def allocated(site, count=1):
+    """Count surfaces allocated by a draw site this frame"""
+    allocations[site] += count
+
+
+class PerfOverlay:
+    """Rolling frame timing, repainted into a cached layer a few times per second"""
+
+    def __init__(self, game, frames=GRAPH_FRAMES, refresh_hz=REFRESH_HZ):
+        """Initialize empty histories for a game"""
+        self.game = game
+        self.visible = False
+        self.refresh_interval = 1 / refresh_hz
+
+        # Ring buffers: frame time (between consecutive record() calls) and its parts
+        self.frame_ms = np.zeros(frames)
+        self.update_ms = np.zeros(frames)
+        self.draw_ms = np.zeros(frames)
+        self.present_ms = np.zeros(frames)
+        self.surfaces = np.zeros(frames, np.int32)
+        self.index = 0
+        self.recorded = 0
+        self.last_record = None
+
+        # The overlay layer is repainted when the version changes
+        self.version = 0
+        self.last_refresh = 0.0
+
+    def toggle(self):
+        """Show or hide the overlay"""
+        self.visible = not self.visible
+        self.version += 1
+
+    def record(self, update_ms, draw_ms=0.0, present_ms=0.0):
+        """Record the timing of a frame (draw and present are 0 when they happened elsewhere)"""
+        now = time.perf_counter()
+        i = self.index
+        self.frame_ms[i] = (now - self.last_record) * 1000 if self.last_record is not None else 0.0
+        self.update_ms[i] = update_ms
+        self.draw_ms[i] = draw_ms
+        self.present_ms[i] = present_ms
+        self.surfaces[i] = sum(allocations.values())
+        allocations.clear()
+        self.index = (i + 1) % len(self.frame_ms)
+        self.recorded += 1
+        self.last_record = now
+        if self.visible and now - self.last_refresh >= self.refresh_interval:
+            self.last_refresh = now
+            self.version += 1
+
+    def key(self):
+        """Cache key of the overlay layer"""
+        return self.version
+
+    def rect(self, surface):
+        """The overlay panel's area on a surface"""
+        ui = self.game.ui
+        sc = ui.scaled
+        text_height = ui.get_font(20).get_linesize() * 4
+        return pygame.Rect(sc(10), sc(10), sc(340), sc(8 + 70 + 6 + 8) + text_height)
+
+    def history(self, values):
+        """The recorded part of a ring buffer, oldest first"""
+        if self.recorded < len(values):
+            return values[:self.recorded]
+        return np.roll(values, -self.index)
+
+    def paint(self, surface):
+        """Paint the panel (called only when the version changed)"""
+        game = self.game
+        ui = game.ui
+        sc = ui.scaled
+        rect = self.rect(surface)
+        pygame.draw.rect(surface, (0, 0, 0, 180), rect, border_radius=sc(6))
+
+        frames = self.history(self.frame_ms)[1:]  # The first interval is unknown
+        fps = len(frames) * 1000 / frames.sum() if frames.size and frames.sum() else 0.0
+        p99 = float(np.percentile(frames, 99)) if frames.size else 0.0
+        recent = slice(-15, None)  # About a refresh interval at 60 FPS
+        update = self.history(self.update_ms)[recent].mean() if self.recorded else 0.0
+        draw = self.history(self.draw_ms)[recent].mean() if self.recorded else 0.0
+        present = self.history(self.present_ms)[recent].mean() if self.recorded else 0.0
+        surfaces = self.history(self.surfaces)
+
+        store = game.store
+        lines = [
+            (f"FPS {fps:5.1f}   frame p99 {p99:5.1f} ms   {game.time_scale.tps:.0f} ticks/s", (255, 255, 0)),
+            None,  # The graph goes here
+            (f"update {update:5.2f}  draw {draw:5.2f}  flip {present:5.2f} ms", (255, 255, 255)),
+            (f"objects {store.count}  particles {len(game.particles)}  "
+             f"exhaust {len(game.car.exhaust_particles)}  sparkles {store.sparkle_count()}", (255, 255, 255)),
+            (f"surfaces/frame {surfaces[-1] if surfaces.size else 0}  "
+             f"(max {surfaces.max() if surfaces.size else 0})", (255, 255, 255)),
+        ]
+        font = ui.get_font(20)
+        x = rect.x + sc(10)
+        y = rect.y + sc(8)
+        for line in lines:
+            if line is None:
+                y = self.paint_graph(surface, frames, pygame.Rect(x, y, rect.width - sc(20), sc(70))) + sc(6)
+                continue
+            text, color = line
+            surface.blit(font.render(text, True, color), (x, y))
+            y += font.get_linesize()
+
+    def paint_graph(self, surface, frames, area):
+        """Draw the frame time bars against the 60 FPS budget; returns the bottom"""
+        pygame.draw.rect(surface, (40, 40, 40, 200), area)
+        top_ms = max(BUDGET_MS * 2, float(frames.max()) if frames.size else 0.0)
+        bar_width = area.width / len(self.frame_ms)
+        for i, ms in enumerate(frames.tolist()):
+            height = max(1, int(area.height * ms / top_ms))
+            color = (80, 220, 80) if ms <= BUDGET_MS * 1.1 else (240, 80, 60)
+            pygame.draw.rect(surface, color, (area.x + i * bar_width, area.bottom - height,
+                                              max(1, int(bar_width)), height))
+        budget_y = area.bottom - int(area.height * BUDGET_MS / top_ms)
+        pygame.draw.line(surface, (255, 255, 255), (area.x, budget_y), (area.right - 1, budget_y))
+        return area.bottom
@@ -0,0 +1,117 @@
+"""
+Speed Hunter - A simple car chase game
+Adaptive quality governor stepping visual effects down when frames run long
+"""
+import logging
+import random
+from collections import deque
+
+
+logger = logging.getLogger(__name__)
+
+# Quality tiers from cheapest to most detailed
+TIERS = [
+    {
+        "name": "low",
+        "shadows": False,
+        "glows": False,
+        "sparkles": False,
+        "exhaust": False,
+        "headlights": False,
+        "flicker": False,
+        "particle_ratio": 0.25,  # Share of explosion/pickup particles created
+        "pulse": False,  # Pulsing (re-scaled) warning text
+    },
+    {
+        "name": "medium",
+        "shadows": True,
+        "glows": False,
+        "sparkles": False,
+        "exhaust": True,
+        "headlights": True,
+        "flicker": False,
+        "particle_ratio": 0.5,
+        "pulse": True,
+    },
+    {
+        "name": "high",
+        "shadows": True,
+        "glows": True,
+        "sparkles": True,
+        "exhaust": True,
+        "headlights": True,
+        "flicker": True,
+        "particle_ratio": 1.0,
+        "pulse": True,
+    },
+]
+TIER_NAMES = [tier["name"] for tier in TIERS]
+
+# Settings of the active tier, read by the draw code
+effects = dict(TIERS[-1])
+
+# Random numbers for purely visual effects, kept apart from the gameplay RNG
+# so effects never change what spawns (and rewinds replay exactly)
+fx_random = random.Random()
+
+
+class QualityGovernor:
+    """Steps effect tiers down when over the frame budget and back up with hysteresis"""
+
+    def __init__(self, budget_ms=1000 / 60, window=60, upgrade_headroom=0.7,
+                 upgrade_after=180, fixed_tier=None):
+        """Initialize the governor at the highest tier (or a fixed one)"""
+        self.budget_ms = budget_ms
+        self.window = window  # Frames in the rolling average
+        self.upgrade_headroom = upgrade_headroom  # Average must drop below budget * headroom
+        self.upgrade_after = upgrade_after  # ...for this many consecutive frames
+        self.fixed = fixed_tier is not None
+
+        self.frame_times = deque(maxlen=window)
+        self.total = 0.0
+        self.headroom_frames = 0
+        self.changes = 0
+
+        self.tier = len(TIERS) - 1
+        self.set_tier(TIER_NAMES.index(fixed_tier) if self.fixed else self.tier, "start")
+
+    def set_tier(self, tier, reason):
+        """Activate a tier"""
+        previous = self.tier
+        self.tier = tier
+        effects.clear()
+        effects.update(TIERS[tier])
+
+        # Measure the new tier from scratch
+        self.frame_times.clear()
+        self.total = 0.0
+        self.headroom_frames = 0
+
+        if tier != previous:
+            self.changes += 1
+            logger.info("Quality %s -> %s (%s)", TIER_NAMES[previous], TIER_NAMES[tier], reason)
+
+    def average(self):
+        """Rolling average frame time in ms"""
+        return self.total / len(self.frame_times) if self.frame_times else 0.0
+
+    def record(self, frame_ms):
+        """Add a frame time and step the tier if needed"""
+        if len(self.frame_times) == self.window:
+            self.total -= self.frame_times[0]
+        self.frame_times.append(frame_ms)
+        self.total += frame_ms
+
+        if self.fixed or len(self.frame_times) < self.window:
+            return
+
+        average = self.average()
+        if average > self.budget_ms:
+            if self.tier > 0:
+                self.set_tier(self.tier - 1, f"average {average:.1f} ms > budget {self.budget_ms:.1f} ms")
+        elif average < self.budget_ms * self.upgrade_headroom:
+            self.headroom_frames += 1
+            if self.headroom_frames >= self.upgrade_after and self.tier < len(TIERS) - 1:
+                self.set_tier(self.tier + 1, f"average {average:.1f} ms with headroom")
+        else:
+            self.headroom_frames = 0
@@ -0,0 +1,158 @@
+"""
+Speed Hunter - A simple car chase game
+Threaded render pipeline drawing immutable simulation snapshots
+"""
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+import pygame
+
+
+# Everything Game.draw needs, copied out of the simulation once per tick
+Snapshot = namedtuple("Snapshot", [
+    "tick",
+    "time",  # perf_counter() when the snapshot was published
+    "road_y",
+    "car",  # Car.snapshot()
+    "objects",  # ((RoadObject, RoadObject.snapshot()), ...)
+    "particles",  # ((x, y, size, color), ...)
+    "score",
+    "high_score",
+    "missed_objects",
+    "max_missed",
+    "game_speed",
+    "speed_notification",
+    "speed_notification_timer",
+    "game_over",
+    "menu_active",
+    "animation_steps",  # Display frames this snapshot stands for (more than 1 when idling)
+    "time_scale",  # TimeScale.label(): None at normal speed
+])
+
+
+class RenderPipeline:
+    """Draws the latest snapshot on a render thread with double buffering"""
+
+    def __init__(self, game, history=600):
+        """Initialize the pipeline and start the render thread"""
+        self.game = game
+
+        # Latest published snapshot, handed over under its own lock
+        self.latest = None
+        self.handoff = threading.Lock()
+        self.new_snapshot = threading.Event()
+
+        # Double buffering: the render thread draws into back, the game
+        # loop presents front; they are swapped under the lock
+        self.lock = threading.Lock()
+        self.back = None
+        self.front = None
+        self.front_snapshot = None
+        self.presented_snapshot = None
+
+        # Stats
+        self.latencies = deque(maxlen=history)  # Snapshot-to-present seconds
+        self.published = 0
+        self.rendered = 0
+        self.presented = 0
+        self.skipped = 0  # Snapshots replaced before they were drawn
+
+        self.running = False
+        self.thread = None
+        self.start()
+
+    def start(self):
+        """Start the render thread"""
+        self.running = True
+        self.thread = threading.Thread(target=self.render_loop, name="render", daemon=True)
+        self.thread.start()
+
+    def publish(self, snapshot):
+        """Hand a new snapshot to the render thread"""
+        with self.handoff:
+            if self.latest is not None:
+                self.skipped += 1
+            self.latest = snapshot
+        self.published += 1
+        self.new_snapshot.set()
+
+    def buffer_for(self, surface):
+        """Return a surface matching the game's back buffer size and format"""
+        size = self.game.screen.get_size()
+        if surface is None or surface.get_size() != size:
+            surface = pygame.Surface(size).convert()
+        return surface
+
+    def render_loop(self):
+        """Render thread: draw each new snapshot into the back buffer"""
+        while self.running:
+            if not self.new_snapshot.wait(0.1):
+                continue
+            self.new_snapshot.clear()
+            with self.handoff:
+                snapshot = self.latest
+                self.latest = None
+            if snapshot is None:
+                continue
+
+            self.back = self.buffer_for(self.back)
+            start = time.perf_counter()
+            self.game.draw(snapshot, self.back)
+            self.game.governor.record((time.perf_counter() - start) * 1000)
+            self.rendered += 1
+
+            with self.lock:
+                self.front, self.back = self.back, self.front
+                self.front_snapshot = snapshot
+
+    def present(self):
+        """Show the most recently rendered frame (game loop thread)"""
+        with self.lock:
+            snapshot = self.front_snapshot
+            if snapshot is None or snapshot is self.presented_snapshot:
+                return False
+            window = self.game.window
+            if self.front.get_size() == window.get_size():
+                window.blit(self.front, (0, 0))
+            else:
+                pygame.transform.scale(self.front, window.get_size(), window)
+            pygame.display.flip()
+            self.presented_snapshot = snapshot
+
+        self.latencies.append(time.perf_counter() - snapshot.time)
+        self.presented += 1
+        return True
+
+    def stats(self):
+        """Return pipeline counters and snapshot-to-present latency in ms"""
+        latencies = sorted(self.latencies)
+        result = {
+            "published": self.published,
+            "rendered": self.rendered,
+            "presented": self.presented,
+            "skipped": self.skipped,
+        }
+        if latencies:
+            result["latency_mean_ms"] = sum(latencies) / len(latencies) * 1000
+            result["latency_p50_ms"] = latencies[len(latencies) // 2] * 1000
+            result["latency_p95_ms"] = latencies[int(len(latencies) * 0.95)] * 1000
+            result["latency_max_ms"] = latencies[-1] * 1000
+        return result
+
+    def stop(self):
+        """Stop the render thread"""
+        self.running = False
+        self.new_snapshot.set()
+        self.thread.join()
+
+    @contextmanager
+    def paused(self):
+        """Stop the render thread while the game replaces what drawing uses (the
+        render scale, the back buffer and baked sprites), then start it again"""
+        self.stop()
+        try:
+            yield
+        finally:
+            self.start()
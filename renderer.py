@@ -0,0 +1,298 @@
+"""
+Speed Hunter - A simple car chase game
+Renderer backends: software Surface blits or SDL2 textures (pygame._sdl2)
+"""
+import math
+import sys
+import time
+
+import pygame
+
+from batch import RenderBatch, LAYERS
+from compositor import CachedLayer
+
+BACKENDS = ("surface", "texture")
+
+
+class SurfaceRenderer:
+    """Draws with Surface blits into the back buffer and flips the display window"""
+
+    name = "surface"
+
+    def __init__(self, game):
+        """Draw for a game whose window is a display surface"""
+        self.game = game
+        self.batch = RenderBatch()
+
+    def set_render_size(self, size):
+        """Nothing to do: the back buffer is the game's screen"""
+
+    def begin(self, target):
+        """Start a frame and return its draw batch"""
+        self.batch.begin(target)
+        return self.batch
+
+    def draw_road(self, target, road, offset):
+        """Draw the road stream scrolled down by offset rows"""
+        self.game.compositor.draw_road(target, road, offset)
+
+    def draw_cached(self, layer, target, area, key, paint):
+        """Draw a cached layer's area, repainting it if stale"""
+        return self.game.compositor.draw_cached(layer, target, area, key, paint)
+
+    def draw_live(self, target, key, paint):
+        """Draw parts that change nearly every frame straight into the frame"""
+        paint(target)
+
+    def present(self):
+        """Upscale the back buffer to the window and show it"""
+        game = self.game
+        if game.screen is not game.window:
+            pygame.transform.scale(game.screen, game.window.get_size(), game.window)
+        pygame.display.flip()
+
+    def read_frame(self):
+        """The frame drawn last (before present)"""
+        return self.game.screen
+
+    def stats(self):
+        """Backend counters"""
+        return {"backend": self.name}
+
+
+class TextureBatch(RenderBatch):
+    """Draw batch that keeps sprites as textures, uploaded once, and rotates and
+    scales them at draw time"""
+
+    def __init__(self, renderer):
+        """Initialize empty layers and the texture cache"""
+        super().__init__()
+        self.renderer = renderer
+        self.textures = {}  # Surface -> Texture
+        self.uploads = 0
+
+    def texture(self, surface):
+        """Return the texture of a sprite surface, uploading it the first time"""
+        texture = self.textures.get(surface)
+        if texture is None:
+            from pygame._sdl2.video import Texture
+            if len(self.textures) >= 4096:
+                # Sprite caches were rebuilt (e.g. new render scale); drop stale textures
+                self.textures.clear()
+            texture = Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def add(self, layer, surface, pos):
+        """Queue a surface for a layer unless it is fully off-screen"""
+        width, height = surface.get_size()
+        if not self.visible(pos[0], pos[1], width, height):
+            self.culled += 1
+            return
+        self.layers[layer].append((surface, (int(pos[0]), int(pos[1]), width, height), 0))
+        self.items += 1
+
+    def add_sprite(self, layer, image, center, angle=0, size=None):
+        """Queue an image scaled to size and rotated by angle (degrees, counterclockwise)
+        around center; returns the size of the drawn (rotated) sprite"""
+        width, height = size if size is not None else image.get_size()
+        # Bounding box of the rotated sprite, as transform.rotate would make it
+        radians = math.radians(angle)
+        cos, sin = abs(math.cos(radians)), abs(math.sin(radians))
+        bounds = (math.ceil(width * cos + height * sin), math.ceil(width * sin + height * cos))
+        rect = pygame.Rect((0, 0), bounds)
+        rect.center = center
+        if not self.visible(rect.x, rect.y, rect.width, rect.height):
+            self.culled += 1
+            return bounds
+        dest = pygame.Rect(0, 0, width, height)
+        dest.center = rect.center
+        self.layers[layer].append((image, dest, -angle))  # SDL rotates clockwise
+        self.items += 1
+        return bounds
+
+    def flush(self):
+        """Draw all layers in order, one texture copy per sprite"""
+        for name in LAYERS:
+            items = self.layers[name]
+            if not items:
+                continue
+            for surface, dest, angle in items:
+                if angle:
+                    self.texture(surface).draw(dstrect=dest, angle=angle)
+                else:
+                    self.texture(surface).draw(dstrect=dest)
+            self.calls += len(items)
+            items.clear()
+
+        self.last_stats = {"items": self.items, "culled": self.culled, "calls": self.calls}
+        return self.last_stats
+
+
+class TextureRenderer:
+    """Draws with an SDL2 renderer (GPU, or SDL's software renderer) into its own window"""
+
+    name = "texture"
+
+    def __init__(self, size, title="Speed Hunter", vsync=False, accelerated=-1):
+        """Open a window with a renderer; accelerated=0 forces the software renderer"""
+        from pygame._sdl2.video import Window, Renderer
+        self.window = Window(title, size)
+        self.renderer = Renderer(self.window, accelerated=accelerated, vsync=vsync)
+        self.size = size
+        self.batch = TextureBatch(self.renderer)
+        self.live = CachedLayer()  # Alerts and notifications, painted on the CPU
+        self.layers = {}  # CachedLayer -> [texture, redraws at the last upload]
+        self.tiles = {}  # Road tile surface -> [texture, segment at the last upload]
+        self.back_buffer = None  # Render target when drawing below window resolution
+        self.layer_uploads = 0
+        self.tile_uploads = 0
+
+    def set_render_size(self, size):
+        """Draw into a smaller target texture that is upscaled when presenting"""
+        from pygame._sdl2.video import Texture
+        self.batch.textures.clear()  # Sprites are re-baked for the new size
+        self.tiles.clear()  # So are the road tiles
+        if size == self.size:
+            self.back_buffer = None
+        else:
+            self.back_buffer = Texture(self.renderer, size, target=True)
+
+    def begin(self, target):
+        """Start a frame and return its draw batch"""
+        self.renderer.target = self.back_buffer
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        self.batch.begin(target)
+        return self.batch
+
+    def draw_road(self, target, road, offset):
+        """Draw the visible road tiles, shifted down by offset rows; a tile is
+        re-uploaded only when its slot holds a new segment"""
+        from pygame._sdl2.video import Texture
+        offset %= road.period
+        road.advance(offset)
+        with road.lock:
+            for surface, area, y, key in road.pieces(0, target.get_height(), offset):
+                if key is None:
+                    texture = self.batch.texture(surface)  # Plain road stand-in
+                else:
+                    entry = self.tiles.get(surface)
+                    if entry is None:
+                        entry = self.tiles[surface] = [Texture.from_surface(self.renderer, surface), key]
+                        self.tile_uploads += 1
+                    elif entry[1] != key:
+                        entry[0].update(surface)
+                        entry[1] = key
+                        self.tile_uploads += 1
+                    texture = entry[0]
+                texture.draw(srcrect=area, dstrect=(0, y, area[2], area[3]))
+
+    def upload(self, layer, surface):
+        """Return the texture of a cached layer, re-uploaded only after a repaint"""
+        from pygame._sdl2.video import Texture
+        entry = self.layers.get(layer)
+        if entry is None or entry[0].get_rect().size != surface.get_size():
+            entry = [Texture.from_surface(self.renderer, surface), layer.redraws]
+            self.layers[layer] = entry
+            self.layer_uploads += 1
+        elif entry[1] != layer.redraws:
+            entry[0].update(surface)
+            entry[1] = layer.redraws
+            self.layer_uploads += 1
+        return entry[0]
+
+    def draw_cached(self, layer, target, area, key, paint):
+        """Draw a cached layer's area, repainting and re-uploading it if stale"""
+        surface = layer.render(target.get_size(), key, paint)
+        self.upload(layer, surface).draw(srcrect=area, dstrect=area)
+        return layer.result
+
+    def draw_live(self, target, key, paint):
+        """Draw parts that change nearly every frame from a layer keyed on their values"""
+        if key is not None:
+            self.draw_cached(self.live, target, target.get_rect(), key, paint)
+
+    def present(self):
+        """Upscale the back buffer if there is one and show the frame"""
+        if self.back_buffer is not None:
+            self.renderer.target = None
+            self.back_buffer.draw(dstrect=(0, 0) + self.size)
+        self.renderer.present()
+
+    def read_frame(self):
+        """The frame drawn last (before present), read back from the renderer"""
+        return self.renderer.to_surface()
+
+    def stats(self):
+        """Backend counters"""
+        return {"backend": self.name, "sprite_textures": len(self.batch.textures),
+                "sprite_uploads": self.batch.uploads, "layer_uploads": self.layer_uploads,
+                "tile_uploads": self.tile_uploads}
+
+
+def benchmark(frames=600, render_mode="quality", start_speed=100, seed=1, out=sys.stdout):
+    """Time drawing and presenting the same seeded autopilot run with each backend"""
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import random
+    import numpy as np
+    import quality
+    from main import Game
+    from autopilot import Autopilot
+    from object import ObjectStore
+
+    reference = None
+    for backend in BACKENDS:
+        random.seed(seed)
+        quality.fx_random.seed(seed)
+        ObjectStore.fx_rng = np.random.default_rng(seed)
+        game = Game(start_speed=start_speed, render_mode=render_mode, quality_tier="high",
+                    renderer=backend, road_worker=False)
+        game.menu_active = False
+        game.autopilot = Autopilot(game)
+        draw_time = present_time = 0.0
+        for _ in range(frames):
+            game.autopilot.update()
+            game.update()
+            start = time.perf_counter()
+            game.draw()
+            drawn = time.perf_counter()
+            if game.tick == frames // 2:
+                # Compare one frame of the two backends (outside the timing)
+                frame = pygame.surfarray.array3d(game.renderer.read_frame()).astype(np.int16)
+                if reference is None:
+                    reference = frame
+                else:
+                    delta = np.abs(frame - reference).max(axis=2)
+                    print(f"Frame {game.tick}: {np.count_nonzero(delta > 16) / delta.size:.1%} of pixels "
+                          f"differ from the surface backend by more than 16", file=out)
+                drawn = time.perf_counter()
+            game.present()
+            present_time += time.perf_counter() - drawn
+            draw_time += drawn - start
+        print(f"{backend:8s} draw {draw_time / frames * 1000:.2f} ms/frame, "
+              f"present {present_time / frames * 1000:.2f} ms/frame, "
+              f"batch {game.batch.last_stats}, {game.renderer.stats()}", file=out)
+        if game.engine_sound:
+            game.engine_sound.stop()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Compare the Speed Hunter renderer backends")
+    parser.add_argument("--frames", type=int, default=600, help="frames per backend (default: 600)")
+    parser.add_argument("--render-mode", choices=["quality", "performance"], default="quality",
+                        help="internal render resolution (default: quality)")
+    parser.add_argument("--start-speed", type=int, default=100, help="initial speed in km/h (default: 100)")
+    parser.add_argument("--seed", type=int, default=1, help="RNG seed shared by both runs (default: 1)")
+    args = parser.parse_args(argv)
+    benchmark(args.frames, args.render_mode, args.start_speed, args.seed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,305 @@
+"""
+Speed Hunter - A simple car chase game
+In-memory rewind using delta-encoded binary state snapshots in a ring buffer
+"""
+import random
+import struct
+from array import array
+
+import numpy as np
+
+from object import COLLECTED
+
+
+# Per-tick game state: tick, score, game_speed, missed_objects, coins_for_speed,
+# car lane, car x, car tilt, road_y, spawn_timer, speed_notification_timer,
+# game_over, next object id, object count
+HEADER = struct.Struct('<IihBhbfffhhBIB')
+# Per object, packed after the header straight from the store's columns (at full
+# precision, so a replay from a restored frame takes the same branches)
+OBJECT = np.dtype([
+    ("id", "<u4"), ("x", "<i2"), ("y", "<f8"), ("rotation", "<f8"), ("rotation_speed", "<f8"),
+    ("scale_factor", "<f8"), ("scale_direction", "<f8"), ("glow_size", "<f8"),
+    ("glow_direction", "<f8"), ("flags", "u1"),  # object.OBSTACLE / object.COLLECTED
+])
+
+# Mersenne Twister state: the 624 words and the index (as in getstate())
+RNG_WORDS = struct.Struct('<625I')
+
+
+class RewindBuffer:
+    """Records the game state every tick and restores it a few seconds back"""
+
+    def __init__(self, game, seconds=10, fps=60, data_bytes=256 * 1024,
+                 keyframe_interval=60, max_objects=64, rng_pages=64, speed_step=10):
+        """Preallocate the frame, keyframe and RNG page buffers"""
+        self.game = game
+        self.speed_step = speed_step  # For the restored speed notification
+        self.capacity = int(seconds * fps)  # Frames kept
+        self.keyframe_interval = keyframe_interval
+        self.max_objects = max_objects
+
+        # Encoded frames live back to back in one byte ring
+        self.data = bytearray(data_bytes)
+        self.data_bytes = np.frombuffer(self.data, np.uint8)
+        self.offsets = array('I', [0]) * self.capacity
+        self.lengths = array('I', [0]) * self.capacity
+        self.ticks = array('I', [0]) * self.capacity
+        self.key_seqs = array('q', [0]) * self.capacity  # Sequence number of each frame's keyframe
+        self.first_ids = array('I', [0]) * self.capacity  # Lowest object id in each frame
+        self.rng_refs = array('H', [0]) * self.capacity  # RNG page of each frame
+        self.first_seq = 0  # Oldest frame still stored
+        self.next_seq = 0
+        self.write_pos = 0
+
+        # Raw (unencoded) frame scratch space and the current keyframe, with NumPy
+        # views: the objects as records, and the bytes for the delta encoding
+        frame_size = HEADER.size + OBJECT.itemsize * max_objects
+        self.raw = bytearray(frame_size)
+        self.raw_bytes = np.frombuffer(self.raw, np.uint8)
+        self.raw_objects = np.frombuffer(self.raw, OBJECT, max_objects, HEADER.size)
+        self.key_raw = np.zeros(frame_size, np.uint8)
+        self.key_len = 0
+        self.key_seq = -1
+        self.key_ids = np.zeros(max_objects, np.uint32)
+        self.key_count = 0
+        self.xor = np.zeros(frame_size, np.uint8)
+        self.changed = np.zeros(frame_size, bool)
+
+        # Distinct RNG states; frames refer to them by page number
+        self.rng_pages = bytearray(RNG_WORDS.size * rng_pages)
+        self.rng_page_count = rng_pages
+        self.rng_page_seqs = array('q', [-1]) * rng_pages  # Frame that last wrote each page
+        self.rng_page = -1
+        self.rng_spawns = None  # next_object_id when the RNG was last captured
+
+        # Objects that frames in the buffer may refer to, by id
+        self.objects = {}
+
+        # Stats
+        self.keyframes = 0
+        self.deltas = 0
+
+    def clear(self):
+        """Forget all recorded frames"""
+        self.first_seq = self.next_seq
+        self.key_seq = -1
+        self.rng_spawns = None
+        self.objects.clear()
+
+    def bytes_used(self):
+        """Encoded bytes held by the stored frames"""
+        return sum(self.lengths[seq % self.capacity] for seq in range(self.first_seq, self.next_seq))
+
+    # Encoding
+
+    def capture_rng(self):
+        """Store the RNG state in a new page if it may have changed"""
+        # Only spawns draw from the gameplay RNG, so it can only have changed when the
+        # next object id did; it is captured once per keyframe interval anyway, should
+        # anything else draw from it
+        spawns = self.game.next_object_id
+        if (spawns != self.rng_spawns or
+                self.rng_page_seqs[self.rng_page] <= self.next_seq - self.keyframe_interval):
+            self.rng_page = (self.rng_page + 1) % self.rng_page_count
+            RNG_WORDS.pack_into(self.rng_pages, self.rng_page * RNG_WORDS.size, *random.getstate()[1])
+            self.rng_page_seqs[self.rng_page] = self.next_seq
+            self.rng_spawns = spawns
+
+    def pack_raw(self):
+        """Pack the game state into the raw scratch buffer, return its length"""
+        game = self.game
+        car = game.car
+        store = game.store
+        n = min(store.count, self.max_objects)
+
+        HEADER.pack_into(self.raw, 0, game.tick, game.score, int(game.game_speed),
+                         game.missed_objects, game.coins_for_speed, car.current_lane,
+                         car.x, car.tilt, game.road_y, game.spawn_timer,
+                         game.speed_notification_timer, game.game_over,
+                         game.next_object_id, n)
+        # Copy the object columns straight from the store
+        objects = self.raw_objects[:n]
+        objects["id"] = store.object_id[:n]
+        objects["x"] = store.x[:n]
+        objects["y"] = store.y[:n]
+        objects["rotation"] = store.rotation[:n]
+        objects["rotation_speed"] = store.rotation_speed[:n]
+        objects["scale_factor"] = store.pulse[:n, 0]
+        objects["scale_direction"] = store.pulse_direction[:n, 0]
+        objects["glow_size"] = store.pulse[:n, 1]
+        objects["glow_direction"] = store.pulse_direction[:n, 1]
+        objects["flags"] = store.flags[:n]
+        return HEADER.size + OBJECT.itemsize * n
+
+    def same_layout(self):
+        """Check the live objects match the keyframe's, one for one"""
+        store = self.game.store
+        count = min(store.count, self.max_objects)
+        if count != self.key_count:
+            return False
+        return bool((store.object_id[:count] == self.key_ids[:count]).all())
+
+    def reserve(self, length):
+        """Find room for an encoded frame, dropping the oldest frames it overwrites"""
+        pos = self.write_pos
+        if pos + length > len(self.data):
+            pos = 0
+        end = pos + length
+        while self.first_seq < self.next_seq:
+            slot = self.first_seq % self.capacity
+            start = self.offsets[slot]
+            if self.next_seq - self.first_seq < self.capacity and (
+                    start + self.lengths[slot] <= pos or start >= end):
+                break
+            self.first_seq += 1
+        self.write_pos = end
+        return pos
+
+    def record(self):
+        """Encode the current game state as the newest frame"""
+        seq = self.next_seq
+        keyframe = (self.key_seq < self.first_seq or seq - self.key_seq >= self.keyframe_interval
+                    or not self.same_layout())
+        self.capture_rng()
+        length = self.pack_raw()
+        raw = self.raw_bytes[:length]
+
+        if keyframe:
+            pos = self.reserve(length)
+            self.data_bytes[pos:pos + length] = raw
+            self.key_raw[:length] = raw
+            self.key_len = length
+            self.key_seq = seq
+            store = self.game.store
+            self.key_count = min(store.count, self.max_objects)
+            self.key_ids[:self.key_count] = store.object_id[:self.key_count]
+            for obj in store.objects[:self.key_count]:
+                self.objects[obj.id] = obj
+            self.keyframes += 1
+        else:
+            # XOR against the keyframe (same layout, so same length), then store a
+            # bitmask of the changed bytes followed by their XOR values
+            xor = np.bitwise_xor(raw, self.key_raw[:length], out=self.xor[:length])
+            changed = np.not_equal(xor, 0, out=self.changed[:length])
+            mask = np.packbits(changed)
+            literals = xor[changed]
+            length = len(mask) + len(literals)
+            pos = self.reserve(length)
+            data = self.data_bytes
+            data[pos:pos + len(mask)] = mask
+            data[pos + len(mask):pos + length] = literals
+            self.deltas += 1
+
+        slot = seq % self.capacity
+        self.offsets[slot] = pos
+        self.lengths[slot] = length
+        self.ticks[slot] = self.game.tick
+        self.key_seqs[slot] = self.key_seq
+        self.rng_refs[slot] = self.rng_page
+        store = self.game.store
+        self.first_ids[slot] = store.object_id[0] if store.count else self.game.next_object_id
+        self.next_seq = seq + 1
+        if self.next_seq - self.first_seq > self.capacity:
+            self.first_seq = self.next_seq - self.capacity
+
+        if keyframe:
+            self.prune_objects()
+
+    def prune_objects(self):
+        """Drop objects no stored frame refers to any more"""
+        if self.first_seq >= self.next_seq:
+            return
+        lowest = self.first_ids[self.first_seq % self.capacity]
+        for obj_id in [obj_id for obj_id in self.objects if obj_id < lowest]:
+            del self.objects[obj_id]
+
+    # Decoding
+
+    def restorable(self, seq):
+        """Check a frame, its keyframe and its RNG page are still stored"""
+        slot = seq % self.capacity
+        return (self.first_seq <= seq < self.next_seq and
+                self.key_seqs[slot] >= self.first_seq and
+                self.rng_page_seqs[self.rng_refs[slot]] <= seq)
+
+    def decode(self, seq):
+        """Decode a frame into the raw scratch buffer"""
+        slot = seq % self.capacity
+        pos = self.offsets[slot]
+        length = self.lengths[slot]
+        key_seq = self.key_seqs[slot]
+        data = self.data_bytes
+        raw = self.raw_bytes
+
+        key_slot = key_seq % self.capacity
+        key_pos = self.offsets[key_slot]
+        key_len = self.lengths[key_slot]
+        raw[:key_len] = data[key_pos:key_pos + key_len]
+        if key_seq == seq:
+            return
+
+        # Apply the changed bytes on top of the keyframe
+        mask_len = (key_len + 7) // 8
+        changed = np.unpackbits(data[pos:pos + mask_len], count=key_len).view(bool)
+        raw[:key_len][changed] ^= data[pos + mask_len:pos + length]
+
+    def restore(self, seq):
+        """Restore the game to a stored frame"""
+        self.decode(seq)
+        game = self.game
+        car = game.car
+        (game.tick, game.score, game.game_speed, game.missed_objects, game.coins_for_speed,
+         car.current_lane, car.x, car.tilt, game.road_y, game.spawn_timer,
+         game.speed_notification_timer, game_over,
+         game.next_object_id, object_count) = HEADER.unpack_from(self.raw, 0)
+
+        game.game_over = bool(game_over)
+        car.target_x = car.current_lane * car.lane_width + car.lane_width // 2
+        car.rect.center = (car.x, car.y)
+        car.exhaust_particles = []
+        if game.speed_notification_timer > 0:
+            game.speed_notification = f"Speed +{self.speed_step}: {int(game.game_speed)} km/h"
+        else:
+            game.speed_notification = None
+        game.particles = []
+        game.ui.score_animation = game.score
+
+        # Bring the objects back into the game's store, then set their state
+        states = []
+        for state in self.raw_objects[:object_count].tolist():
+            obj = self.objects.get(state[0])
+            if obj is not None:
+                states.append((obj, state))
+        game.objects = [obj for obj, state in states]
+        for obj, (obj_id, x, obj_y, rotation, rotation_speed, scale_factor, scale_direction,
+                  glow_size, glow_direction, flags) in states:
+            obj.x = x
+            obj.y = obj_y
+            obj.rotation = rotation
+            obj.rotation_speed = rotation_speed
+            obj.scale_factor = scale_factor
+            obj.scale_direction = scale_direction
+            obj.glow_size = glow_size
+            obj.glow_direction = glow_direction
+            obj.collected = bool(flags & COLLECTED)
+
+        words = RNG_WORDS.unpack_from(self.rng_pages, self.rng_refs[seq % self.capacity] * RNG_WORDS.size)
+        random.setstate((3, words, None))
+
+        # Recording continues from the restored frame, starting with a keyframe
+        self.next_seq = seq + 1
+        self.key_seq = -1
+        self.write_pos = self.offsets[seq % self.capacity] + self.lengths[seq % self.capacity]
+        self.rng_spawns = None
+
+    def rewind(self, seconds=3, fps=60):
+        """Restore the state from up to a few seconds ago, return the frames rewound"""
+        target = max(self.first_seq, self.next_seq - 1 - int(seconds * fps))
+        while target < self.next_seq and not self.restorable(target):
+            target += 1
+        if target >= self.next_seq:
+            return 0
+        frames = self.next_seq - 1 - target
+        self.restore(target)
+        return frames
@@ -0,0 +1,312 @@
+"""
+Speed Hunter - A simple car chase game
+Streamed road segments rendered ahead of the scroll into a ring of tiles
+"""
+import atexit
+import random
+import sys
+import threading
+import time
+import weakref
+from collections import namedtuple
+
+import pygame
+
+SEGMENT_HEIGHT = 100  # World pixels per segment (divides the road image height)
+PERIOD_SEGMENTS = 65536  # The road repeats after this many segments
+PERIOD = SEGMENT_HEIGHT * PERIOD_SEGMENTS  # World pixels (exact in the rewind's float32)
+TILES = 16  # Ring size; a power of two, so tile slots survive the period wrap
+
+# Segment variants and their weights
+SURFACES = (("plain", 6), ("patched", 2), ("worn", 2))
+MARKINGS = (("standard", 8), ("double", 1), ("rumble", 1))
+SCENERY = (("none", 5), ("posts", 3), ("grass", 2))
+
+# Streams with a running worker, stopped at exit before pygame's surfaces are freed
+running = weakref.WeakSet()
+
+Segment = namedtuple("Segment", ["index", "surface", "marking", "scenery", "seed"])
+
+
+def pick(rng, choices):
+    """Pick a weighted variant name"""
+    names = [name for name, _ in choices]
+    weights = [weight for _, weight in choices]
+    return rng.choices(names, weights)[0]
+
+
+class RoadGenerator:
+    """Deterministic road layout: segment i depends only on the seed and i"""
+
+    def __init__(self, seed=0, lane_count=3):
+        """Initialize the generator"""
+        self.seed = seed
+        self.lane_count = lane_count
+
+    def segment(self, index):
+        """Return segment index (counted from the bottom of the screen at distance 0)"""
+        index %= PERIOD_SEGMENTS
+        rng = random.Random(self.seed * PERIOD_SEGMENTS + index)
+        return Segment(index, pick(rng, SURFACES), pick(rng, MARKINGS), pick(rng, SCENERY),
+                       rng.getrandbits(32))
+
+    def segments(self, start=0):
+        """Yield the segments from start on, up the road"""
+        index = start
+        while True:
+            yield self.segment(index)
+            index += 1
+
+    def render(self, tile, segment, base, scale):
+        """Paint a segment into a tile from the base road image at the render scale"""
+        width, height = tile.get_size()
+        # The base image scrolls exactly as a wrapping image would
+        source = (base.get_height() - (segment.index + 1) * height) % base.get_height()
+        tile.blit(base, (0, 0), (0, source, width, height))
+
+        rng = random.Random(segment.seed)
+        lane_width = width / self.lane_count
+
+        # Surface variants
+        if segment.surface == "patched":
+            for _ in range(rng.randint(1, 3)):
+                w = rng.randint(40, 160) * scale
+                h = rng.randint(20, 60) * scale
+                x = rng.uniform(0, width - w)
+                y = rng.uniform(0, height - h)
+                pygame.draw.rect(tile, (38, 38, 40), (x, y, w, h), border_radius=int(4 * scale))
+        elif segment.surface == "worn":
+            for _ in range(rng.randint(2, 5)):
+                x = rng.uniform(0, width)
+                y = rng.uniform(0, height)
+                points = [(x, y)]
+                for _ in range(3):
+                    x += rng.uniform(-25, 25) * scale
+                    y += rng.uniform(5, 25) * scale
+                    points.append((x, y))
+                pygame.draw.lines(tile, (30, 30, 30), False, points, max(1, int(2 * scale)))
+
+        # Lane marking variants
+        if segment.marking == "double":
+            for lane in range(1, self.lane_count):
+                x = lane * lane_width
+                for offset in (-7, 7):
+                    pygame.draw.line(tile, (220, 220, 220), (x + offset * scale, 0),
+                                     (x + offset * scale, height), max(1, int(2 * scale)))
+        elif segment.marking == "rumble":
+            for y in range(0, height, max(1, int(20 * scale))):
+                for x in (0, width - 24 * scale):
+                    pygame.draw.rect(tile, (230, 230, 230), (x, y, 24 * scale, 8 * scale))
+
+        # Roadside scenery along both edges
+        if segment.scenery == "posts":
+            for x in (4 * scale, width - 10 * scale):
+                pygame.draw.rect(tile, (235, 235, 235), (x, height // 4, 6 * scale, 18 * scale))
+                pygame.draw.rect(tile, (255, 140, 0), (x, height // 4, 6 * scale, 5 * scale))
+        elif segment.scenery == "grass":
+            for x in (0, width - 14 * scale):
+                pygame.draw.rect(tile, (40, 90, 40), (x, 0, 14 * scale, height))
+                for _ in range(rng.randint(2, 5)):
+                    tuft = (x + rng.uniform(2, 12) * scale, rng.uniform(0, height))
+                    pygame.draw.circle(tile, (60, 130, 50), tuft, max(1, int(4 * scale)))
+
+
+class RoadStream:
+    """Ring of pre-rendered segment tiles filled ahead of the scroll by a worker thread;
+    drawing only uses ready tiles and falls back to the plain road instead of waiting"""
+
+    def __init__(self, generator, threaded=True):
+        """Initialize the stream (tiles are created by resize()); threaded=False renders
+        missing tiles on demand instead, for deterministic output"""
+        self.generator = generator
+        self.threaded = threaded
+        self.lock = threading.Condition()
+        self.tiles = []
+        self.held = []  # Segment in each tile slot; -1 while empty or being rendered
+        self.base = None
+        self.source = None
+        self.scale = 1.0
+        self.tile_height = SEGMENT_HEIGHT
+        self.screen_height = 0
+        self.period = PERIOD
+        self.generation = 0  # Bumped by resize(); stale renders are discarded
+        self.first = None  # Lowest visible segment
+        self.step = 0  # Segments scrolled by the last frame that moved
+        self.stopped = False
+        self.thread = None
+
+        # Stats
+        self.rendered = 0
+        self.fallbacks = 0  # Tile rows drawn as plain road because the tile wasn't ready
+
+    def resize(self, base, scale):
+        """(Re)create the tiles for a base road image at a render scale"""
+        with self.lock:
+            width, self.screen_height = base.get_size()
+            self.base = base
+            self.source = base.copy()  # The worker's own copy: blits lock their source
+            self.scale = scale
+            self.tile_height = int(SEGMENT_HEIGHT * scale)
+            self.period = self.tile_height * PERIOD_SEGMENTS
+            self.tiles = [pygame.Surface((width, self.tile_height), 0, base) for _ in range(TILES)]
+            self.held = [-1] * TILES
+            self.generation += 1
+            self.lock.notify()
+        if self.threaded and self.thread is None:
+            self.thread = threading.Thread(target=self.work, name="road", daemon=True)
+            self.thread.start()
+            running.add(self)
+
+    def next_task(self):
+        """The next segment to render, or None (call with the lock held); the visible
+        ones come first, bottom up, then those ahead, then the one just behind"""
+        if self.first is None or not self.tiles:
+            return None
+        # Scrolling faster than the ring looks ahead: make room for the next frame's
+        # segments rather than the ones about to leave the screen
+        visible = -(-self.screen_height // self.tile_height) + 1
+        first = self.first + max(0, self.step + visible - (TILES - 1))
+        for index in (*range(first, first + TILES - 1), first - 1):
+            if self.held[index % TILES] != index % PERIOD_SEGMENTS:
+                return index
+        return None
+
+    def render(self, index):
+        """Render a segment into its slot on this thread"""
+        segment = self.generator.segment(index)
+        self.generator.render(self.tiles[index % TILES], segment, self.source, self.scale)
+        self.held[index % TILES] = segment.index
+        self.rendered += 1
+
+    def work(self):
+        """Worker thread: render wanted segments into free slots"""
+        while True:
+            with self.lock:
+                task = self.next_task()
+                while task is None and not self.stopped:
+                    self.lock.wait()
+                    task = self.next_task()
+                if self.stopped:
+                    return
+                slot = task % TILES
+                self.held[slot] = -1  # Busy: never blitted while rendering
+                generation = self.generation
+                tile, source, scale = self.tiles[slot], self.source, self.scale
+            # Render without the lock, so drawing never waits for it
+            segment = self.generator.segment(task)
+            self.generator.render(tile, segment, source, scale)
+            with self.lock:
+                if generation == self.generation:  # Not resized meanwhile
+                    self.held[slot] = segment.index
+                    self.rendered += 1
+
+    def advance(self, offset):
+        """Move the wanted window to the scroll offset (render pixels)"""
+        first = offset // self.tile_height
+        if first != self.first:
+            with self.lock:
+                if self.first is not None:
+                    # Segments per frame, forwards; the scroll wraps at the period
+                    self.step = (first - self.first) % PERIOD_SEGMENTS
+                    if self.step > TILES:
+                        self.step = 0  # Going backwards (rewind) or a jump, not a speed
+                self.first = first
+                self.lock.notify()
+
+    def pieces(self, top, height, offset):
+        """Yield (surface, area, y, key) pieces covering target rows [top, top + height)
+        at a scroll offset; key is the segment, or None for a plain road fallback.
+        Hold the lock while using them"""
+        tile_height = self.tile_height
+        bottom = top + height
+        y = top
+        while y < bottom:
+            # Road coordinate of this row, counted up from the bottom at distance 0
+            up = self.screen_height + offset - y
+            index = (up - 1) // tile_height
+            row = (index + 1) * tile_height - up
+            rows = min(tile_height - row, bottom - y)
+            slot = index % TILES
+            key = index % PERIOD_SEGMENTS
+            if self.held[slot] == key:
+                yield self.tiles[slot], (0, row, self.base.get_width(), rows), y, key
+            elif not self.threaded:
+                # Deterministic mode: render on demand
+                self.render(index)
+                yield self.tiles[slot], (0, row, self.base.get_width(), rows), y, key
+            else:
+                source = (self.screen_height - up) % self.screen_height
+                self.fallbacks += 1
+                yield self.base, (0, source, self.base.get_width(), rows), y, None
+            y += rows
+
+    def paint(self, target, top, height, offset):
+        """Paint target rows [top, top + height); returns False if a fallback was used"""
+        self.advance(offset)
+        ready = True
+        with self.lock:
+            for surface, area, y, key in self.pieces(top, height, offset):
+                target.blit(surface, (0, y), area)
+                ready = ready and key is not None
+        return ready
+
+    def stop(self):
+        """Stop the worker thread, waiting for the tile it is rendering"""
+        with self.lock:
+            self.stopped = True
+            self.lock.notify()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+
+    def stats(self):
+        """Stream counters"""
+        return {"rendered": self.rendered, "fallbacks": self.fallbacks,
+                "ready": sum(held >= 0 for held in self.held)}
+
+
+@atexit.register
+def stop_all():
+    """Stop every worker (also when the game didn't quit through quit_game)"""
+    for stream in list(running):
+        stream.stop()
+
+
+def benchmark(frames=600, speeds=(10, 100, 300, 1000), fps=60, seed=1, out=sys.stdout):
+    """Drive seeded autopilot runs at fixed speeds, paced to fps, and count the frames
+    that had to show plain road in place of a tile that wasn't ready"""
+    import os
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from main import Game
+    from autopilot import Autopilot
+
+    for speed in speeds:
+        random.seed(seed)
+        game = Game(start_speed=speed)
+        game.menu_active = False
+        game.autopilot = Autopilot(game)
+        stream = game.road
+        clock = pygame.time.Clock()
+        stalled = 0
+        draw_time = 0.0
+        for _ in range(frames):
+            game.autopilot.update()
+            game.update()
+            fallbacks = stream.fallbacks
+            start = time.perf_counter()
+            game.draw()
+            draw_time += time.perf_counter() - start
+            stalled += stream.fallbacks > fallbacks
+            game.present()
+            clock.tick(fps)
+        tile_bytes = sum(tile.get_bytesize() * tile.get_width() * tile.get_height() for tile in stream.tiles)
+        print(f"{speed:5d} km/h: {stalled / frames:6.1%} frames with plain road stand-ins, "
+              f"draw {draw_time / frames * 1000:.2f} ms/frame, {stream.stats()}, "
+              f"tiles {tile_bytes / 2 ** 20:.1f} MiB", file=out)
+        stream.stop()
+        if game.engine_sound:
+            game.engine_sound.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(benchmark())
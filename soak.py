@@ -0,0 +1,194 @@
+"""
+Speed Hunter - A simple car chase game
+Headless soak test checking memory, object and surface budgets over long runs
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Traces left out of the per-frame counts: the tracer's own snapshot machinery,
+# and lazy imports
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def count_surfaces():
+    """Count live pygame surfaces reachable from tracked Python objects"""
+    import pygame
+    # Surfaces are not tracked by the GC themselves, so look at what refers to them
+    seen = set()
+    for container in gc.get_objects():
+        for referent in gc.get_referents(container):
+            if isinstance(referent, pygame.Surface):
+                seen.add(id(referent))
+    return len(seen)
+
+
+def count_game_objects(game):
+    """Count the live entities the game keeps in lists"""
+    return {
+        "objects": len(game.objects),
+        "particles": len(game.particles),
+        "exhaust": len(game.car.exhaust_particles),
+        "sparkles": game.store.sparkle_count(),
+    }
+
+
+def frame_allocations(game, draw):
+    """Blocks one frame allocated that are still live at its end, and the frame's
+    transient peak bytes"""
+    before = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    step(game, draw)
+    peak = tracemalloc.get_traced_memory()[1] - current
+    after = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+    # Only call sites that gained blocks: frees elsewhere must not cancel out allocations
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+    return blocks, peak
+
+
+def step(game, draw):
+    """Advance the game one tick, drawing if requested"""
+    game.autopilot.update()
+    game.update()
+    if draw:
+        game.draw()
+
+
+def run_soak(ticks=1000000, start_speed=10, draw_every=60, sample_every=50000,
+             warmup=5000, trace_frames=1, max_growth_mb=8.0, max_frame_blocks=500,
+             max_frame_peak_kb=4096, max_surfaces=5000, max_sparkles=200, seed=1,
+             out=sys.stdout):
+    """Run the game headless under the autopilot and check it stays within budgets"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import random
+    from main import Game
+    from autopilot import Autopilot
+
+    random.seed(seed)
+    game = Game(start_speed=start_speed)
+    game.autopilot = Autopilot(game)
+
+    # Let caches and lazily built sprites settle before taking the baseline
+    for tick in range(warmup):
+        step(game, tick % draw_every == 0)
+
+    tracemalloc.start(trace_frames)
+    gc.collect()
+    baseline = tracemalloc.take_snapshot()
+    baseline_memory = tracemalloc.get_traced_memory()[0]
+
+    samples = []
+    failures = []
+    start = time.perf_counter()
+    for tick in range(1, ticks + 1):
+        if tick % sample_every == 0:
+            blocks, peak = frame_allocations(game, True)
+            gc.collect()
+            memory = tracemalloc.get_traced_memory()[0]
+            sample = {
+                "tick": tick,
+                "growth_mb": (memory - baseline_memory) / (1024 * 1024),
+                "frame_blocks": blocks,
+                "frame_peak_kb": peak / 1024,
+                "gc_objects": len(gc.get_objects()),
+                "surfaces": count_surfaces(),
+            }
+            sample.update(count_game_objects(game))
+            samples.append(sample)
+            print(f"tick {tick:>9}  growth {sample['growth_mb']:7.2f} MB  "
+                  f"frame blocks {blocks:5}  peak {peak / 1024:7.1f} KiB  "
+                  f"gc objects {sample['gc_objects']:7}  surfaces {sample['surfaces']:5}  objects {sample['objects']:3}  "
+                  f"sparkles {sample['sparkles']:4}", file=out)
+
+            if sample["growth_mb"] > max_growth_mb:
+                failures.append(f"tick {tick}: memory grew {sample['growth_mb']:.2f} MB "
+                                f"(budget {max_growth_mb} MB)")
+            if blocks > max_frame_blocks:
+                failures.append(f"tick {tick}: one frame allocated {blocks} blocks "
+                                f"(budget {max_frame_blocks})")
+            if sample["frame_peak_kb"] > max_frame_peak_kb:
+                failures.append(f"tick {tick}: one frame peaked at {sample['frame_peak_kb']:.0f} KiB "
+                                f"of temporary allocations (budget {max_frame_peak_kb} KiB)")
+            if sample["surfaces"] > max_surfaces:
+                failures.append(f"tick {tick}: {sample['surfaces']} live surfaces "
+                                f"(budget {max_surfaces})")
+            if sample["sparkles"] > max_sparkles:
+                failures.append(f"tick {tick}: {sample['sparkles']} sparkles "
+                                f"(budget {max_sparkles})")
+        else:
+            step(game, tick % draw_every == 0)
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Call sites holding the most memory allocated since the baseline
+    top = final.compare_to(baseline, 'traceback' if trace_frames > 1 else 'lineno')[:10]
+    print(f"\n{ticks} ticks in {elapsed:.1f} s ({ticks / elapsed:.0f} ticks/s), "
+          f"{game.autopilot.games_played} games", file=out)
+    print("Compositor layers: " + "; ".join(
+        f"{name} " + ", ".join(f"{count} {kind}" for kind, count in counts.items())
+        for name, counts in game.compositor.stats().items()), file=out)
+    print("Top allocating call sites since warmup:", file=out)
+    for stat in top:
+        # Frames run from the oldest caller to the allocating line
+        frames = list(stat.traceback)
+        frame = frames[-1]
+        print(f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7} blocks  "
+              f"{frame.filename}:{frame.lineno}", file=out)
+        for caller in reversed(frames[-3:-1]):
+            print(f"  {'':>28}  called from {caller.filename}:{caller.lineno}", file=out)
+
+    if failures:
+        print("\nSOAK FAILED:", file=out)
+        for failure in failures:
+            print(f"  {failure}", file=out)
+    else:
+        print("\nSoak passed: all budgets held", file=out)
+
+    return {"samples": samples, "failures": failures, "top": top}
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Speed Hunter headless soak test")
+    parser.add_argument("--ticks", type=int, default=1000000)
+    parser.add_argument("--start-speed", type=int, default=10)
+    parser.add_argument("--draw-every", type=int, default=60,
+                        help="draw every N ticks (default: 60)")
+    parser.add_argument("--sample-every", type=int, default=50000)
+    parser.add_argument("--max-growth-mb", type=float, default=8.0,
+                        help="budget for traced memory growth after warmup")
+    parser.add_argument("--max-frame-blocks", type=int, default=500,
+                        help="budget for memory blocks one frame may allocate (and keep)")
+    parser.add_argument("--max-frame-peak-kb", type=int, default=4096,
+                        help="budget for temporary allocations within one frame")
+    parser.add_argument("--trace-frames", type=int, default=1,
+                        help="stack depth recorded per allocation (more is slower)")
+    parser.add_argument("--max-surfaces", type=int, default=5000)
+    parser.add_argument("--max-sparkles", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    result = run_soak(ticks=args.ticks, start_speed=args.start_speed,
+                      draw_every=args.draw_every, sample_every=args.sample_every,
+                      max_growth_mb=args.max_growth_mb, max_frame_blocks=args.max_frame_blocks,
+                      max_frame_peak_kb=args.max_frame_peak_kb,
+                      trace_frames=args.trace_frames, max_surfaces=args.max_surfaces,
+                      max_sparkles=args.max_sparkles, seed=args.seed)
+    return 1 if result["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Speed Hunter - A simple car chase game
+Telemetry bus recording gameplay events to compressed JSONL files
+"""
+import gzip
+import json
+import os
+import threading
+import time
+from array import array
+
+
+# Event types
+GAME_START = 0
+COIN_PICKUP = 1
+COIN_MISSED = 2
+CRASH = 3
+SPEED_UP = 4
+GAME_OVER = 5
+
+EVENT_NAMES = {
+    GAME_START: "game_start",
+    COIN_PICKUP: "coin_pickup",
+    COIN_MISSED: "coin_missed",
+    CRASH: "crash",
+    SPEED_UP: "speed_up",
+    GAME_OVER: "game_over",
+}
+
+# Game over causes (stored in the event value)
+CAUSE_CRASH = 0
+CAUSE_MISSED = 1
+CAUSE_NAMES = {CAUSE_CRASH: "crash", CAUSE_MISSED: "missed"}
+
+
+class TelemetryBus:
+    """Ring buffer of typed events drained to disk by a background thread"""
+
+    def __init__(self, directory="telemetry", capacity=4096, flush_interval=0.5,
+                 events_per_file=100000, max_files=10):
+        """Initialize the bus and start the flush thread"""
+        self.directory = directory
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.events_per_file = events_per_file
+        self.max_files = max_files
+
+        # Preallocated event fields, one slot per ring entry
+        self.ticks = array('q', [0]) * capacity
+        self.types = array('b', [0]) * capacity
+        self.games = array('l', [0]) * capacity
+        self.lanes = array('b', [0]) * capacity
+        self.xs = array('d', [0.0]) * capacity
+        self.ys = array('d', [0.0]) * capacity
+        self.scores = array('l', [0]) * capacity
+        self.speeds = array('l', [0]) * capacity
+        self.values = array('l', [0]) * capacity
+
+        # Single producer (game loop) / single consumer (flush thread):
+        # head is only written by record(), tail only by the flush thread
+        self.head = 0
+        self.tail = 0
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+
+        # Output files
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.file_index = 0
+        self.file_events = 0
+        self.file = None
+        self.files = []
+
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.flush_loop, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def record(self, tick, event_type, game=0, lane=0, x=0.0, y=0.0, score=0, speed=0, value=0):
+        """Record an event, dropping it if the ring buffer is full"""
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return False
+
+        slot = head % self.capacity
+        self.ticks[slot] = tick
+        self.types[slot] = event_type
+        self.games[slot] = game
+        self.lanes[slot] = lane
+        self.xs[slot] = x
+        self.ys[slot] = y
+        self.scores[slot] = score
+        self.speeds[slot] = speed
+        self.values[slot] = value
+
+        # Publish the slot only after all fields are written
+        self.head = head + 1
+        self.recorded += 1
+        return True
+
+    def pending(self):
+        """Number of events waiting to be flushed"""
+        return self.head - self.tail
+
+    def stats(self):
+        """Return bus counters"""
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "pending": self.pending(),
+        }
+
+    def event_dict(self, slot):
+        """Convert a ring slot to a JSON-ready dictionary"""
+        event_type = self.types[slot]
+        event = {
+            "tick": self.ticks[slot],
+            "event": EVENT_NAMES.get(event_type, str(event_type)),
+            "game": self.games[slot],
+            "lane": self.lanes[slot],
+            "x": round(self.xs[slot], 1),
+            "y": round(self.ys[slot], 1),
+            "score": self.scores[slot],
+            "speed": self.speeds[slot],
+        }
+        if event_type == GAME_OVER:
+            event["cause"] = CAUSE_NAMES.get(self.values[slot], str(self.values[slot]))
+        elif event_type == GAME_START:
+            event["spawn_delay"] = self.values[slot]
+        return event
+
+    def open_file(self):
+        """Open the next output file, removing the oldest beyond max_files"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory,
+                            f"events-{self.session}-{self.file_index:04d}.jsonl.gz")
+        self.file_index += 1
+        self.file_events = 0
+        self.file = gzip.open(path, 'wt', encoding='utf-8')
+        self.files.append(path)
+
+        while len(self.files) > self.max_files:
+            old = self.files.pop(0)
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    def close_file(self):
+        """Close the current output file"""
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def flush(self):
+        """Write all pending events to disk (flush thread only)"""
+        head = self.head
+        tail = self.tail
+        if head == tail:
+            return 0
+
+        lines = []
+        for index in range(tail, head):
+            lines.append(json.dumps(self.event_dict(index % self.capacity)))
+        # Free the slots before doing the slow compression and I/O
+        self.tail = head
+
+        for line in lines:
+            if self.file is None or self.file_events >= self.events_per_file:
+                self.close_file()
+                self.open_file()
+            self.file.write(line + "\n")
+            self.file_events += 1
+        self.file.flush()
+        self.written += len(lines)
+        return len(lines)
+
+    def flush_loop(self):
+        """Background thread draining the ring buffer"""
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def close(self):
+        """Stop the flush thread and write a summary line"""
+        self.stop_event.set()
+        self.thread.join()
+        if self.file is None:
+            self.open_file()
+        summary = {"event": "telemetry_summary"}
+        summary.update(self.stats())
+        self.file.write(json.dumps(summary) + "\n")
+        self.close_file()
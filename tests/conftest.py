@@ -0,0 +1,29 @@
+"""
+Speed Hunter - A simple car chase game
+Shared test setup: headless SDL, and the repository as the working directory for the assets
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def keep_high_score():
+    """Restore highscore.txt after tests that save it"""
+    path = os.path.join(ROOT, "highscore.txt")
+    with open(path) as f:
+        saved = f.read()
+    yield
+    with open(path) as f:
+        changed = f.read() != saved
+    if changed:
+        with open(path, "w") as f:
+            f.write(saved)
@@ -0,0 +1,68 @@
+"""
+Speed Hunter - A simple car chase game
+Render checksum checks: the committed goldens match, and drift or a missing golden fails clearly
+"""
+import io
+import json
+import os
+import shutil
+
+import pygame
+import pytest
+
+import checksum
+
+
+def test_menu_matches_the_committed_golden():
+    out = io.StringIO()
+    assert checksum.check(["menu"], out=out) == []
+    assert "menu: 10 frames match" in out.getvalue()
+
+
+def test_missing_golden_is_reported_as_a_failure(tmp_path):
+    out = io.StringIO()
+    assert checksum.check(["menu", "drive"], golden_dir=str(tmp_path), out=out) == ["menu", "drive"]
+    assert "menu: no golden sequence" in out.getvalue()
+    assert "--record --scenario drive" in out.getvalue()
+    assert checksum.main(["--golden", str(tmp_path), "--scenario", "menu"]) == 1
+
+
+@pytest.fixture
+def menu_golden(tmp_path):
+    """A copy of the menu golden whose hashes can be edited"""
+    shutil.copytree(os.path.join("golden", "menu"), tmp_path / "menu")
+    with open(os.path.join("golden", "menu.json")) as file:
+        golden = json.load(file)
+
+    def write(changed_frames):
+        for frame in changed_frames:
+            golden["hashes"][frame] = "00000000"
+        with open(tmp_path / "menu.json", "w") as file:
+            json.dump(golden, file)
+        return str(tmp_path)
+    return write
+
+
+def test_hash_drift_within_the_tolerance_of_the_golden_image_passes(menu_golden):
+    out = io.StringIO()
+    assert checksum.check(["menu"], golden_dir=menu_golden([0]), out=out) == []
+    assert "all within tolerance" in out.getvalue()
+
+
+def test_later_differing_frames_without_an_image_fail(menu_golden):
+    """A first frame within tolerance must not hide the frames after it"""
+    out = io.StringIO()
+    assert checksum.check(["menu"], golden_dir=menu_golden([0, 5]), out=out) == ["menu"]
+    assert "1 of them have no golden image" in out.getvalue()
+
+
+def test_pixel_drift_beyond_the_tolerance_fails(menu_golden, tmp_path):
+    golden_dir = menu_golden([0])
+    path = os.path.join(golden_dir, "menu", "frame_0000.png")
+    image = pygame.image.load(path)
+    image.fill((255, 0, 255), pygame.Rect(0, 0, 10, 10))
+    pygame.image.save(image, path)
+    out = io.StringIO()
+    diff_dir = str(tmp_path / "diff")
+    assert checksum.check(["menu"], golden_dir=golden_dir, diff_dir=diff_dir, out=out) == ["menu"]
+    assert "1 differ by more than 2; frame 0: 100 pixels" in out.getvalue()
@@ -0,0 +1,53 @@
+"""
+Speed Hunter - A simple car chase game
+Control server round trip: a lockstep game stepped and reset over its socket
+"""
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from conftest import ROOT
+from control import ControlClient, LEFT, NOOP, RIGHT
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = str(tmp_path / "control.sock")
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    process = subprocess.Popen([sys.executable, "main.py", "--control", path, "--lockstep", "--no-render"],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 30
+        while not os.path.exists(path):
+            assert process.poll() is None, "control server exited"
+            assert time.monotonic() < deadline, "control server did not start"
+            time.sleep(0.05)
+        client = ControlClient(path, timeout=30)
+        yield client
+        client.close()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def test_lockstep_step_and_reset_round_trip(client):
+    start, _, done, tick = client.reset()
+    assert not done
+
+    # The game advances exactly the steps asked for, and only then
+    observation, rewards, done, stepped = client.step(bytes([NOOP, LEFT, NOOP, RIGHT] * 5))
+    assert not done and len(rewards) == 20 and stepped == tick + 20
+    observed, rewards, done, still = client.observe()
+    assert still == stepped and len(rewards) == 0
+    np.testing.assert_array_equal(observed, observation)
+
+    # A reset starts over from the same observation
+    restarted, _, done, _ = client.reset()
+    assert not done
+    np.testing.assert_array_equal(restarted, start)
+    _, rewards, _, tick = client.step(NOOP)
+    assert len(rewards) == 1 and tick == stepped + 1
@@ -0,0 +1,40 @@
+"""
+Speed Hunter - A simple car chase game
+Quality governor checks: frame times fed from the game loop
+"""
+import time
+
+import pytest
+
+from main import Game
+
+
+@pytest.fixture
+def game():
+    game = Game(road_worker=False, background_loading=False)
+    game.menu_active = False
+    yield game
+    game.road.stop()
+
+
+def slow_present(game, monkeypatch):
+    """Make present() block like a vsynced flip"""
+    present = game.present
+
+    def waiting_present():
+        time.sleep(0.03)
+        present()
+    monkeypatch.setattr(game, "present", waiting_present)
+
+
+def test_vsync_wait_is_not_counted_as_load(game, monkeypatch):
+    game.vsync = True
+    slow_present(game, monkeypatch)
+    game.frame()
+    assert game.governor.frame_times[-1] < 30
+
+
+def test_present_counts_without_vsync(game, monkeypatch):
+    slow_present(game, monkeypatch)
+    game.frame()
+    assert game.governor.frame_times[-1] >= 30
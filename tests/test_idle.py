@@ -0,0 +1,62 @@
+"""
+Speed Hunter - A simple car chase game
+Idle scheduler checks: only static screens wait for input
+"""
+import time
+from types import SimpleNamespace
+
+import pygame
+import pytest
+
+from idle import IdleScheduler
+
+
+class Control:
+    """Stands in for a real-time control server"""
+
+    def __init__(self, pending):
+        self.waiting = pending
+
+    def pending(self):
+        return self.waiting
+
+
+@pytest.fixture(autouse=True)
+def display():
+    pygame.display.init()
+    pygame.event.clear()
+    yield
+    pygame.display.quit()
+
+
+def game(menu_active=False, game_over=False, autopilot=None, control=None):
+    return SimpleNamespace(menu_active=menu_active, game_over=game_over, autopilot=autopilot, control=control)
+
+
+def poll_seconds(scheduler, game):
+    """Time one poll"""
+    start = time.perf_counter()
+    scheduler.poll(game)
+    return time.perf_counter() - start
+
+
+def test_hidden_gameplay_keeps_running():
+    scheduler = IdleScheduler(hidden_timeout_ms=500)
+    scheduler.observe(pygame.event.Event(pygame.WINDOWFOCUSLOST))
+    scheduler.observe(pygame.event.Event(pygame.WINDOWHIDDEN))
+    assert poll_seconds(scheduler, game()) < 0.1
+    assert not scheduler.should_draw(game())
+
+
+def test_hidden_menu_waits_for_input():
+    scheduler = IdleScheduler(hidden_timeout_ms=200)
+    scheduler.observe(pygame.event.Event(pygame.WINDOWHIDDEN))
+    assert poll_seconds(scheduler, game(menu_active=True)) >= 0.15
+
+
+def test_pending_control_requests_are_not_throttled():
+    scheduler = IdleScheduler(idle_fps=1, hidden_timeout_ms=500)
+    assert poll_seconds(scheduler, game(menu_active=True, control=Control(True))) < 0.1
+    scheduler.observe(pygame.event.Event(pygame.WINDOWHIDDEN))
+    assert poll_seconds(scheduler, game(game_over=True, control=Control(True))) < 0.1
+    assert poll_seconds(scheduler, game(game_over=True, control=Control(False))) >= 0.4
@@ -0,0 +1,65 @@
+"""
+Speed Hunter - A simple car chase game
+Object store checks: removed objects keep their identity and values
+"""
+import random
+
+import pytest
+
+from object import ObjectStore, RoadObject
+
+FIELDS = ("id", "x", "y", "rotation", "rotation_speed", "scale_factor", "scale_direction",
+          "glow_size", "glow_direction", "collected", "is_obstacle")
+
+
+def values(obj):
+    """The object's state as seen through its properties"""
+    return tuple(getattr(obj, name) for name in FIELDS)
+
+
+@pytest.fixture
+def store():
+    random.seed(3)
+    store = ObjectStore(capacity=2)  # Small, so adding grows it
+    for i in range(6):
+        obj = RoadObject(50 + i * 100, i * 40, i % 3 == 0, 100, store=store)
+        obj.id = 100 + i
+    store.update(10)
+    return store
+
+
+def test_rows_stay_bound_to_their_objects(store):
+    before = {id(obj): values(obj) for obj in store.objects}
+    victim = store.objects[1]
+    store.remove(victim)
+    assert victim not in store.objects and store.count == 5
+    for row, obj in enumerate(store.objects):
+        assert obj.store is store and obj.row == row
+        assert values(obj) == before[id(obj)]
+
+
+def test_removed_object_keeps_its_values_and_comes_back(store):
+    victim = store.objects[2]
+    expected = values(victim)
+    store.remove(victim)
+    assert victim.store is not store
+    assert values(victim) == expected
+
+    # Detached objects can still be changed, and take the change back with them
+    victim.collected = True
+    expected = values(victim)
+    store.adopt(victim)
+    assert victim.store is store and store.objects[victim.row] is victim
+    assert values(victim) == expected
+
+
+def test_replace_restores_the_order_and_identities(store):
+    objects = list(store.objects)
+    before = [values(obj) for obj in objects]
+    store.replace(objects[3:])
+    assert store.objects == objects[3:]
+    store.replace(objects[::-1])
+    assert store.objects == objects[::-1]
+    store.replace(objects)
+    assert store.objects == objects
+    assert [values(obj) for obj in objects] == before
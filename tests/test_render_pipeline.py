@@ -0,0 +1,39 @@
+"""
+Speed Hunter - A simple car chase game
+Render pipeline checks: render mode switches hand off with the render thread
+"""
+import pytest
+
+from main import Game
+from render_pipeline import RenderPipeline
+
+
+@pytest.fixture
+def game():
+    game = Game(road_worker=False, background_loading=False)
+    game.menu_active = False
+    game.pipeline = RenderPipeline(game)
+    yield game
+    game.pipeline.stop()
+    game.road.stop()
+
+
+def test_render_mode_switches_while_the_render_thread_is_stopped(game, monkeypatch):
+    switches = []
+    set_render_mode = game.set_render_mode
+
+    def recording_set_render_mode(mode):
+        switches.append(game.pipeline.thread.is_alive())
+        set_render_mode(mode)
+    monkeypatch.setattr(game, "set_render_mode", recording_set_render_mode)
+
+    for tick in range(120):
+        game.update()
+        game.pipeline.publish(game.snapshot())
+        game.pipeline.present()
+        if tick % 10 == 0:
+            game.toggle_render_mode()
+
+    assert switches == [False] * 12
+    assert game.pipeline.thread.is_alive()
+    assert game.pipeline.rendered
@@ -0,0 +1,78 @@
+"""
+Speed Hunter - A simple car chase game
+Rewind round trips: restoring a recorded tick and replaying from it
+"""
+import random
+
+import numpy as np
+import pytest
+
+from main import Game, SPEED_STEP
+from autopilot import Autopilot
+
+
+def state(game):
+    """Gameplay state: the scalars, and the object float columns"""
+    store = game.store
+    n = store.count
+    exact = (game.tick, game.score, game.game_speed, game.missed_objects, game.coins_for_speed,
+             game.car.current_lane, game.car.x, game.road_y, game.spawn_timer, game.game_over,
+             game.next_object_id, tuple(obj.id for obj in game.objects), tuple(store.y[:n]),
+             tuple(store.flags[:n]), random.getstate())
+    floats = np.concatenate([store.rotation[:n], store.rotation_speed[:n],
+                             store.pulse[:n].ravel(), store.pulse_direction[:n].ravel()])
+    return exact, floats
+
+
+def assert_same(actual, expected):
+    assert actual[0] == expected[0]
+    np.testing.assert_array_equal(actual[1], expected[1])
+
+
+@pytest.fixture
+def game():
+    random.seed(1)
+    game = Game(start_speed=20, road_worker=False, background_loading=False, rewind=True)
+    game.menu_active = False
+    game.spawn_delay = 20  # Keep a few objects on the road
+    game.max_missed = 1000
+    game.autopilot = Autopilot(game, restart=False)
+    yield game
+    game.road.stop()
+
+
+def run(game, ticks):
+    """Advance the game, returning the state after each tick by tick number"""
+    states = {}
+    for _ in range(ticks):
+        game.autopilot.update()
+        game.update()
+        states[game.tick] = state(game)
+    return states
+
+
+def test_rewind_restores_the_recorded_tick(game):
+    states = run(game, 400)
+    assert game.tick == 400 and game.store.count
+    frames = game.rewind.rewind(seconds=3, fps=60)
+    assert frames == 180
+    assert_same(state(game), states[game.tick])
+    assert game.tick == 400 - 180
+
+
+def test_replay_after_rewind_matches_the_original_run(game):
+    states = run(game, 400)
+    game.rewind.rewind(seconds=3, fps=60)
+    replayed = run(game, 180)
+    for tick, replayed_state in replayed.items():
+        assert_same(replayed_state, states[tick])
+
+
+def test_restored_speed_notification_uses_the_speed_step(game):
+    run(game, 10)
+    game.game_speed += SPEED_STEP
+    game.speed_notification_timer = 60
+    game.rewind.record()
+    run(game, 5)
+    game.rewind.rewind(seconds=5 / 60, fps=60)
+    assert game.speed_notification == f"Speed +{SPEED_STEP}: {int(game.game_speed)} km/h"
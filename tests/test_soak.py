@@ -0,0 +1,40 @@
+"""
+Speed Hunter - A simple car chase game
+Soak budget checks
+"""
+import io
+
+import soak
+
+
+def run(**budgets):
+    """A short soak run sampling every 50 ticks"""
+    return soak.run_soak(ticks=100, warmup=50, draw_every=10, sample_every=50, out=io.StringIO(), **budgets)
+
+
+def test_short_run_holds_the_budgets():
+    assert run()["failures"] == []
+
+
+def test_allocations_are_counted_even_when_the_frame_frees_more(monkeypatch):
+    """Freed blocks must not hide a frame's allocations"""
+    garbage = [[object() for _ in range(2000)] for _ in range(200)]
+    kept = []
+    step = soak.step
+
+    def allocating_step(game, draw):
+        step(game, draw)
+        garbage.pop()  # Frees 2000 blocks...
+        kept.append([object() for _ in range(1000)])  # ...and allocates 1000
+
+    monkeypatch.setattr(soak, "step", allocating_step)
+    result = run(max_frame_blocks=500)
+    assert all(sample["frame_blocks"] >= 1000 for sample in result["samples"])
+    assert any("one frame allocated" in failure for failure in result["failures"])
+
+
+def test_a_frame_that_allocates_nothing_counts_no_blocks(monkeypatch):
+    """The tracer's own snapshots must not count against the budget"""
+    monkeypatch.setattr(soak, "step", lambda game, draw: None)
+    result = run()
+    assert all(sample["frame_blocks"] <= 5 for sample in result["samples"])
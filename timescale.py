@@ -0,0 +1,77 @@
+"""
+Speed Hunter - A simple car chase game
+Time scale (slow motion / fast forward) as whole simulation ticks per display frame
+"""
+import time
+
+# Selectable scales; powers of two, so the fractional tick debt stays exact
+SCALES = (0.25, 0.5, 1, 2, 4, 8, 16)
+
+
+class TimeScale:
+    """Turns display frames into simulation ticks: scale ticks per frame on average, the
+    fraction carried over, so every tick runs the normal Game.update rules"""
+
+    def __init__(self, scale=1, fps=60):
+        """Initialize at a scale"""
+        self.fps = fps
+        self.scale = 1
+        self.ticks_owed = 0.0  # Fraction of a tick carried to the next frame
+        self.steps_owed = 0.0  # Same for the draw-side animations
+        self.set_scale(scale)
+
+        # Achieved ticks per second, measured over about a second
+        self.window_start = time.perf_counter()
+        self.window_ticks = 0
+        self.tps = float(fps)
+
+        # Stats
+        self.ticks = 0
+        self.frames = 0
+
+    def set_scale(self, scale):
+        """Switch to the nearest selectable scale"""
+        self.scale = min(SCALES, key=lambda option: abs(option - scale))
+
+    def faster(self):
+        """Step up to the next scale"""
+        index = SCALES.index(self.scale)
+        self.set_scale(SCALES[min(index + 1, len(SCALES) - 1)])
+
+    def slower(self):
+        """Step down to the previous scale"""
+        index = SCALES.index(self.scale)
+        self.set_scale(SCALES[max(index - 1, 0)])
+
+    def due(self):
+        """Number of ticks to run this display frame"""
+        self.ticks_owed += self.scale
+        ticks = int(self.ticks_owed)
+        self.ticks_owed -= ticks
+        self.frames += 1
+        self.ticks += ticks
+        self.window_ticks += ticks
+        now = time.perf_counter()
+        if now - self.window_start >= 1.0:
+            self.tps = self.window_ticks / (now - self.window_start)
+            self.window_start = now
+            self.window_ticks = 0
+        return ticks
+
+    def animation_steps(self, frames):
+        """Steps of the draw-side animations (HUD pulse, score count-up) for a draw that
+        stands for a number of display frames, so they keep pace with the ticks"""
+        self.steps_owed += frames * self.scale
+        steps = int(self.steps_owed)
+        self.steps_owed -= steps
+        return steps
+
+    def label(self):
+        """Scale and achieved rate for display, or None at normal speed"""
+        if self.scale == 1:
+            return None
+        return f"{self.scale:g}x  {self.tps:.0f} ticks/s"
+
+    def stats(self):
+        """Scheduler counters"""
+        return {"scale": self.scale, "ticks": self.ticks, "frames": self.frames, "tps": self.tps}
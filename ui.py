@@ -5,6 +5,8 @@ Enhanced UI with interactive elements and improved visuals
 import pygame
 import os
 import math
+from quality import effects
+from perf import allocated
 
 class UI:
     """UI class for displaying game information with enhanced visuals"""
@@ -19,10 +21,12 @@ class UI:
         self.BLUE = (0, 100, 255)
         self.GREEN = (0, 200, 0)
         
-        # Fonts
-        self.font_small = pygame.font.SysFont('arial', 28)  # Increased font size
-        self.font_medium = pygame.font.SysFont('arial', 42)  # Increased font size
-        self.font_large = pygame.font.SysFont('arial', 92)  # Increased font size
+        # Fonts (baked at the internal render resolution, see set_render_scale)
+        self.render_scale = 1.0
+        self.fonts = {}
+        self.font_small = self.get_font(28)  # Increased font size
+        self.font_medium = self.get_font(42)  # Increased font size
+        self.font_large = self.get_font(92)  # Increased font size
         
         # High score file
         self.high_score_file = "highscore.txt"
@@ -31,27 +35,67 @@ class UI:
         self.score_animation = 0
         self.pulse_effect = 0
         self.pulse_direction = 1
+        self.shade = None  # Game over gradient (see get_shade)
         
         # Create button surfaces
         self.button_width = 300  # Increased button size
         self.button_height = 70  # Increased button size
-        self.button_normal = self.create_button(self.BLUE)
-        self.button_hover = self.create_button(self.GREEN)
+        self.base_button_normal = self.create_button(self.BLUE)
+        self.base_button_hover = self.create_button(self.GREEN)
         
         # Load or create speedometer
         try:
-            self.speedometer = pygame.image.load("assets/speedometer.png")
-            self.speedometer = pygame.transform.scale(self.speedometer, (180, 180))  # Larger speedometer
+            self.base_speedometer = pygame.image.load("assets/speedometer.png")
+            self.base_speedometer = pygame.transform.scale(self.base_speedometer, (180, 180))  # Larger speedometer
         except:
-            self.speedometer = self.create_speedometer()
+            self.base_speedometer = self.create_speedometer()
             
         # Load or create dashboard
         try:
-            self.dashboard = pygame.image.load("assets/dashboard.png")
+            self.base_dashboard = pygame.image.load("assets/dashboard.png")
             # Scale dashboard to fit the new screen width
-            self.dashboard = pygame.transform.scale(self.dashboard, (1200, 120))  # Adjusted for 1200x800 screen
+            self.base_dashboard = pygame.transform.scale(self.base_dashboard, (1200, 120))  # Adjusted for 1200x800 screen
         except:
-            self.dashboard = self.create_dashboard()
+            self.base_dashboard = self.create_dashboard()
+            
+        self.set_render_scale(1.0)
+        
+    def set_render_scale(self, scale):
+        """Bake sprites and fonts for the given render scale"""
+        self.render_scale = scale
+        self.fonts = {}
+        self.font_small = self.get_font(28)
+        self.font_medium = self.get_font(42)
+        self.font_large = self.get_font(92)
+        self.button_normal = self.bake(self.base_button_normal)
+        self.button_hover = self.bake(self.base_button_hover)
+        self.speedometer = self.bake(self.base_speedometer)
+        self.dashboard = self.bake(self.base_dashboard)
+        
+    def bake(self, image):
+        """Scale a full-resolution sprite to the render scale"""
+        if self.render_scale == 1.0:
+            return image
+        return pygame.transform.smoothscale(
+            image, (self.scaled(image.get_width()), self.scaled(image.get_height())))
+            
+    def scaled(self, value):
+        """Convert a world size or position to render pixels"""
+        return max(1, int(value * self.render_scale)) if value > 0 else int(value * self.render_scale)
+        
+    def get_font(self, size, bold=False):
+        """Return a cached font of a world size at the render scale"""
+        key = (size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont('arial', self.scaled(size), bold=bold)
+            self.fonts[key] = font
+        return font
+        
+    def mouse_pos(self):
+        """Mouse position in render pixels"""
+        x, y = pygame.mouse.get_pos()
+        return (int(x * self.render_scale), int(y * self.render_scale))
             
     def create_button(self, color):
         """Create a button surface with nice styling"""
@@ -141,70 +185,113 @@ class UI:
         end_y = center[1] + int(radius * 0.7 * math.sin(angle_rad))
         
         # Draw needle with proper thickness
-        pygame.draw.line(surface, color, center, (end_x, end_y), 4)  # Thicker needle
+        pygame.draw.line(surface, color, center, (end_x, end_y), self.scaled(4))  # Thicker needle
         
         # Draw center cap
-        pygame.draw.circle(surface, (200, 200, 200), center, 8)  # Larger cap
-        pygame.draw.circle(surface, (100, 100, 100), center, 8, 1)
-        
-    def draw(self, surface, score, high_score, missed, max_missed, game_speed=10):
-        """Draw the enhanced UI elements"""
-        # Update animation values
-        self.pulse_effect += 0.05 * self.pulse_direction
-        if self.pulse_effect > 1.0 or self.pulse_effect < 0.0:
-            self.pulse_direction *= -1
-            
+        pygame.draw.circle(surface, (200, 200, 200), center, self.scaled(8))  # Larger cap
+        pygame.draw.circle(surface, (100, 100, 100), center, self.scaled(8), 1)
+        
+    def animate(self, score, steps=1):
+        """Advance the pulse and the score count-up by a number of frames"""
+        for _ in range(steps):
+            self.pulse_effect += 0.05 * self.pulse_direction
+            if self.pulse_effect > 1.0 or self.pulse_effect < 0.0:
+                self.pulse_direction *= -1
+        self.count_up(score, steps)
+        
+    def count_up(self, score, steps=1):
+        """Move the displayed score towards the real score"""
         if score > self.score_animation:
-            self.score_animation += 1
+            self.score_animation = min(score, self.score_animation + steps)
             
+    def draw(self, surface, score, high_score, missed, max_missed, game_speed=10):
+        """Draw the enhanced UI elements"""
+        self.animate(score)
+        self.draw_panel(surface, score, high_score, missed, max_missed, game_speed)
+        self.draw_alerts(surface, missed, max_missed)
+        
+    def panel_rect(self, surface):
+        """Area of the surface covered by the dashboard panel"""
+        top = surface.get_height() - self.scaled(150)  # The speedometer reaches above the dashboard
+        return pygame.Rect(0, top, surface.get_width(), surface.get_height() - top)
+        
+    def panel_key(self, score, high_score, missed, max_missed, game_speed):
+        """Everything the dashboard panel depends on"""
+        return (self.score_animation, score > 0 and score == self.score_animation, high_score,
+                missed, max_missed, int(game_speed))
+        
+    def draw_panel(self, surface, score, high_score, missed, max_missed, game_speed=10):
+        """Draw the dashboard, speedometer, score and missed counter (all but the pulsing parts)"""
+        sc = self.scaled
+        
         # Draw dashboard at the bottom
-        surface.blit(self.dashboard, (0, surface.get_height() - 120))
+        surface.blit(self.dashboard, (0, surface.get_height() - sc(120)))
         
         # Draw speedometer
-        speedometer_pos = (1050, surface.get_height() - 60)  # Adjusted position
-        surface.blit(self.speedometer, (speedometer_pos[0] - 90, speedometer_pos[1] - 90))
+        speedometer_pos = (sc(1050), surface.get_height() - sc(60))  # Adjusted position
+        surface.blit(self.speedometer, (speedometer_pos[0] - sc(90), speedometer_pos[1] - sc(90)))
         
         # Draw needle based on game speed (adjusted for higher speeds)
         # Max speed on speedometer is now 200 km/h
-        self.draw_needle(surface, speedometer_pos, game_speed, 200, 90, self.RED)
+        self.draw_needle(surface, speedometer_pos, game_speed, 200, sc(90), self.RED)
         
         # Draw digital speed readout with larger font for emphasis (integer only)
-        speed_font = pygame.font.SysFont('arial', 36, bold=True)  # Increased font size
+        speed_font = self.get_font(36, bold=True)  # Increased font size
         speed_text = speed_font.render(f"{int(game_speed)} km/h", True, self.YELLOW)
         surface.blit(speed_text, (speedometer_pos[0] - speed_text.get_width() // 2, 
-                                speedometer_pos[1] + 30))
+                                speedometer_pos[1] + sc(30)))
         
         # Draw score with animation
         score_color = self.YELLOW if score > 0 and score == self.score_animation else self.WHITE
         score_text = self.font_medium.render(f"Score: {self.score_animation}", True, score_color)
-        surface.blit(score_text, (40, surface.get_height() - 100))
+        surface.blit(score_text, (sc(40), surface.get_height() - sc(100)))
         
         # Draw high score
         high_score_text = self.font_small.render(f"High Score: {high_score}", True, self.WHITE)
-        surface.blit(high_score_text, (40, surface.get_height() - 50))
+        surface.blit(high_score_text, (sc(40), surface.get_height() - sc(50)))
         
         # Draw missed objects counter with visual indicator
         missed_text = self.font_small.render(f"Missed: ", True, self.WHITE)
-        surface.blit(missed_text, (350, surface.get_height() - 70))
+        surface.blit(missed_text, (sc(350), surface.get_height() - sc(70)))
         
-        # Draw missed indicators
+        # Draw missed indicators (the latest one pulses, see draw_alerts)
         for i in range(max_missed):
+            if i == missed - 1:
+                continue
             color = self.RED if i < missed else (100, 100, 100)
-            if i == missed - 1 and missed > 0:  # Make the latest missed indicator pulse
-                pulse = int(50 * self.pulse_effect)
-                color = (255, pulse, pulse)
-            pygame.draw.circle(surface, color, (450 + i * 35, surface.get_height() - 60), 15)  # Larger indicators
+            pygame.draw.circle(surface, color, (sc(450 + i * 35), surface.get_height() - sc(60)), sc(15))  # Larger indicators
+            
+    def alerts_key(self, missed, max_missed):
+        """Everything the alerts depend on, or None when none show"""
+        if missed == 0 and missed < max_missed - 1:
+            return None
+        return (missed, max_missed, self.pulse_effect, effects['pulse'])
+        
+    def draw_alerts(self, surface, missed, max_missed):
+        """Draw the pulsing missed indicator and warning, which change every frame"""
+        sc = self.scaled
+        
+        # Make the latest missed indicator pulse
+        if missed > 0:
+            pulse = int(50 * self.pulse_effect)
+            pygame.draw.circle(surface, (255, pulse, pulse),
+                               (sc(450 + (missed - 1) * 35), surface.get_height() - sc(60)), sc(15))
             
         # Draw warning if close to game over
         if missed >= max_missed - 1:
             warning_text = self.font_medium.render("WARNING!", True, self.RED)
+            allocated("text")
             # Make warning text pulse
-            pulse_scale = 1.0 + 0.2 * self.pulse_effect
-            scaled_warning = pygame.transform.scale(warning_text, 
-                                                  (int(warning_text.get_width() * pulse_scale),
-                                                   int(warning_text.get_height() * pulse_scale)))
+            if effects['pulse']:
+                pulse_scale = 1.0 + 0.2 * self.pulse_effect
+                scaled_warning = pygame.transform.scale(warning_text, 
+                                                      (int(warning_text.get_width() * pulse_scale),
+                                                       int(warning_text.get_height() * pulse_scale)))
+                allocated("text")
+            else:
+                scaled_warning = warning_text
             surface.blit(scaled_warning, 
-                        (surface.get_width() // 2 - scaled_warning.get_width() // 2, 30))
+                        (surface.get_width() // 2 - scaled_warning.get_width() // 2, sc(30)))
             
     def draw_button(self, surface, text, center_pos, is_hover=False):
         """Draw an interactive button"""
@@ -219,14 +306,32 @@ class UI:
         
         return button_rect
             
+    def get_shade(self, size):
+        """Return the cached gradient that darkens the game over screen"""
+        if self.shade is None or self.shade.get_size() != size:
+            width, height = size
+            self.shade = pygame.Surface(size, pygame.SRCALPHA)
+            for i in range(height):
+                alpha = min(180, int(180 * (i / height * 1.5)))
+                pygame.draw.line(self.shade, (0, 0, 0, alpha), (0, i), (width, i))
+        return self.shade
+        
+    def glow_size(self):
+        """Current size of the pulsing new high score glow"""
+        return self.scaled(15 * (0.5 + self.pulse_effect))
+        
+    def game_over_key(self, score, high_score):
+        """Everything the game over screen depends on"""
+        new_high_score = score >= high_score
+        return ("game over", self.score_animation, high_score, new_high_score,
+                self.glow_size() if new_high_score else 0, self.mouse_pos())
+        
     def draw_game_over(self, surface, score, high_score):
         """Draw the enhanced game over screen"""
+        sc = self.scaled
+        
         # Semi-transparent overlay with gradient
-        overlay = pygame.Surface((surface.get_width(), surface.get_height()), pygame.SRCALPHA)
-        for i in range(surface.get_height()):
-            alpha = min(180, int(180 * (i / surface.get_height() * 1.5)))
-            pygame.draw.line(overlay, (0, 0, 0, alpha), (0, i), (surface.get_width(), i))
-        surface.blit(overlay, (0, 0))
+        surface.blit(self.get_shade(surface.get_size()), (0, 0))
         
         # Game over text with shadow effect
         game_over_text = self.font_large.render("GAME OVER", True, self.RED)
@@ -234,18 +339,15 @@ class UI:
         
         # Draw shadow with offset
         surface.blit(shadow_text, 
-                    (surface.get_width() // 2 - game_over_text.get_width() // 2 + 5, 
-                     surface.get_height() // 3 + 5))
+                    (surface.get_width() // 2 - game_over_text.get_width() // 2 + sc(5), 
+                     surface.get_height() // 3 + sc(5)))
         
         # Draw main text
         surface.blit(game_over_text, 
                     (surface.get_width() // 2 - game_over_text.get_width() // 2, 
                      surface.get_height() // 3))
         
-        # Final score with animation
-        if score > self.score_animation:
-            self.score_animation += 1
-            
+        # Final score with animation (see count_up)
         score_text = self.font_medium.render(f"Final Score: {self.score_animation}", True, self.WHITE)
         surface.blit(score_text, 
                     (surface.get_width() // 2 - score_text.get_width() // 2, 
@@ -254,14 +356,14 @@ class UI:
         # High score with glow effect if new high score
         if score >= high_score:
             # Create pulsing glow effect
-            glow_size = int(15 * (0.5 + self.pulse_effect))  # Larger glow
-            glow_surf = pygame.Surface((500 + glow_size*2, 70 + glow_size*2), pygame.SRCALPHA)  # Larger surface
+            glow_size = self.glow_size()  # Larger glow
+            glow_surf = pygame.Surface((sc(500) + glow_size*2, sc(70) + glow_size*2), pygame.SRCALPHA)  # Larger surface
             pygame.draw.rect(glow_surf, (255, 215, 0, 100), 
-                            (0, 0, 500 + glow_size*2, 70 + glow_size*2), 
-                            border_radius=15)
+                            (0, 0, sc(500) + glow_size*2, sc(70) + glow_size*2), 
+                            border_radius=sc(15))
             
-            glow_pos = (surface.get_width() // 2 - 250 - glow_size, 
-                       surface.get_height() // 2 + 70 - glow_size)
+            glow_pos = (surface.get_width() // 2 - sc(250) - glow_size, 
+                       surface.get_height() // 2 + sc(70) - glow_size)
             surface.blit(glow_surf, glow_pos)
             
             high_score_text = self.font_medium.render("NEW HIGH SCORE!", True, self.YELLOW)
@@ -270,33 +372,33 @@ class UI:
             
         surface.blit(high_score_text, 
                     (surface.get_width() // 2 - high_score_text.get_width() // 2, 
-                     surface.get_height() // 2 + 70))
+                     surface.get_height() // 2 + sc(70)))
         
         # Interactive buttons
-        mouse_pos = pygame.mouse.get_pos()
+        mouse_pos = self.mouse_pos()
         
         # Restart button
         restart_rect = self.draw_button(
             surface, 
             "Play Again", 
-            (surface.get_width() // 2, surface.get_height() // 2 + 180),
+            (surface.get_width() // 2, surface.get_height() // 2 + sc(180)),
             self.is_point_in_rect(mouse_pos, 
-                                 surface.get_width() // 2 - self.button_width // 2,
-                                 surface.get_height() // 2 + 180 - self.button_height // 2,
-                                 self.button_width, 
-                                 self.button_height)
+                                 surface.get_width() // 2 - sc(self.button_width) // 2,
+                                 surface.get_height() // 2 + sc(180) - sc(self.button_height) // 2,
+                                 sc(self.button_width), 
+                                 sc(self.button_height))
         )
         
         # Quit button
         quit_rect = self.draw_button(
             surface, 
             "Quit Game", 
-            (surface.get_width() // 2, surface.get_height() // 2 + 280),
+            (surface.get_width() // 2, surface.get_height() // 2 + sc(280)),
             self.is_point_in_rect(mouse_pos, 
-                                 surface.get_width() // 2 - self.button_width // 2,
-                                 surface.get_height() // 2 + 280 - self.button_height // 2,
-                                 self.button_width, 
-                                 self.button_height)
+                                 surface.get_width() // 2 - sc(self.button_width) // 2,
+                                 surface.get_height() // 2 + sc(280) - sc(self.button_height) // 2,
+                                 sc(self.button_width), 
+                                 sc(self.button_height))
         )
         
         return {"restart": restart_rect, "quit": quit_rect}